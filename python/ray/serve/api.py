@@ -1,4 +1,5 @@
 from functools import wraps
+import random
 
 import ray
 from ray.serve.constants import (DEFAULT_HTTP_HOST, DEFAULT_HTTP_PORT,
@@ -60,7 +61,9 @@ def accept_batch(f):
 def init(name=None,
          http_host=DEFAULT_HTTP_HOST,
          http_port=DEFAULT_HTTP_PORT,
-         metric_exporter=InMemoryExporter):
+         metric_exporter=InMemoryExporter,
+         num_routers=1,
+         embedded_routing=False):
     """Initialize or connect to a serve cluster.
 
     If serve cluster is already initialized, this function will just return.
@@ -79,6 +82,14 @@ def init(name=None,
             all RayServe actors and optionally export them to external
             services. RayServe has two options built in: InMemoryExporter and
             PrometheusExporter
+        num_routers (int): Number of router shards to start. Requests are
+            spread over the shards, which split each backend's
+            max_concurrent_queries evenly. Only used when starting a new
+            serve instance. Defaults to 1.
+        embedded_routing (bool): If true, the HTTP proxy routes requests
+            to the backend replicas itself instead of through a router
+            actor, saving a round trip per request. Handles still use the
+            router actors. Only used when starting a new serve instance.
     """
     if name is not None and not isinstance(name, str):
         raise TypeError("name must be a string.")
@@ -111,7 +122,8 @@ def init(name=None,
         name=master_actor_name,
         max_restarts=-1,
         max_task_retries=-1,
-    ).remote(name, http_node_id, http_host, http_port, metric_exporter)
+    ).remote(name, http_node_id, http_host, http_port, metric_exporter,
+             num_routers, embedded_routing)
 
     block_until_http_ready(
         "http://{}:{}/-/routes".format(http_host, http_port),
@@ -215,6 +227,12 @@ def update_backend_config(backend_tag, config_options):
             - "max_concurrent_queries": the maximum number of queries
             that will be sent to a replica of this backend
             without receiving a response.
+            - "replica_policy": how replicas are chosen for queries, one
+            of "least_loaded", "power_of_two_choices" or "ewma_latency".
+            - "adaptive_batching": if True, batch sizes and wait times are
+            chosen online, up to max_batch_size, to meet the query SLOs.
+            - "slo_miss_target": the fraction of queries allowed to miss
+            their SLO with adaptive batching.
     """
     if not isinstance(config_options, dict):
         raise ValueError("config_options must be a dictionary.")
@@ -262,6 +280,13 @@ def create_backend(backend_tag,
             - "max_concurrent_queries": the maximum number of queries that will
             be sent to a replica of this backend without receiving a
             response.
+            - "replica_policy": how replicas are chosen for queries, one of
+            "least_loaded" (default), "power_of_two_choices" or
+            "ewma_latency".
+            - "adaptive_batching": if True, batch sizes and wait times are
+            chosen online, up to max_batch_size, to meet the query SLOs.
+            - "slo_miss_target": the fraction of queries allowed to miss their
+            SLO with adaptive batching (default 0.01).
     """
     if config is None:
         config = {}
@@ -365,8 +390,9 @@ def get_handle(endpoint_name,
         assert endpoint_name in ray.get(
             master_actor.get_all_endpoints.remote())
 
+    # Each handle sends all of its requests through one router shard.
     return RayServeHandle(
-        ray.get(master_actor.get_router.remote())[0],
+        random.choice(ray.get(master_actor.get_router.remote())),
         endpoint_name,
         relative_slo_ms,
         absolute_slo_ms,
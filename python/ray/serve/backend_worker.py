@@ -1,6 +1,7 @@
 import asyncio
 import traceback
 import inspect
+from bisect import bisect_left
 from collections.abc import Iterable
 from collections import defaultdict
 from itertools import groupby
@@ -22,17 +23,148 @@ from ray.serve.router import Query
 
 logger = _get_logger()
 
+# Upper bounds of the buckets of the exported (cumulative) histograms.
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024]
+QUEUING_DELAY_BUCKETS_MS = [1, 5, 10, 50, 100, 500, 1000, 5000, 10000]
+
+
+def _histogram_buckets(value, buckets):
+    """Returns the labels of the histogram buckets that count value.
+
+    Like in Prometheus histograms, the bucket labeled `le` counts all
+    values less than or equal to it, so a value is counted in every bucket
+    from the first one at or above it up to "+Inf".
+    """
+    index = bisect_left(buckets, value)
+    return [str(bound) for bound in buckets[index:]] + ["+Inf"]
+
+
+class AdaptiveBatchPolicy:
+    """Picks batch sizes and wait times online to meet request SLOs.
+
+    The execution time of a batch is modeled as fixed_s + per_item_s *
+    batch_size, fit to an exponentially weighted history of batches. A
+    batch size limit grows by one after each batch and is halved after a
+    batch with SLO misses while the recent fraction of queries missing
+    their SLO is above the target. Within that limit, each batch is made
+    as large as possible while still being predicted to finish before the
+    earliest deadline of its queries.
+
+    Args:
+        max_batch_size (int): Upper bound for the batch size.
+        max_wait_s (float): Upper bound for waiting for a fuller batch. If
+            0, waits at most the predicted execution time of the batch.
+        slo_miss_target (float): Acceptable fraction of queries that miss
+            their SLO.
+        decay (float): Weight of the history in the moving averages.
+    """
+
+    def __init__(self,
+                 max_batch_size,
+                 max_wait_s=0,
+                 slo_miss_target=0.01,
+                 decay=0.9):
+        self.batch_size_limit = max_batch_size
+        self.set_config(max_batch_size, max_wait_s, slo_miss_target)
+        self.decay = decay
+        self.slo_miss_rate = 0
+        self.num_batches = 0
+        # Exponentially weighted moments of batch sizes and durations.
+        self.mean_size = 0
+        self.mean_duration_s = 0
+        self.var_size = 0
+        self.cov_size_duration = 0
+
+    def set_config(self, max_batch_size, max_wait_s, slo_miss_target):
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_s
+        self.slo_miss_target = slo_miss_target
+        self.batch_size_limit = min(self.batch_size_limit, max_batch_size)
+
+    def _fit(self):
+        """Returns the (fixed_s, per_item_s) costs of a batch."""
+        if self.num_batches == 0:
+            return 0, 0
+        if self.var_size > 1e-9:
+            per_item_s = self.cov_size_duration / self.var_size
+        else:
+            # All batches had the same size, assume there is no fixed cost.
+            per_item_s = self.mean_duration_s / self.mean_size
+        per_item_s = max(0, per_item_s)
+        fixed_s = max(0, self.mean_duration_s - per_item_s * self.mean_size)
+        return fixed_s, per_item_s
+
+    def predict_duration_s(self, batch_size):
+        fixed_s, per_item_s = self._fit()
+        return fixed_s + per_item_s * batch_size
+
+    def batch_size(self, slack_s):
+        """Returns the batch size to use if the batch must finish in slack_s.
+        """
+        fixed_s, per_item_s = self._fit()
+        batch_size = self.batch_size_limit
+        if per_item_s > 0:
+            batch_size = min(batch_size, int((slack_s - fixed_s) / per_item_s))
+        return max(1, batch_size)
+
+    def wait_s(self, batch_size, slack_s, waited_s=0):
+        """Returns how long to wait for a batch of batch_size queries.
+
+        waited_s is the time already spent waiting for the batch. It counts
+        against the maximum wait time but not against slack_s, which is
+        measured from now.
+        """
+        duration_s = self.predict_duration_s(batch_size)
+        max_wait_s = (self.max_wait_s or duration_s) - waited_s
+        return max(0, min(max_wait_s, slack_s - duration_s))
+
+    def observe(self, batch_size, duration_s, num_slo_misses):
+        """Updates the model with the result of a batch.
+
+        Args:
+            batch_size (int): Number of queries in the batch.
+            duration_s (float): Execution time of the batch.
+            num_slo_misses (int): Number of queries in the batch that
+                finished after their SLO.
+        """
+        decay = self.decay
+        if self.num_batches == 0:
+            self.mean_size = batch_size
+            self.mean_duration_s = duration_s
+            self.slo_miss_rate = num_slo_misses / batch_size
+        else:
+            size_diff = batch_size - self.mean_size
+            duration_diff = duration_s - self.mean_duration_s
+            self.mean_size += (1 - decay) * size_diff
+            self.mean_duration_s += (1 - decay) * duration_diff
+            self.var_size = decay * (self.var_size +
+                                     (1 - decay) * size_diff * size_diff)
+            self.cov_size_duration = decay * (
+                self.cov_size_duration +
+                (1 - decay) * size_diff * duration_diff)
+            self.slo_miss_rate = (decay * self.slo_miss_rate +
+                                  (1 - decay) * num_slo_misses / batch_size)
+        self.num_batches += 1
+
+        if num_slo_misses > 0 and self.slo_miss_rate > self.slo_miss_target:
+            self.batch_size_limit = max(1, self.batch_size_limit // 2)
+        else:
+            self.batch_size_limit = min(self.max_batch_size,
+                                        self.batch_size_limit + 1)
+
 
 class BatchQueue:
-    def __init__(self, max_batch_size, timeout_s):
+    def __init__(self, max_batch_size, timeout_s, adaptive_policy=None):
         self.queue = asyncio.Queue()
         self.full_batch_event = asyncio.Event()
         self.max_batch_size = max_batch_size
         self.timeout_s = timeout_s
+        self.adaptive_policy = adaptive_policy
 
-    def set_config(self, max_batch_size, timeout_s):
+    def set_config(self, max_batch_size, timeout_s, adaptive_policy=None):
         self.max_batch_size = max_batch_size
         self.timeout_s = timeout_s
+        self.adaptive_policy = adaptive_policy
 
     def put(self, request):
         self.queue.put_nowait(request)
@@ -50,7 +182,13 @@ class BatchQueue:
 
         Always returns a batch with at least one item - will block
         indefinitely until an item comes in.
+
+        If an adaptive policy is set, it picks the batch size and wait time
+        instead.
         """
+        if self.adaptive_policy is not None:
+            return await self._wait_for_adaptive_batch()
+
         curr_timeout = self.timeout_s
         batch = []
         while len(batch) == 0:
@@ -84,6 +222,38 @@ class BatchQueue:
 
         return batch
 
+    async def _wait_for_adaptive_batch(self):
+        """Wait for a batch sized to finish before its earliest SLO."""
+        batch = [await self.queue.get()]
+        deadline_s = batch[0].request_slo_ms / 1000
+        start = time.time()
+        while True:
+            slack_s = deadline_s - time.time()
+            batch_size = self.adaptive_policy.batch_size(slack_s)
+
+            while len(batch) < batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                deadline_s = min(deadline_s, batch[-1].request_slo_ms / 1000)
+            if len(batch) >= batch_size:
+                break
+
+            # Wait for more queries if the earliest SLO leaves time for it.
+            timeout_s = self.adaptive_policy.wait_s(batch_size, slack_s,
+                                                    time.time() - start)
+            if timeout_s <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(),
+                                                    timeout_s))
+            except asyncio.TimeoutError:
+                break
+            deadline_s = min(deadline_s, batch[-1].request_slo_ms / 1000)
+
+        if (self.queue.qsize() < self.max_batch_size
+                and self.full_batch_event.is_set()):
+            self.full_batch_event.clear()
+        return batch
+
 
 def create_backend_worker(func_or_class):
     """Creates a worker class wrapping the provided function or class."""
@@ -160,7 +330,8 @@ class RayServeWorker:
 
         self.config = backend_config
         self.batch_queue = BatchQueue(self.config.max_batch_size or 1,
-                                      self.config.batch_wait_timeout)
+                                      self.config.batch_wait_timeout,
+                                      self._get_adaptive_policy())
 
         self.metric_client = metric_client
         self.request_counter = self.metric_client.new_counter(
@@ -178,11 +349,42 @@ class RayServeWorker:
             description=("The number of time this replica workers "
                          "has been restarted due to failure."),
             label_names=("replica_tag", ))
+        self.batch_size_histogram = self.metric_client.new_counter(
+            "backend_batch_size",
+            description=("Number of batches executed in this replica "
+                         "with a size less than or equal to le"),
+            label_names=("le", ))
+        self.queuing_delay_histogram = self.metric_client.new_counter(
+            "backend_queuing_delay_ms",
+            description=("Number of queries processed in this replica "
+                         "that waited for a batch for at most le ms"),
+            label_names=("le", ))
+        self.slo_miss_counter = self.metric_client.new_counter(
+            "backend_slo_miss_counter",
+            description=("Number of queries that finished after their SLO "
+                         "in this replica"),
+        )
 
         self.restart_counter.labels(replica_tag=self.replica_tag).add()
 
         self.loop_task = asyncio.get_event_loop().create_task(self.main_loop())
 
+    def _get_adaptive_policy(self, policy=None):
+        """Returns the adaptive batching policy for the current config.
+
+        The passed policy is updated in place to keep its learned model.
+        """
+        if not self.config.adaptive_batching:
+            return None
+        if policy is None:
+            return AdaptiveBatchPolicy(self.config.max_batch_size,
+                                       self.config.batch_wait_timeout,
+                                       self.config.slo_miss_target)
+        policy.set_config(self.config.max_batch_size,
+                          self.config.batch_wait_timeout,
+                          self.config.slo_miss_target)
+        return policy
+
     def get_runner_method(self, request_item):
         method_name = request_item.call_method
         if not hasattr(self.callable, method_name):
@@ -280,7 +482,11 @@ class RayServeWorker:
             arg_list = [arg_list]
 
             self.request_counter.add(batch_size)
+            for le in _histogram_buckets(batch_size, BATCH_SIZE_BUCKETS):
+                self.batch_size_histogram.labels(le=le).add()
+            start = time.time()
             result_list = await call_method(*arg_list, **kwargs_list)
+            self._record_batch_latency(request_item_list, start)
 
             if not isinstance(result_list, Iterable) or isinstance(
                     result_list, (dict, set)):
@@ -308,6 +514,19 @@ class RayServeWorker:
             self._reset_context()
             return [wrapped_exception for _ in range(batch_size)]
 
+    def _record_batch_latency(self, request_item_list, start):
+        end = time.time()
+        end_ms = end * 1000
+        num_slo_misses = sum(
+            1 for item in request_item_list if item.request_slo_ms < end_ms)
+        if num_slo_misses > 0:
+            self.slo_miss_counter.add(num_slo_misses)
+
+        adaptive_policy = self.batch_queue.adaptive_policy
+        if adaptive_policy is not None:
+            adaptive_policy.observe(
+                len(request_item_list), end - start, num_slo_misses)
+
     async def main_loop(self):
         while True:
             # NOTE(simon): There's an issue when user updated batch size and
@@ -315,6 +534,16 @@ class RayServeWorker:
             # updated until after the current iteration.
             batch = await self.batch_queue.wait_for_batch()
 
+            batch_start = time.time()
+            delay_counts = defaultdict(int)
+            for query in batch:
+                delay_ms = (batch_start - query.arrival_time_s) * 1000
+                for le in _histogram_buckets(delay_ms,
+                                             QUEUING_DELAY_BUCKETS_MS):
+                    delay_counts[le] += 1
+            for le, count in delay_counts.items():
+                self.queuing_delay_histogram.labels(le=le).add(count)
+
             all_evaluated_futures = []
 
             if not self.config.accepts_batches:
@@ -340,12 +569,14 @@ class RayServeWorker:
 
     def update_config(self, new_config: BackendConfig):
         self.config = new_config
-        self.batch_queue.set_config(self.config.max_batch_size or 1,
-                                    self.config.batch_wait_timeout)
+        self.batch_queue.set_config(
+            self.config.max_batch_size or 1, self.config.batch_wait_timeout,
+            self._get_adaptive_policy(self.batch_queue.adaptive_policy))
 
     async def handle_request(self, request: Query):
         assert not isinstance(request, list)
         logger.debug("Worker {} got request {}".format(self.name, request))
         request.async_future = asyncio.get_event_loop().create_future()
+        request.arrival_time_s = time.time()
         self.batch_queue.put(request)
         return await request.async_future
@@ -9,6 +9,7 @@ import numpy as np
 
 NUM_CLIENTS = 8
 CALLS_PER_BATCH = 100
+NUM_ROUTERS = [1, 2, 4]
 
 
 @serve.accept_batch
@@ -76,6 +77,32 @@ async def trial(actors, session, data_size):
         multiplier=CALLS_PER_BATCH * len(actors))
 
 
+async def router_scaling(actors):
+    """Measures how throughput scales with the number of router shards."""
+    for num_routers in NUM_ROUTERS:
+        serve.shutdown()
+        serve.init(num_routers=num_routers)
+        serve.create_backend(
+            "backend",
+            backend,
+            config={
+                "num_replicas": 8,
+                "max_batch_size": 1,
+                "max_concurrent_queries": 10000
+            })
+        serve.create_endpoint("endpoint", backend="backend", route="/api")
+
+        async def many_clients():
+            ray.get(
+                [a.do_queries.remote(CALLS_PER_BATCH, None) for a in actors])
+
+        await timeit(
+            "{} routers {} clients small data".format(num_routers,
+                                                      len(actors)),
+            many_clients,
+            multiplier=CALLS_PER_BATCH * len(actors))
+
+
 async def main():
     ray.init(log_to_driver=False)
     serve.init()
@@ -107,6 +134,9 @@ async def main():
                 for data_size in ["small"]:
                     await trial(actors, session, data_size)
 
+    print("router scaling:")
+    await router_scaling(actors)
+
 
 if __name__ == "__main__":
     loop = asyncio.get_event_loop()
@@ -40,9 +40,15 @@ def run_http_benchmark(url, num_queries):
 @click.option("--num-queries", type=int, required=False)
 @click.option("--num-replicas", type=int, default=1)
 @click.option("--max-concurrent-queries", type=int, required=False)
+@click.option(
+    "--embedded-routing",
+    is_flag=True,
+    required=False,
+    help="Route requests from within the HTTP proxy")
 def main(num_replicas: int, num_queries: Optional[int],
-         max_concurrent_queries: Optional[int], blocking: bool):
-    serve.init()
+         max_concurrent_queries: Optional[int], blocking: bool,
+         embedded_routing: bool):
+    serve.init(embedded_routing=embedded_routing)
 
     def noop(_):
         return "hello world"
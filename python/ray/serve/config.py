@@ -1,6 +1,7 @@
 import inspect
 
 from ray.serve.constants import ASYNC_CONCURRENCY
+from ray.serve.policy import REPLICA_POLICIES
 
 
 def _callable_accepts_batch(func_or_class):
@@ -30,6 +31,9 @@ class BackendConfig:
         self.batch_wait_timeout = config_dict.pop("batch_wait_timeout", 0)
         self.max_concurrent_queries = config_dict.pop("max_concurrent_queries",
                                                       None)
+        self.replica_policy = config_dict.pop("replica_policy", "least_loaded")
+        self.adaptive_batching = config_dict.pop("adaptive_batching", False)
+        self.slo_miss_target = config_dict.pop("slo_miss_target", 0.01)
 
         if self.max_concurrent_queries is None:
             # Model serving mode: if the servable is blocking and the wait
@@ -46,8 +50,10 @@ class BackendConfig:
 
             # Batch inference mode: user specifies non zero timeout to wait for
             # full batch. We will use 2*max_batch_size to perform double
-            # buffering to keep the replica busy.
-            if self.max_batch_size is not None and self.batch_wait_timeout > 0:
+            # buffering to keep the replica busy. Adaptive batching also needs
+            # queued queries to choose the batch size from.
+            if self.max_batch_size is not None and (self.batch_wait_timeout > 0
+                                                    or self.adaptive_batching):
                 self.max_concurrent_queries = 2 * self.max_batch_size
 
         if len(config_dict) != 0:
@@ -68,6 +74,12 @@ class BackendConfig:
         if "max_concurrent_queries" in config_dict:
             self.max_concurrent_queries = config_dict.pop(
                 "max_concurrent_queries")
+        if "replica_policy" in config_dict:
+            self.replica_policy = config_dict.pop("replica_policy")
+        if "adaptive_batching" in config_dict:
+            self.adaptive_batching = config_dict.pop("adaptive_batching")
+        if "slo_miss_target" in config_dict:
+            self.slo_miss_target = config_dict.pop("slo_miss_target")
 
         if len(config_dict) != 0:
             raise ValueError("Unknown options in backend config: {}".format(
@@ -94,6 +106,21 @@ class BackendConfig:
                     "@serve.accept_batch to explicitly mark the function or "
                     "method as batchable and takes in list as arguments.")
 
+        if self.replica_policy not in REPLICA_POLICIES:
+            raise ValueError("replica_policy must be one of {}.".format(
+                sorted(REPLICA_POLICIES)))
+
+        if not isinstance(self.adaptive_batching, bool):
+            raise TypeError("adaptive_batching must be a bool.")
+        elif self.adaptive_batching and self.max_batch_size is None:
+            raise ValueError(
+                "adaptive_batching requires max_batch_size to be set.")
+
+        if not isinstance(self.slo_miss_target, (int, float)):
+            raise TypeError("slo_miss_target must be a number.")
+        elif not 0 <= self.slo_miss_target <= 1:
+            raise ValueError("slo_miss_target must be between 0 and 1.")
+
 
 class ReplicaConfig:
     def __init__(self, func_or_class, *actor_init_args,
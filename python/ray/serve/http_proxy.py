@@ -1,4 +1,5 @@
 import asyncio
+import random
 
 import uvicorn
 
@@ -8,6 +9,7 @@ from ray.serve.context import TaskContext
 from ray.serve.metric import MetricClient
 from ray.serve.request_params import RequestMetadata
 from ray.serve.http_util import Response
+from ray.serve.router import Router
 from ray.serve.utils import logger
 
 from urllib.parse import parse_qs
@@ -24,14 +26,21 @@ class HTTPProxy:
     >>> import uvicorn
     >>> uvicorn.run(HTTPProxy(kv_store_actor_handle, router_handle))
     # blocks forever
+
+    If an embedded router is given, requests are routed to the replicas
+    from within the proxy instead of through the router actors.
     """
 
+    def __init__(self, embedded_router=None):
+        self.embedded_router = embedded_router
+
     async def fetch_config_from_master(self):
         assert ray.is_initialized()
         master = serve.api._get_master_actor()
 
-        self.route_table, [self.router_handle
-                           ] = await master.get_http_proxy_config.remote()
+        # Requests are spread randomly over the router shards.
+        self.route_table, self.router_handles = (
+            await master.get_http_proxy_config.remote())
 
         # The exporter is required to return results for /-/metrics endpoint.
         [self.metric_exporter] = await master.get_metric_exporter.remote()
@@ -158,8 +167,13 @@ class HTTPProxy:
         retries = 0
         while retries <= MAX_ACTOR_DEAD_RETRIES:
             try:
-                result = await self.router_handle.enqueue_request.remote(
-                    request_metadata, scope, http_body_bytes)
+                if self.embedded_router is not None:
+                    result = await self.embedded_router.enqueue_request(
+                        request_metadata, scope, http_body_bytes)
+                else:
+                    router_handle = random.choice(self.router_handles)
+                    result = await router_handle.enqueue_request.remote(
+                        request_metadata, scope, http_body_bytes)
                 if not isinstance(result, ray.exceptions.RayActorError):
                     await Response(result).send(scope, receive, send)
                     break
@@ -177,9 +191,18 @@ class HTTPProxy:
 
 @ray.remote
 class HTTPProxyActor:
-    async def __init__(self, host, port, instance_name=None):
+    async def __init__(self,
+                       host,
+                       port,
+                       instance_name=None,
+                       embedded_routing=False,
+                       num_routers=1):
         serve.init(name=instance_name)
-        self.app = HTTPProxy()
+        self.router = None
+        if embedded_routing:
+            self.router = await Router.create_embedded(
+                instance_name=instance_name, num_routers=num_routers)
+        self.app = HTTPProxy(embedded_router=self.router)
         await self.app.fetch_config_from_master()
         self.host = host
         self.port = port
@@ -206,3 +229,25 @@ class HTTPProxyActor:
 
     async def set_route_table(self, route_table):
         self.app.set_route_table(route_table)
+
+    # The following methods forward configuration updates from the master
+    # to the embedded router, if any.
+
+    async def set_traffic(self, endpoint, traffic_policy):
+        await self.router.set_traffic(endpoint, traffic_policy)
+
+    async def remove_endpoint(self, endpoint):
+        await self.router.remove_endpoint(endpoint)
+
+    async def add_new_worker(self, backend_tag, replica_tag, worker_handle):
+        await self.router.add_new_worker(backend_tag, replica_tag,
+                                         worker_handle)
+
+    async def remove_worker(self, backend_tag, replica_tag):
+        await self.router.remove_worker(backend_tag, replica_tag)
+
+    async def set_backend_config(self, backend, config):
+        await self.router.set_backend_config(backend, config)
+
+    async def remove_backend(self, backend):
+        await self.router.remove_backend(backend)
@@ -58,6 +58,14 @@ class TrafficPolicy:
             self.shadow_dict[backend] = proportion
 
 
+def _router_shard_name(index):
+    # The first shard keeps the name of the single router from before
+    # routers were sharded.
+    if index == 0:
+        return SERVE_ROUTER_NAME
+    return "{}#{}".format(SERVE_ROUTER_NAME, index)
+
+
 BackendInfo = namedtuple("BackendInfo",
                          ["worker_class", "backend_config", "replica_config"])
 
@@ -88,8 +96,14 @@ class ServeMaster:
           requires all implementations here to be idempotent.
     """
 
-    async def __init__(self, instance_name, http_node_id, http_proxy_host,
-                       http_proxy_port, metric_exporter_class):
+    async def __init__(self,
+                       instance_name,
+                       http_node_id,
+                       http_proxy_host,
+                       http_proxy_port,
+                       metric_exporter_class,
+                       num_routers=1,
+                       embedded_routing=False):
         # Unique name of the serve instance managed by this actor. Used to
         # namespace child actors and checkpoints.
         self.instance_name = instance_name
@@ -122,16 +136,20 @@ class ServeMaster:
         self.write_lock = asyncio.Lock()
 
         # Cached handles to actors in the system.
-        self.router = None
+        self.routers = []
         self.http_proxy = None
         self.metric_exporter = None
 
         # If starting the actor for the first time, starts up the other system
         # components. If recovering, fetches their actor handles.
         self._get_or_start_metric_exporter(metric_exporter_class)
-        self._get_or_start_router()
+        # If routing is embedded in the HTTP proxy, the proxy acts as one
+        # more router shard.
+        self.embedded_routing = embedded_routing
+        num_router_shards = num_routers + int(embedded_routing)
+        self._get_or_start_routers(num_routers, num_router_shards)
         self._get_or_start_http_proxy(http_node_id, http_proxy_host,
-                                      http_proxy_port)
+                                      http_proxy_port, num_router_shards)
 
         # NOTE(edoakes): unfortunately, we can't completely recover from a
         # checkpoint in the constructor because we block while waiting for
@@ -153,28 +171,60 @@ class ServeMaster:
             asyncio.get_event_loop().create_task(
                 self._recover_from_checkpoint(checkpoint))
 
-    def _get_or_start_router(self):
-        """Get the router belonging to this serve instance.
+    def _get_or_start_routers(self, num_routers, num_router_shards):
+        """Get the router shards belonging to this serve instance.
 
-        If the router does not already exist, it will be started.
+        Any router shards that do not already exist will be started. Shards
+        are spread over the nodes in the cluster. All shards receive the
+        same configuration updates, so they see a consistent set of
+        replicas, and each of them gets an equal share of every backend's
+        max_concurrent_queries.
         """
-        router_name = format_actor_name(SERVE_ROUTER_NAME, self.instance_name)
-        try:
-            self.router = ray.get_actor(router_name)
-        except ValueError:
-            logger.info("Starting router with name '{}'".format(router_name))
-            self.router = ray.remote(Router).options(
-                name=router_name,
-                max_concurrency=ASYNC_CONCURRENCY,
-                max_restarts=-1,
-                max_task_retries=-1,
-            ).remote(instance_name=self.instance_name)
+        # Node resources are named "node:<ip>", see ray.state.node_ids().
+        node_ids = sorted(
+            resource for node in ray.nodes() if node["Alive"]
+            for resource in node["Resources"]
+            if resource.startswith(ray.resource_spec.NODE_ID_PREFIX))
+        for index in range(num_routers):
+            router_name = format_actor_name(
+                _router_shard_name(index), self.instance_name)
+            try:
+                router = ray.get_actor(router_name)
+            except ValueError:
+                logger.info(
+                    "Starting router with name '{}'".format(router_name))
+                options = {}
+                if num_routers > 1 and node_ids:
+                    node_id = node_ids[index % len(node_ids)]
+                    options["resources"] = {node_id: 0.01}
+                router = ray.remote(Router).options(
+                    name=router_name,
+                    max_concurrency=ASYNC_CONCURRENCY,
+                    max_restarts=-1,
+                    max_task_retries=-1,
+                    **options).remote(
+                        instance_name=self.instance_name,
+                        num_routers=num_router_shards)
+            self.routers.append(router)
 
     def get_router(self):
-        """Returns a handle to the router managed by this actor."""
-        return [self.router]
+        """Returns handles to the router shards managed by this actor."""
+        return self.routers
 
-    def _get_or_start_http_proxy(self, node_id, host, port):
+    async def _broadcast_to_routers(self, method_name, *args):
+        """Calls the given method on every router shard.
+
+        This includes the HTTP proxy if routing is embedded in it.
+        """
+        routers = list(self.routers)
+        if self.embedded_routing:
+            routers.append(self.http_proxy)
+        await asyncio.gather(*[
+            getattr(router, method_name).remote(*args).as_future()
+            for router in routers
+        ])
+
+    def _get_or_start_http_proxy(self, node_id, host, port, num_router_shards):
         """Get the HTTP proxy belonging to this serve instance.
 
         If the HTTP proxy does not already exist, it will be started.
@@ -195,7 +245,11 @@ class ServeMaster:
                     node_id: 0.01
                 },
             ).remote(
-                host, port, instance_name=self.instance_name)
+                host,
+                port,
+                instance_name=self.instance_name,
+                embedded_routing=self.embedded_routing,
+                num_routers=num_router_shards)
 
     def get_http_proxy(self):
         """Returns a handle to the HTTP proxy managed by this actor."""
@@ -284,16 +338,17 @@ class ServeMaster:
         # Push configuration state to the router.
         # TODO(edoakes): should we make this a pull-only model for simplicity?
         for endpoint, traffic_policy in self.traffic_policies.items():
-            await self.router.set_traffic.remote(endpoint, traffic_policy)
+            await self._broadcast_to_routers("set_traffic", endpoint,
+                                             traffic_policy)
 
         for backend_tag, replica_dict in self.workers.items():
             for replica_tag, worker in replica_dict.items():
-                await self.router.add_new_worker.remote(
-                    backend_tag, replica_tag, worker)
+                await self._broadcast_to_routers("add_new_worker", backend_tag,
+                                                 replica_tag, worker)
 
         for backend, info in self.backends.items():
-            await self.router.set_backend_config.remote(
-                backend, info.backend_config)
+            await self._broadcast_to_routers("set_backend_config", backend,
+                                             info.backend_config)
             await self.broadcast_backend_config(backend)
 
         # Push configuration state to the HTTP proxy.
@@ -370,8 +425,8 @@ class ServeMaster:
         self.workers[backend_tag][replica_tag] = worker_handle
 
         # Register the worker with the router.
-        await self.router.add_new_worker.remote(backend_tag, replica_tag,
-                                                worker_handle)
+        await self._broadcast_to_routers("add_new_worker", backend_tag,
+                                         replica_tag, worker_handle)
 
     async def _start_pending_replicas(self):
         """Starts the pending backend replicas in self.replicas_to_start.
@@ -409,8 +464,8 @@ class ServeMaster:
                     continue
 
                 # Remove the replica from router. This call is idempotent.
-                await self.router.remove_worker.remote(backend_tag,
-                                                       replica_tag)
+                await self._broadcast_to_routers("remove_worker", backend_tag,
+                                                 replica_tag)
 
                 # TODO(edoakes): this logic isn't ideal because there may be
                 # pending tasks still executing on the replica. However, if we
@@ -427,7 +482,7 @@ class ServeMaster:
         Clears self.backends_to_remove.
         """
         for backend_tag in self.backends_to_remove:
-            await self.router.remove_backend.remote(backend_tag)
+            await self._broadcast_to_routers("remove_backend", backend_tag)
         self.backends_to_remove.clear()
 
     async def _remove_pending_endpoints(self):
@@ -436,7 +491,7 @@ class ServeMaster:
         Clears self.endpoints_to_remove.
         """
         for endpoint_tag in self.endpoints_to_remove:
-            await self.router.remove_endpoint.remote(endpoint_tag)
+            await self._broadcast_to_routers("remove_endpoint", endpoint_tag)
         self.endpoints_to_remove.clear()
 
     def _scale_replicas(self, backend_tag, num_replicas):
@@ -550,7 +605,8 @@ class ServeMaster:
         # update to avoid inconsistent state if we crash after pushing the
         # update.
         self._checkpoint()
-        await self.router.set_traffic.remote(endpoint_name, traffic_policy)
+        await self._broadcast_to_routers("set_traffic", endpoint_name,
+                                         traffic_policy)
 
     async def set_traffic(self, endpoint_name, traffic_dict):
         """Sets the traffic policy for the specified endpoint."""
@@ -577,8 +633,9 @@ class ServeMaster:
             # update to avoid inconsistent state if we crash after pushing the
             # update.
             self._checkpoint()
-            await self.router.set_traffic.remote(
-                endpoint_name, self.traffic_policies[endpoint_name])
+            await self._broadcast_to_routers(
+                "set_traffic", endpoint_name,
+                self.traffic_policies[endpoint_name])
 
     async def create_endpoint(self, endpoint, traffic_dict, route, methods):
         """Create a new endpoint with the specified route and methods.
@@ -677,8 +734,8 @@ class ServeMaster:
 
             # Set the backend config inside the router
             # (particularly for max-batch-size).
-            await self.router.set_backend_config.remote(
-                backend_tag, backend_config)
+            await self._broadcast_to_routers("set_backend_config", backend_tag,
+                                             backend_config)
             await self.broadcast_backend_config(backend_tag)
 
     async def delete_backend(self, backend_tag):
@@ -734,8 +791,8 @@ class ServeMaster:
 
             # Inform the router about change in configuration
             # (particularly for setting max_batch_size).
-            await self.router.set_backend_config.remote(
-                backend_tag, backend_config)
+            await self._broadcast_to_routers("set_backend_config", backend_tag,
+                                             backend_config)
 
             await self._start_pending_replicas()
             await self._stop_pending_replicas()
@@ -766,7 +823,8 @@ class ServeMaster:
         """Shuts down the serve instance completely."""
         async with self.write_lock:
             ray.kill(self.http_proxy, no_restart=True)
-            ray.kill(self.router, no_restart=True)
+            for router in self.routers:
+                ray.kill(router, no_restart=True)
             ray.kill(self.metric_exporter, no_restart=True)
             for replica_dict in self.workers.values():
                 for replica in replica_dict.values():
@@ -1,7 +1,9 @@
 from abc import ABCMeta, abstractmethod
 import copy
 from hashlib import sha256
+import random
 
+import blist
 import numpy as np
 
 from ray.serve.utils import logger
@@ -99,3 +101,184 @@ class RandomEndpointPolicy(EndpointPolicy):
                     backend_queues[shadow_backend].add(shadow_query)
 
         return assigned_backends
+
+
+class ReplicaPolicy:
+    """Chooses which replica of a backend a query is sent to.
+
+    The router reports each query sent to a replica and its completion. The
+    replicas are kept ordered by their number of in flight queries, so it
+    takes O(1) to tell whether any replica can accept another query and the
+    default policy picks the least loaded replica.
+
+    To add a new policy, subclass this class, override choose_replica and
+    register the subclass in REPLICA_POLICIES.
+    """
+
+    def __init__(self):
+        # Sorted (in flight queries, replica tag) pairs.
+        self.loads = blist.sortedlist()
+        # replica tag -> in flight queries
+        self.in_flight = dict()
+
+    def __len__(self):
+        return len(self.loads)
+
+    def __iter__(self):
+        return iter(self.loads)
+
+    def __contains__(self, replica_tag):
+        return replica_tag in self.in_flight
+
+    def add_replica(self, replica_tag, in_flight=0):
+        if replica_tag in self.in_flight:
+            return
+        self.in_flight[replica_tag] = in_flight
+        self.loads.add((in_flight, replica_tag))
+
+    def remove_replica(self, replica_tag):
+        if replica_tag not in self.in_flight:
+            return
+        in_flight = self.in_flight.pop(replica_tag)
+        self.loads.discard((in_flight, replica_tag))
+
+    def on_query_sent(self, replica_tag):
+        self._update(replica_tag, 1)
+
+    def on_query_completed(self, replica_tag, latency_s):
+        """Called when a replica finished a query.
+
+        Arguments:
+            replica_tag (str): Replica that processed the query.
+            latency_s (float): Time between sending the query and receiving
+                its result.
+        """
+        self._update(replica_tag, -1)
+
+    def assign(self, max_queries):
+        """Returns the replica to send the next query to.
+
+        Arguments:
+            max_queries (int): Maximum in flight queries per replica.
+
+        Returns:
+            A replica tag, or None if all replicas are at the limit.
+        """
+        if len(self.loads) == 0 or self.loads[0][0] >= max_queries:
+            return None
+        return self.choose_replica(max_queries)
+
+    def choose_replica(self, max_queries):
+        """Chooses among the replicas, at least one of which is available.
+
+        Defaults to the replica with the fewest in flight queries.
+        """
+        return self.loads[0][1]
+
+    def _update(self, replica_tag, delta):
+        # The replica might have been removed already.
+        if replica_tag not in self.in_flight:
+            return
+        in_flight = self.in_flight[replica_tag]
+        self.loads.discard((in_flight, replica_tag))
+        self.in_flight[replica_tag] = in_flight + delta
+        self.loads.add((in_flight + delta, replica_tag))
+
+
+class LeastLoadedReplicaPolicy(ReplicaPolicy):
+    """Sends each query to the replica with the fewest in flight queries."""
+    pass
+
+
+class PowerOfTwoChoicesReplicaPolicy(ReplicaPolicy):
+    """
+    Picks two replicas at random and sends the query to the one with fewer
+    in flight queries.
+
+    Unlike always picking the least loaded replica, this spreads a burst of
+    queries over the replicas even when the load counts are stale, such as
+    when several routers share the replicas.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.replica_tags = []
+
+    def add_replica(self, replica_tag, in_flight=0):
+        if replica_tag not in self.in_flight:
+            self.replica_tags.append(replica_tag)
+        super().add_replica(replica_tag, in_flight)
+
+    def remove_replica(self, replica_tag):
+        if replica_tag in self.in_flight:
+            self.replica_tags.remove(replica_tag)
+        super().remove_replica(replica_tag)
+
+    def score(self, replica_tag):
+        """Returns the cost of sending a query to the replica."""
+        return self.in_flight[replica_tag]
+
+    def choose_replica(self, max_queries):
+        if len(self.replica_tags) == 1:
+            return self.replica_tags[0]
+        choices = random.sample(self.replica_tags, 2)
+        chosen = min(choices, key=self.score)
+        if self.in_flight[chosen] >= max_queries:
+            # Both choices are overloaded, fall back to the least loaded
+            # replica, which is known to be available.
+            chosen = self.loads[0][1]
+        return chosen
+
+
+class EWMALatencyReplicaPolicy(PowerOfTwoChoicesReplicaPolicy):
+    """
+    Power of two choices weighted by the replicas' recent latency.
+
+    Each replica is scored by an exponentially weighted moving average of
+    its query latency times its in flight queries plus one, so slow
+    replicas, like ones on busy or heterogeneous nodes, get fewer queries.
+    Replicas that haven't completed a query yet are assumed to have the
+    average latency of the others.
+
+    Arguments:
+        decay (float): Weight of the previous average in each update.
+    """
+
+    def __init__(self, decay=0.9):
+        super().__init__()
+        self.decay = decay
+        # replica tag -> moving average of latency in seconds
+        self.latency = dict()
+        self.latency_sum = 0
+
+    def remove_replica(self, replica_tag):
+        self.latency_sum -= self.latency.pop(replica_tag, 0)
+        super().remove_replica(replica_tag)
+
+    def on_query_completed(self, replica_tag, latency_s):
+        if replica_tag in self.in_flight:
+            previous = self.latency.get(replica_tag)
+            if previous is None:
+                self.latency[replica_tag] = latency_s
+            else:
+                self.latency[replica_tag] = (
+                    self.decay * previous + (1 - self.decay) * latency_s)
+            self.latency_sum += self.latency[replica_tag] - (previous or 0)
+        super().on_query_completed(replica_tag, latency_s)
+
+    def score(self, replica_tag):
+        if replica_tag in self.latency:
+            latency = self.latency[replica_tag]
+        elif self.latency:
+            latency = self.latency_sum / len(self.latency)
+        else:
+            latency = 1
+        return latency * (self.in_flight[replica_tag] + 1)
+
+
+# Replica policies that can be set by the "replica_policy" backend option.
+REPLICA_POLICIES = {
+    "least_loaded": LeastLoadedReplicaPolicy,
+    "power_of_two_choices": PowerOfTwoChoicesReplicaPolicy,
+    "ewma_latency": EWMALatencyReplicaPolicy,
+}
@@ -1,6 +1,7 @@
 import asyncio
 import copy
 from collections import defaultdict, deque
+import math
 import time
 from typing import DefaultDict, List
 
@@ -12,7 +13,8 @@ from ray.exceptions import RayTaskError
 import ray
 from ray import serve
 from ray.serve.metric import MetricClient
-from ray.serve.policy import RandomEndpointPolicy
+from ray.serve.policy import (LeastLoadedReplicaPolicy, RandomEndpointPolicy,
+                              REPLICA_POLICIES)
 from ray.serve.utils import logger, chain_future
 
 
@@ -85,18 +87,40 @@ def _make_future_unwrapper(client_futures: List[asyncio.Future],
 
 
 class Router:
-    """A router that routes request to available workers."""
-
-    async def __init__(self, instance_name=None):
+    """A router that routes request to available workers.
+
+    Serve may run several routers as shards of one logical router. Each
+    shard sees the same replicas and is allowed an equal share of every
+    replica's max_concurrent_queries.
+    """
+
+    async def __init__(self, instance_name=None, num_routers=1):
+        await self.setup(instance_name, num_routers)
+
+    @classmethod
+    async def create_embedded(cls, instance_name=None, num_routers=1):
+        """Creates a router that runs in the calling process.
+
+        An embedded router sends queries straight to the replicas from the
+        process that received them, skipping the hop through a router
+        actor. The caller is responsible for forwarding configuration
+        updates from the master to it.
+        """
+        router = cls.__new__(cls)
+        await router.setup(instance_name, num_routers)
+        return router
+
+    async def setup(self, instance_name=None, num_routers=1):
         # Note: Several queues are used in the router
         # - When a request come in, it's placed inside its corresponding
         #   endpoint_queue.
         # - The endpoint_queue is dequeued during flush operation, which moves
         #   the queries to backend buffer_queue. Here we match a request
         #   for an endpoint to a backend given some policy.
-        # - The worker_queue is used to collect idle actor handle. These
-        #   handles are dequed during the second stage of flush operation,
-        #   which assign queries in buffer_queue to actor handle.
+        # - The worker_queue holds the replicas of a backend and their number
+        #   of in flight queries. During the second stage of flush operation,
+        #   queries in buffer_queue are assigned to the replicas chosen by the
+        #   backend's replica policy.
 
         # -- Queues -- #
 
@@ -104,8 +128,8 @@ class Router:
         # We use FIFO (left to right) ordering. The new items should be added
         # using appendleft. Old items should be removed via pop().
         self.endpoint_queues: DefaultDict[deque[Query]] = defaultdict(deque)
-        # backend_name -> worker replica tag queue
-        self.worker_queues: DefaultDict[deque[str]] = defaultdict(deque)
+        # backend_name -> ReplicaPolicy
+        self.worker_queues = defaultdict(LeastLoadedReplicaPolicy)
         # backend_name -> worker payload queue
         self.backend_queues = defaultdict(blist.sortedlist)
 
@@ -119,17 +143,15 @@ class Router:
         self.replicas = dict()
         # replica_tag -> concurrent queries counter
         self.queries_counter = defaultdict(lambda: 0)
+        # Number of router shards sharing the replicas' concurrency limits.
+        self.num_routers = num_routers
 
         # -- Synchronization -- #
 
-        # This lock guarantee that only one flush operation can happen at a
-        # time. Without the lock, multiple flush operation can pop from the
-        # same buffer_queue and worker_queue and create deadlock. For example,
-        # an operation holding the only query and the other flush operation
-        # holding the only idle replica. Additionally, allowing only one flush
-        # operation at a time simplifies design overhead for custom queuing and
-        # batching policies.
-        self.flush_lock = asyncio.Lock()
+        # Flush operations never yield to the event loop, so each of them
+        # runs to completion before any other one starts and no lock is
+        # needed. Requests for unrelated endpoints don't wait on each other
+        # and only touch the queues of their own endpoint and backends.
 
         # -- State Restoration -- #
         # Fetch the worker handles, traffic policies, and backend configs from
@@ -194,9 +216,8 @@ class Router:
             call_method=request_meta.call_method,
             shard_key=request_meta.shard_key,
             async_future=asyncio.get_event_loop().create_future())
-        async with self.flush_lock:
-            self.endpoint_queues[endpoint].appendleft(query)
-            self.flush_endpoint_queue(endpoint)
+        self.endpoint_queues[endpoint].appendleft(query)
+        self.flush_endpoint_queue(endpoint)
 
         # Note: a future change can be to directly return the ObjectID from
         # replica task submission
@@ -222,65 +243,58 @@ class Router:
         if backend_replica_tag not in self.replicas:
             return
 
-        async with self.flush_lock:
-            # NOTE(simon): This is a O(n) operation where n=len(worker_queue)
-            if backend_replica_tag not in self.worker_queues[backend_tag]:
-                self.worker_queues[backend_tag].appendleft(backend_replica_tag)
-            self.flush_backend_queues([backend_tag])
+        self.worker_queues[backend_tag].add_replica(
+            backend_replica_tag, self.queries_counter[backend_replica_tag])
+        self.flush_backend_queues([backend_tag])
 
     async def remove_worker(self, backend_tag, replica_tag):
         backend_replica_tag = backend_tag + ":" + replica_tag
         if backend_replica_tag not in self.replicas:
             return
 
-        # We need this lock because we modify worker_queue here.
-        async with self.flush_lock:
-            del self.replicas[backend_replica_tag]
-
-            try:
-                self.worker_queues[backend_tag].remove(backend_replica_tag)
-            except ValueError:
-                # Replica doesn't exist in the idle worker queues.
-                # It's ok because the worker might not have returned the
-                # result.
-                pass
+        del self.replicas[backend_replica_tag]
+        self.worker_queues[backend_tag].remove_replica(backend_replica_tag)
 
     async def set_traffic(self, endpoint, traffic_policy):
         logger.debug("Setting traffic for endpoint %s to %s", endpoint,
                      traffic_policy)
-        async with self.flush_lock:
-            self.traffic[endpoint] = RandomEndpointPolicy(traffic_policy)
-            self.flush_endpoint_queue(endpoint)
+        self.traffic[endpoint] = RandomEndpointPolicy(traffic_policy)
+        self.flush_endpoint_queue(endpoint)
 
     async def remove_endpoint(self, endpoint):
         logger.debug("Removing endpoint {}".format(endpoint))
-        async with self.flush_lock:
-            self.flush_endpoint_queue(endpoint)
-            if endpoint in self.endpoint_queues:
-                del self.endpoint_queues[endpoint]
-            if endpoint in self.traffic:
-                del self.traffic[endpoint]
+        self.flush_endpoint_queue(endpoint)
+        if endpoint in self.endpoint_queues:
+            del self.endpoint_queues[endpoint]
+        if endpoint in self.traffic:
+            del self.traffic[endpoint]
 
     async def set_backend_config(self, backend, config):
         logger.debug("Setting backend config for "
                      "backend {} to {}.".format(backend, config))
-        async with self.flush_lock:
-            self.backend_info[backend] = config
+        self.backend_info[backend] = config
+        policy_cls = REPLICA_POLICIES[config.replica_policy]
+        if type(self.worker_queues[backend]) is not policy_cls:
+            worker_queue = policy_cls()
+            for curr_queries, backend_replica_tag in self.worker_queues[
+                    backend]:
+                worker_queue.add_replica(backend_replica_tag, curr_queries)
+            self.worker_queues[backend] = worker_queue
+        # A higher concurrency limit may allow buffered queries to be sent.
+        self.flush_backend_queues([backend])
 
     async def remove_backend(self, backend):
         logger.debug("Removing backend {}".format(backend))
-        async with self.flush_lock:
-            self.flush_backend_queues([backend])
-            if backend in self.backend_info:
-                del self.backend_info[backend]
-            if backend in self.worker_queues:
-                del self.worker_queues[backend]
-            if backend in self.backend_queues:
-                del self.backend_queues[backend]
+        self.flush_backend_queues([backend])
+        if backend in self.backend_info:
+            del self.backend_info[backend]
+        if backend in self.worker_queues:
+            del self.worker_queues[backend]
+        if backend in self.backend_queues:
+            del self.backend_queues[backend]
 
     def flush_endpoint_queue(self, endpoint):
         """Attempt to schedule any pending requests to available backends."""
-        assert self.flush_lock.locked()
         if endpoint not in self.traffic:
             return
         backends_to_flush = self.traffic[endpoint].flush(
@@ -289,7 +303,6 @@ class Router:
 
     # Flushes the specified backend queues and assigns work to workers.
     def flush_backend_queues(self, backends_to_flush):
-        assert self.flush_lock.locked()
         for backend in backends_to_flush:
             # No workers available.
             if len(self.worker_queues[backend]) == 0:
@@ -328,47 +341,41 @@ class Router:
         except RayTaskError as error:
             self.num_error_backend_request.labels(backend=backend).add()
             result = error
+        latency = time.time() - start
         self.queries_counter[backend_replica_tag] -= 1
-        await self.mark_worker_idle(backend, backend_replica_tag)
-        logger.debug("Got result in {:.2f}s".format(time.time() - start))
+        self.worker_queues[backend].on_query_completed(backend_replica_tag,
+                                                       latency)
+        self.flush_backend_queues([backend])
+        logger.debug("Got result in {:.2f}s".format(latency))
         return result
 
+    def _max_concurrent_queries(self, backend):
+        """Returns this router's share of a replica's concurrency limit."""
+        max_queries = 1
+        if backend in self.backend_info:
+            max_queries = self.backend_info[backend].max_concurrent_queries
+        # Round up so that every shard can send at least one query.
+        return math.ceil(max_queries / self.num_routers)
+
     def _assign_query_to_worker(self, backend, buffer_queue, worker_queue):
-        overloaded_replicas = set()
+        max_queries = self._max_concurrent_queries(backend)
         while len(buffer_queue) and len(worker_queue):
-            backend_replica_tag = worker_queue.pop()
-
-            # The replica might have been deleted already.
-            if backend_replica_tag not in self.replicas:
-                continue
+            backend_replica_tag = worker_queue.assign(max_queries)
 
-            # We have reached the end of the worker queue where all replicas
-            # are overloaded.
-            if backend_replica_tag in overloaded_replicas:
-                break
-
-            # This replica has too many in flight and processing queries.
-            max_queries = 1
-            if backend in self.backend_info:
-                max_queries = self.backend_info[backend].max_concurrent_queries
-            curr_queries = self.queries_counter[backend_replica_tag]
-            if curr_queries >= max_queries:
-                # Put the worker back to the queue.
-                worker_queue.appendleft(backend_replica_tag)
-                overloaded_replicas.add(backend_replica_tag)
+            # All replicas have too many in flight and processing queries.
+            if backend_replica_tag is None:
                 logger.debug(
-                    "Skipping backend {} because it has {} in flight "
-                    "requests which exceeded the concurrency limit.".format(
-                        backend, curr_queries))
-                continue
+                    "Skipping backend {} because all replicas have {} or "
+                    "more in flight requests, which exceeds the concurrency "
+                    "limit.".format(backend, max_queries))
+                break
 
             request = buffer_queue.pop(0)
             self.queries_counter[backend_replica_tag] += 1
+            worker_queue.on_query_sent(backend_replica_tag)
             future = asyncio.get_event_loop().create_task(
                 self._do_query(backend, backend_replica_tag, request))
 
             # For shadow queries, just ignore the result.
             if not request.is_shadow_query:
                 chain_future(future, request.async_future)
-
-            worker_queue.appendleft(backend_replica_tag)
@@ -399,6 +399,30 @@ def test_name():
     serve.delete_backend(backend)
 
 
+def test_sharded_routers(serve_instance):
+    instance_name = "sharded"
+    serve.init(name=instance_name, http_port=8004, num_routers=2)
+
+    def function():
+        return "hello"
+
+    serve.create_backend("backend", function)
+    serve.create_endpoint("endpoint", backend="backend", route="/sharded")
+
+    for _ in range(10):
+        assert requests.get("http://127.0.0.1:8004/sharded").text == "hello"
+    handle = serve.get_handle("endpoint")
+    assert ray.get([handle.remote() for _ in range(10)]) == ["hello"] * 10
+
+    for index in range(2):
+        name = constants.SERVE_ROUTER_NAME
+        if index > 0:
+            name = "{}#{}".format(name, index)
+        ray.get_actor(format_actor_name(name, instance_name))
+
+    serve.shutdown()
+
+
 def test_parallel_start(serve_instance):
     # Test the ability to start multiple replicas in parallel.
     # In the past, when Serve scale up a backend, it does so one by one and
@@ -1,4 +1,5 @@
 import asyncio
+import time
 
 import pytest
 import numpy as np
@@ -6,10 +7,12 @@ import numpy as np
 import ray
 from ray import serve
 import ray.serve.context as context
-from ray.serve.backend_worker import create_backend_worker, wrap_to_ray_error
+from ray.serve.backend_worker import (create_backend_worker, wrap_to_ray_error,
+                                      AdaptiveBatchPolicy, BatchQueue,
+                                      _histogram_buckets)
 from ray.serve.master import TrafficPolicy
 from ray.serve.request_params import RequestMetadata
-from ray.serve.router import Router
+from ray.serve.router import Router, Query
 from ray.serve.config import BackendConfig
 from ray.serve.exceptions import RayServeException
 
@@ -286,6 +289,64 @@ async def test_task_runner_perform_async(serve_instance):
         await item == "done!"
 
 
+async def test_histogram_buckets():
+    # Buckets are cumulative, like Prometheus histograms.
+    buckets = [1, 2, 4]
+    assert _histogram_buckets(0.5, buckets) == ["1", "2", "4", "+Inf"]
+    assert _histogram_buckets(2, buckets) == ["2", "4", "+Inf"]
+    assert _histogram_buckets(3, buckets) == ["4", "+Inf"]
+    assert _histogram_buckets(5, buckets) == ["+Inf"]
+
+
+async def test_adaptive_batch_policy():
+    policy = AdaptiveBatchPolicy(max_batch_size=8)
+    # Batches take 10ms plus 10ms per query.
+    for _ in range(10):
+        for batch_size in range(1, 9):
+            policy.observe(batch_size, 0.01 + 0.01 * batch_size, 0)
+    assert abs(policy.predict_duration_s(4) - 0.05) < 1e-6
+    assert policy.batch_size(slack_s=10) == 8
+    assert policy.batch_size(slack_s=0.055) == 4
+    assert policy.batch_size(slack_s=0) == 1
+    assert policy.wait_s(4, slack_s=0.055) < 0.01
+    # Time already waited only shortens the maximum wait.
+    assert abs(policy.wait_s(4, slack_s=1) - 0.05) < 1e-6
+    assert abs(policy.wait_s(4, slack_s=1, waited_s=0.02) - 0.03) < 1e-6
+    assert abs(policy.wait_s(4, slack_s=0.07, waited_s=0.01) - 0.02) < 1e-6
+    assert policy.wait_s(4, slack_s=1, waited_s=0.06) == 0
+
+    # Missing the SLOs shrinks the batch size limit.
+    policy.observe(8, 0.09, 8)
+    assert policy.batch_size_limit == 4
+    assert policy.batch_size(slack_s=10) == 4
+    # And it grows back once they are met.
+    for _ in range(10):
+        policy.observe(4, 0.05, 0)
+    assert policy.batch_size_limit == 8
+
+
+async def test_batch_queue_adaptive():
+    policy = AdaptiveBatchPolicy(max_batch_size=8)
+    for batch_size in range(1, 9):
+        policy.observe(batch_size, 0.01 * batch_size, 0)
+    queue = BatchQueue(8, 0, policy)
+
+    def make_query(slo_s):
+        return Query([], {}, context.TaskContext.Python,
+                     (time.time() + slo_s) * 1000)
+
+    for _ in range(10):
+        queue.put(make_query(slo_s=100))
+    assert len(await queue.wait_for_batch()) == 8
+    assert len(await queue.wait_for_batch()) == 2
+
+    # A query with a tight SLO limits the size of its batch.
+    queue.put(make_query(slo_s=0.035))
+    for _ in range(7):
+        queue.put(make_query(slo_s=100))
+    assert len(await queue.wait_for_batch()) <= 3
+
+
 if __name__ == "__main__":
     import sys
     sys.exit(pytest.main(["-v", "-s", __file__]))
@@ -34,6 +34,24 @@ def test_backend_config_validation():
     with pytest.raises(ValueError):
         BackendConfig({"max_batch_size": -1})
 
+    # Test replica_policy validation.
+    BackendConfig({"replica_policy": "ewma_latency"})
+    with pytest.raises(ValueError, match="replica_policy"):
+        BackendConfig({"replica_policy": "round_robin"})
+
+    # Test adaptive batching validation.
+    BackendConfig(
+        {
+            "max_batch_size": 4,
+            "adaptive_batching": True,
+            "slo_miss_target": 0.05
+        },
+        accepts_batches=True)
+    with pytest.raises(ValueError, match="max_batch_size"):
+        BackendConfig({"adaptive_batching": True}, accepts_batches=True)
+    with pytest.raises(ValueError, match="slo_miss_target"):
+        BackendConfig({"slo_miss_target": 2})
+
 
 def test_backend_config_update():
     b = BackendConfig({"num_replicas": 1, "max_batch_size": 1})
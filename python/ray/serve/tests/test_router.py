@@ -5,6 +5,9 @@ import pytest
 import ray
 
 from ray.serve.master import TrafficPolicy
+from ray.serve.policy import (EWMALatencyReplicaPolicy,
+                              LeastLoadedReplicaPolicy,
+                              PowerOfTwoChoicesReplicaPolicy)
 from ray.serve.router import Router
 from ray.serve.request_params import RequestMetadata
 from ray.serve.utils import get_random_letters
@@ -62,6 +65,19 @@ async def test_single_prod_cons_queue(serve_instance, task_runner_mock_actor):
     assert got_work.request_kwargs == {}
 
 
+async def test_embedded_router(serve_instance, task_runner_mock_actor):
+    router = await Router.create_embedded()
+    await router.set_traffic("svc", TrafficPolicy({"backend-embedded": 1.0}))
+    await router.add_new_worker("backend-embedded", "replica-1",
+                                task_runner_mock_actor)
+
+    # The query is sent from this process directly to the replica.
+    result = await router.enqueue_request(RequestMetadata("svc", None), 1)
+    assert result == "DONE"
+    got_work = await task_runner_mock_actor.get_recent_call.remote()
+    assert got_work.request_args[0] == 1
+
+
 async def test_slo(serve_instance, task_runner_mock_actor):
     q = ray.remote(Router).remote()
     await q.set_traffic.remote("svc", TrafficPolicy({"backend-slo": 1.0}))
@@ -238,6 +254,146 @@ async def test_router_use_max_concurrency(serve_instance):
     assert len(backend_queues["max-concurrent-test"]) == 0
 
 
+async def test_router_least_loaded_replica(serve_instance):
+    signal = SignalActor.remote()
+
+    @ray.remote
+    class MockWorker:
+        async def handle_request(self, request):
+            await signal.wait.remote()
+            return "DONE"
+
+        def ready(self):
+            pass
+
+    class VisibleRouter(Router):
+        def get_queues(self):
+            return self.queries_counter, self.worker_queues
+
+    q = ray.remote(VisibleRouter).remote()
+    BACKEND_NAME = "least-loaded-test"
+    config = BackendConfig({"max_concurrent_queries": 2})
+    await q.set_traffic.remote("svc", TrafficPolicy({BACKEND_NAME: 1.0}))
+    await q.set_backend_config.remote(BACKEND_NAME, config)
+    for replica_tag in ["replica-1", "replica-2"]:
+        await q.add_new_worker.remote(BACKEND_NAME, replica_tag,
+                                      MockWorker.remote())
+
+    queries = [
+        q.enqueue_request.remote(RequestMetadata("svc", None), 1)
+        for _ in range(3)
+    ]
+    with pytest.raises(ray.exceptions.RayTimeoutError):
+        ray.get(queries, timeout=0.2)
+
+    # Queries are spread over the replicas before any of them is full.
+    queries_counter, worker_queues = await q.get_queues.remote()
+    counts = sorted(queries_counter[BACKEND_NAME + ":" + replica_tag]
+                    for replica_tag in ["replica-1", "replica-2"])
+    assert counts == [1, 2]
+    assert [load for load, _ in worker_queues[BACKEND_NAME]] == [1, 2]
+
+    await signal.send.remote()
+    assert await asyncio.gather(*queries) == ["DONE"] * 3
+
+
+async def test_replica_policies():
+    for policy in [
+            LeastLoadedReplicaPolicy(),
+            PowerOfTwoChoicesReplicaPolicy(),
+            EWMALatencyReplicaPolicy()
+    ]:
+        for replica_tag in ["a", "b", "c"]:
+            policy.add_replica(replica_tag)
+        # Fill up all replicas, the policies never exceed the limit.
+        for _ in range(6):
+            replica_tag = policy.assign(max_queries=2)
+            assert replica_tag is not None
+            policy.on_query_sent(replica_tag)
+        assert policy.assign(max_queries=2) is None
+        assert sorted(policy.in_flight.values()) == [2, 2, 2]
+
+        policy.on_query_completed("b", latency_s=0.1)
+        assert policy.assign(max_queries=2) == "b"
+        policy.remove_replica("b")
+        policy.on_query_completed("b", latency_s=0.1)
+        assert len(policy) == 2
+        assert policy.assign(max_queries=2) is None
+
+    # Slow replicas get fewer queries.
+    policy = EWMALatencyReplicaPolicy()
+    policy.add_replica("fast")
+    policy.add_replica("slow")
+    policy.on_query_sent("fast")
+    policy.on_query_completed("fast", latency_s=0.01)
+    policy.on_query_sent("slow")
+    policy.on_query_completed("slow", latency_s=1)
+    for _ in range(10):
+        replica_tag = policy.assign(max_queries=100)
+        policy.on_query_sent(replica_tag)
+    assert policy.in_flight["fast"] == 10
+
+
+async def test_router_replica_policy(serve_instance, task_runner_mock_actor):
+    class VisibleRouter(Router):
+        def get_worker_queue(self, backend):
+            return type(self.worker_queues[backend]).__name__, len(
+                self.worker_queues[backend])
+
+    q = ray.remote(VisibleRouter).remote()
+    BACKEND_NAME = "replica-policy-test"
+    await q.set_traffic.remote("svc", TrafficPolicy({BACKEND_NAME: 1.0}))
+    await q.add_new_worker.remote(BACKEND_NAME, "replica-1",
+                                  task_runner_mock_actor)
+    config = BackendConfig({"replica_policy": "power_of_two_choices"})
+    await q.set_backend_config.remote(BACKEND_NAME, config)
+    # The replicas are kept when the policy changes.
+    assert await q.get_worker_queue.remote(BACKEND_NAME) == (
+        "PowerOfTwoChoicesReplicaPolicy", 1)
+    result = await q.enqueue_request.remote(RequestMetadata("svc", None), 1)
+    assert result == "DONE"
+
+
+async def test_router_shard_max_concurrency(serve_instance):
+    signal = SignalActor.remote()
+
+    @ray.remote
+    class MockWorker:
+        async def handle_request(self, request):
+            await signal.wait.remote()
+            return "DONE"
+
+        def ready(self):
+            pass
+
+    class VisibleRouter(Router):
+        def get_queues(self):
+            return self.queries_counter, self.backend_queues
+
+    worker = MockWorker.remote()
+    # One of two router shards only gets half of the concurrency budget.
+    q = ray.remote(VisibleRouter).remote(num_routers=2)
+    BACKEND_NAME = "max-concurrent-shard-test"
+    config = BackendConfig({"max_concurrent_queries": 2})
+    await q.set_traffic.remote("svc", TrafficPolicy({BACKEND_NAME: 1.0}))
+    await q.add_new_worker.remote(BACKEND_NAME, "replica-tag", worker)
+    await q.set_backend_config.remote(BACKEND_NAME, config)
+
+    queries = [
+        q.enqueue_request.remote(RequestMetadata("svc", None), 1)
+        for _ in range(2)
+    ]
+    with pytest.raises(ray.exceptions.RayTimeoutError):
+        ray.get(queries, timeout=0.2)
+
+    queries_counter, backend_queues = await q.get_queues.remote()
+    assert queries_counter[BACKEND_NAME + ":replica-tag"] == 1
+    assert len(backend_queues[BACKEND_NAME]) == 1
+
+    await signal.send.remote()
+    assert await asyncio.gather(*queries) == ["DONE", "DONE"]
+
+
 if __name__ == "__main__":
     import sys
     sys.exit(pytest.main(["-v", "-s", __file__]))
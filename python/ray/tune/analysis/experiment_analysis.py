@@ -1,6 +1,7 @@
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import pandas as pd
@@ -8,18 +9,28 @@ except ImportError:
     pd = None
 
 from ray.tune.error import TuneError
+from ray.tune.logger import read_columnar_results
 from ray.tune.result import EXPR_PROGRESS_FILE, EXPR_PARAM_FILE,\
-    CONFIG_PREFIX, TRAINING_ITERATION
+    EXPR_COLUMNAR_DIR, CONFIG_PREFIX, TRAINING_ITERATION
 from ray.tune.trial import Trial
+from ray.tune.trial_runner import load_experiment_state
 from ray.tune.trainable import TrainableUtil
 
 logger = logging.getLogger(__name__)
 
+# Max number of threads reading trial results.
+NUM_READER_THREADS = 16
+
 
 class Analysis:
     """Analyze all results from a directory of experiments.
 
     To use this class, the experiment must be executed with the JsonLogger.
+
+    Trial results are read from the files of the ColumnarLogger if present
+    (only reading the columns needed, e.g. by `get_best_config`), and from
+    the files of the CSVLogger otherwise. The full trial dataframes are only
+    loaded when first accessed.
     """
 
     def __init__(self, experiment_dir):
@@ -29,14 +40,12 @@ class Analysis:
                 "{} is not a valid directory.".format(experiment_dir))
         self._experiment_dir = experiment_dir
         self._configs = {}
-        self._trial_dataframes = {}
+        self._trial_dataframes = None
 
         if not pd:
             logger.warning(
                 "pandas not installed. Run `pip install pandas` for "
                 "Analysis utilities.")
-        else:
-            self.fetch_trial_dataframes()
 
     def dataframe(self, metric=None, mode=None):
         """Returns a pandas.DataFrame object constructed from the trials.
@@ -49,7 +58,10 @@ class Analysis:
         Returns:
             pd.DataFrame: Constructed from a result dict of each trial.
         """
-        rows = self._retrieve_rows(metric=metric, mode=mode)
+        if self._trial_dataframes is None:
+            rows = self._retrieve_rows_projected(metric=metric, mode=mode)
+        else:
+            rows = self._retrieve_rows(metric=metric, mode=mode)
         all_configs = self.get_all_configs(prefix=True)
         for path, config in all_configs.items():
             if path in rows:
@@ -64,7 +76,7 @@ class Analysis:
             metric (str): Key for trial info to order on.
             mode (str): One of [min, max].
         """
-        rows = self._retrieve_rows(metric=metric, mode=mode)
+        rows = self._retrieve_rows(metric=metric, mode=mode, columns=[metric])
         all_configs = self.get_all_configs()
         compare_op = max if mode == "max" else min
         best_path = compare_op(rows, key=lambda k: rows[k][metric])
@@ -84,18 +96,34 @@ class Analysis:
             return df.iloc[df[metric].idxmin()].logdir
 
     def fetch_trial_dataframes(self):
-        fail_count = 0
-        for path in self._get_trial_paths():
-            try:
-                self.trial_dataframes[path] = pd.read_csv(
-                    os.path.join(path, EXPR_PROGRESS_FILE))
-            except Exception:
-                fail_count += 1
+        self._trial_dataframes = self._load_trial_dataframes()
+        return self._trial_dataframes
+
+    def _load_trial_dataframes(self, columns=None):
+        """Reads the results of all trials in parallel.
 
+        Args:
+            columns (list): Names of the result columns to read. Defaults to
+                all columns.
+
+        Returns:
+            Dict of trial paths to dataframes.
+        """
+        paths = self._get_trial_paths()
+        with ThreadPoolExecutor(min(NUM_READER_THREADS, len(paths))) as pool:
+            dataframes = list(
+                pool.map(lambda path: _read_trial_dataframe(path, columns),
+                         paths))
+        trial_dataframes = {
+            path: df
+            for path, df in zip(paths, dataframes) if df is not None
+        }
+
+        fail_count = len(paths) - len(trial_dataframes)
         if fail_count:
             logger.debug(
                 "Couldn't read results from {} paths".format(fail_count))
-        return self.trial_dataframes
+        return trial_dataframes
 
     def get_all_configs(self, prefix=False):
         """Returns a list of all configurations.
@@ -151,24 +179,56 @@ class Analysis:
         else:
             raise ValueError("trial should be a string or a Trial instance.")
 
-    def _retrieve_rows(self, metric=None, mode=None):
+    def _retrieve_rows(self, metric=None, mode=None, columns=None):
+        """Retrieves the last (or best) row of each trial.
+
+        Args:
+            metric (str): Key for trial info to order on.
+            mode (str): One of [min, max]. If None, uses last result.
+            columns (list): Names of the columns needed. If set and the
+                trial dataframes aren't loaded yet, only these are read.
+        """
         assert mode is None or mode in ["max", "min"]
+        if columns and self._trial_dataframes is None:
+            trial_dataframes = self._load_trial_dataframes(columns)
+        else:
+            trial_dataframes = self.trial_dataframes
         rows = {}
-        for path, df in self.trial_dataframes.items():
-            if mode == "max":
-                idx = df[metric].idxmax()
-            elif mode == "min":
-                idx = df[metric].idxmin()
-            else:
-                idx = -1
-            rows[path] = df.iloc[idx].to_dict()
+        for path, df in trial_dataframes.items():
+            rows[path] = df.iloc[_row_index(df, metric, mode)].to_dict()
 
         return rows
 
+    def _retrieve_rows_projected(self, metric=None, mode=None):
+        """Like `_retrieve_rows`, but reads the rows of columnar results
+        without loading the trial dataframes (except for the metric)."""
+        assert mode is None or mode in ["max", "min"]
+        if mode:
+            metric_dataframes = self._load_trial_dataframes([metric])
+        else:
+            metric_dataframes = {
+                path: None
+                for path in self._get_trial_paths()
+            }
+
+        def read_row(path):
+            df = metric_dataframes[path]
+            idx = -1 if df is None else _row_index(df, metric, mode)
+            return _read_trial_dataframe(path, row=int(idx))
+
+        paths = list(metric_dataframes)
+        with ThreadPoolExecutor(min(NUM_READER_THREADS, len(paths))) as pool:
+            dataframes = list(pool.map(read_row, paths))
+        return {
+            path: df.iloc[-1].to_dict()
+            for path, df in zip(paths, dataframes)
+            if df is not None and len(df)
+        }
+
     def _get_trial_paths(self):
         _trial_paths = []
-        for trial_path, _, files in os.walk(self._experiment_dir):
-            if EXPR_PROGRESS_FILE in files:
+        for trial_path, dirs, files in os.walk(self._experiment_dir):
+            if EXPR_PROGRESS_FILE in files or EXPR_COLUMNAR_DIR in dirs:
                 _trial_paths += [trial_path]
 
         if not _trial_paths:
@@ -179,9 +239,47 @@ class Analysis:
     @property
     def trial_dataframes(self):
         """List of all dataframes of the trials."""
+        if self._trial_dataframes is None:
+            if not pd:
+                return {}
+            self.fetch_trial_dataframes()
         return self._trial_dataframes
 
 
+def _row_index(df, metric, mode):
+    if mode == "max":
+        return df[metric].idxmax()
+    elif mode == "min":
+        return df[metric].idxmin()
+    return -1
+
+
+def _read_trial_dataframe(path, columns=None, row=None):
+    """Reads the results of a trial, or None if they can't be read.
+
+    Args:
+        path (str): The log directory of the trial.
+        columns (list): Names of the columns to read, defaults to all.
+        row (int): If set, only reads this row.
+    """
+    columnar_dir = os.path.join(path, EXPR_COLUMNAR_DIR)
+    if os.path.exists(columnar_dir):
+        try:
+            return pd.DataFrame(
+                read_columnar_results(columnar_dir, columns, row))
+        except Exception:
+            logger.debug("Couldn't read {}.".format(columnar_dir))
+    try:
+        df = pd.read_csv(
+            os.path.join(path, EXPR_PROGRESS_FILE),
+            usecols=columns and (lambda column: column in columns))
+    except Exception:
+        return None
+    if row is not None:
+        df = df.iloc[[row]]
+    return df
+
+
 class ExperimentAnalysis(Analysis):
     """Analyze results from a Tune experiment.
 
@@ -201,9 +299,8 @@ class ExperimentAnalysis(Analysis):
     """
 
     def __init__(self, experiment_checkpoint_path, trials=None):
-        with open(experiment_checkpoint_path) as f:
-            _experiment_state = json.load(f)
-            self._experiment_state = _experiment_state
+        _experiment_state = load_experiment_state(experiment_checkpoint_path)
+        self._experiment_state = _experiment_state
 
         if "checkpoints" not in _experiment_state:
             raise TuneError("Experiment state invalid; no checkpoints found.")
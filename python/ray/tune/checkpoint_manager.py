@@ -14,7 +14,8 @@ class Checkpoint:
 
     Attributes:
         storage (str): Storage type.
-        value (str): If storage==MEMORY, it is a Python object.
+        value (str): If storage==MEMORY, it is a Python object, or an
+            object ID of one stored in the object store.
             If storage==PERSISTENT, it is a path to persistent storage,
             or a future that will be resolved to such a path.
     """
@@ -136,6 +137,14 @@ class CheckpointManager:
             if worst != checkpoint:
                 self.delete(worst)
 
+    def clear_memory_checkpoint(self):
+        """Drops the reference to the newest MEMORY checkpoint.
+
+        The checkpoint data lives in the object store for as long as it is
+        referenced, so it is released once pending restores from it are done.
+        """
+        self.newest_memory_checkpoint = Checkpoint(Checkpoint.MEMORY, None)
+
     def best_checkpoints(self):
         """Returns best PERSISTENT checkpoints, sorted by score."""
         checkpoints = sorted(self._best_checkpoints, key=lambda c: c.priority)
@@ -1,6 +1,6 @@
 import logging
+import numbers
 import os
-import io
 import time
 import inspect
 import shutil
@@ -11,7 +11,8 @@ from six.moves import queue
 
 from ray.tune import TuneError, session
 from ray.tune.trainable import Trainable, TrainableUtil
-from ray.tune.result import (TIME_THIS_ITER_S, RESULT_DUPLICATE,
+from ray.tune.result import (DONE, TIME_THIS_ITER_S, TIMESTEPS_THIS_ITER,
+                             EPISODES_THIS_ITER, RESULT_DUPLICATE,
                              SHOULD_CHECKPOINT)
 
 logger = logging.getLogger(__name__)
@@ -47,6 +48,7 @@ class StatusReporter:
         self._logdir = logdir
         self._last_checkpoint = {}
         self._fresh_checkpoint = False
+        self._stopped = False
 
     def __call__(self, **kwargs):
         """Report updated training status.
@@ -68,6 +70,8 @@ class StatusReporter:
         assert self._last_report_time is not None, (
             "StatusReporter._start() must be called before the first "
             "report __call__ is made to ensure correct runtime metrics.")
+        if self._stopped:
+            raise StopIteration
 
         # time per iteration is recorded directly in the reporter to ensure
         # any delays in logging results aren't counted
@@ -81,8 +85,10 @@ class StatusReporter:
 
         # This blocks until notification from the FunctionRunner that the last
         # result has been returned to Tune and that the function is safe to
-        # resume training.
-        self._continue_semaphore.acquire()
+        # resume training. Without a semaphore, results are coalesced and the
+        # function keeps running.
+        if self._continue_semaphore is not None:
+            self._continue_semaphore.acquire()
 
     def make_checkpoint_dir(self, step=None):
         checkpoint_dir = TrainableUtil.make_checkpoint_dir(
@@ -110,6 +116,9 @@ class StatusReporter:
     def _start(self):
         self._last_report_time = time.time()
 
+    def _stop(self):
+        self._stopped = True
+
     @property
     def logdir(self):
         return self._logdir
@@ -125,6 +134,101 @@ class StatusReporter:
         return self._trial_id
 
 
+class _ResultCoalescer:
+    """Result queue that coalesces the results put until they are fetched.
+
+    The latest result is kept, with the `*_this_iter` counters summed up
+    and the min, max and mean of the given metrics over all coalesced results
+    added as `<metric>_min`, `<metric>_max` and `<metric>_mean`. Putting
+    results does not block, and blocking gets return at most once every
+    `min_interval_s` seconds (except for final results).
+    """
+
+    def __init__(self, metrics, min_interval_s):
+        self._metrics = metrics
+        self._min_interval_s = min_interval_s
+        self._cond = threading.Condition()
+        self._result = None
+        self._stats = {}
+        self._last_get_time = float("-inf")
+
+    def put(self, result, block=True):
+        with self._cond:
+            if RESULT_DUPLICATE in result:
+                # The end of the function must not be merged into the last
+                # results, so it is only put once they have been fetched.
+                while self._result is not None:
+                    self._cond.wait()
+            if self._result is not None:
+                for key in (TIME_THIS_ITER_S, TIMESTEPS_THIS_ITER,
+                            EPISODES_THIS_ITER):
+                    if result.get(key) is not None and (self._result.get(key)
+                                                        is not None):
+                        result[key] += self._result[key]
+            for metric in self._metrics:
+                value = result.get(metric)
+                if not isinstance(value, numbers.Number):
+                    continue
+                if metric in self._stats:
+                    stats = self._stats[metric]
+                    stats[0] = min(stats[0], value)
+                    stats[1] = max(stats[1], value)
+                    stats[2] += value
+                    stats[3] += 1
+                else:
+                    self._stats[metric] = [value, value, value, 1]
+            self._result = result
+            self._cond.notify_all()
+
+    def get(self, block=True, timeout=None):
+        """Returns the coalesced result.
+
+        If `block` is False, returns any result put since the last get.
+
+        Raises:
+            queue.Empty: If no result is ready within the timeout.
+        """
+        with self._cond:
+            if block:
+                deadline = float("inf") if timeout is None else (
+                    time.time() + timeout)
+                while not self._is_ready():
+                    now = time.time()
+                    if now >= deadline:
+                        raise queue.Empty
+                    wait_time = deadline - now
+                    if self._result is not None:
+                        wait_time = min(
+                            wait_time,
+                            self._last_get_time + self._min_interval_s - now)
+                    self._cond.wait(max(wait_time, 0))
+            elif self._result is None:
+                raise queue.Empty
+
+            result = self._result
+            for metric, (min_value, max_value, total,
+                         count) in self._stats.items():
+                result[metric + "_min"] = min_value
+                result[metric + "_max"] = max_value
+                result[metric + "_mean"] = total / count
+            self._result = None
+            self._stats = {}
+            self._last_get_time = time.time()
+            self._cond.notify_all()
+            return result
+
+    def empty(self):
+        with self._cond:
+            return self._result is None
+
+    def _is_ready(self):
+        if self._result is None:
+            return False
+        if self._result.get(DONE) or RESULT_DUPLICATE in self._result:
+            return True
+        return time.time() >= self._last_get_time + self._min_interval_s
+
+
 class _RunnerThread(threading.Thread):
     """Supervisor thread that runs your script."""
 
@@ -161,17 +265,29 @@ class _RunnerThread(threading.Thread):
 class FunctionRunner(Trainable):
     """Trainable that runs a user function reporting results.
 
-    This mode of execution does not support checkpoint/restore."""
+    This mode of execution does not support checkpoint/restore.
+
+    By default, the function blocks on each reported result until Tune
+    processed it. If `_report_interval_s` is set, the function keeps running
+    instead, and each `train()` call returns the results reported since the
+    last call coalesced into one (see `wrap_function`)."""
 
     _name = "func"
+    _report_interval_s = None
+    _aggregate_metrics = ()
 
     def setup(self, config):
-        # Semaphore for notifying the reporter to continue with the computation
-        # and to generate the next result.
-        self._continue_semaphore = threading.Semaphore(0)
+        if self._report_interval_s is None:
+            # Semaphore for notifying the reporter to continue with the
+            # computation and to generate the next result.
+            self._continue_semaphore = threading.Semaphore(0)
 
-        # Queue for passing results between threads
-        self._results_queue = queue.Queue(1)
+            # Queue for passing results between threads
+            self._results_queue = queue.Queue(1)
+        else:
+            self._continue_semaphore = None
+            self._results_queue = _ResultCoalescer(self._aggregate_metrics,
+                                                   self._report_interval_s)
 
         # Queue for passing errors back from the thread runner. The error queue
         # has a max size of one to prevent stacking error and force error
@@ -223,7 +339,8 @@ class FunctionRunner(Trainable):
         if self._runner and self._runner.is_alive():
             # if started and alive, inform the reporter to continue and
             # generate the next result
-            self._continue_semaphore.release()
+            if self._continue_semaphore is not None:
+                self._continue_semaphore.release()
         else:
             self._start()
 
@@ -307,11 +424,9 @@ class FunctionRunner(Trainable):
     def save_to_object(self):
         checkpoint_path = self.save()
         data_dict = TrainableUtil.pickle_checkpoint(checkpoint_path)
-        out = io.BytesIO()
         if len(data_dict) > 10e6:  # getting pretty large
             logger.info("Checkpoint size is {} bytes".format(len(data_dict)))
-        out.write(data_dict)
-        return out.getvalue()
+        return data_dict
 
     def load_checkpoint(self, checkpoint):
         # This should be removed once Trainables are refactored.
@@ -331,8 +446,13 @@ class FunctionRunner(Trainable):
         self.restore(checkpoint_path)
 
     def cleanup(self):
-        # If everything stayed in synch properly, this should never happen.
-        if not self._results_queue.empty():
+        # Lets a function that keeps running stop at its next report.
+        self._status_reporter._stop()
+
+        # If everything stayed in synch properly, this should never happen
+        # (unless results are coalesced).
+        if self._continue_semaphore is not None and (
+                not self._results_queue.empty()):
             logger.warning(
                 ("Some results were added after the trial stop condition. "
                  "These results won't be logged."))
@@ -357,8 +477,31 @@ def detect_checkpoint_function(train_func):
     return use_checkpoint
 
 
-def wrap_function(train_func):
+def wrap_function(train_func, report_interval_s=None, aggregate_metrics=None):
+    """Wraps a function into a Trainable class.
+
+    Args:
+        train_func (func): The function to wrap.
+        report_interval_s (float): If set, the function is not paused after
+            each reported result until Tune processed it. Instead, the results
+            reported between two `train()` calls are coalesced (keeping the
+            latest) and returned at most every `report_interval_s` seconds.
+            This avoids overwhelming Tune with results of functions that
+            report very frequently. Early stopping then happens at the next
+            report after Tune decided to stop the trial.
+        aggregate_metrics (list): Metrics to add the min, max and mean over
+            the coalesced results of to each result, as `<metric>_min`,
+            `<metric>_max` and `<metric>_mean`.
+
+    Example:
+        >>> tune.run(wrap_function(train, report_interval_s=10,
+        >>>                        aggregate_metrics=["loss"]))
+    """
+
     class ImplicitFunc(FunctionRunner):
+        _report_interval_s = report_interval_s
+        _aggregate_metrics = tuple(aggregate_metrics or ())
+
         def _trainable_func(self, config, reporter, checkpoint):
             func_args = inspect.getfullargspec(train_func).args
             if len(func_args) > 1:  # more arguments than just the config
@@ -1,17 +1,19 @@
 import csv
+import io
 import json
 import logging
 import os
 import yaml
 import numbers
 import numpy as np
+import zipfile
 
 import ray.cloudpickle as cloudpickle
 from ray.util.debug import log_once
 from ray.tune.result import (NODE_IP, TRAINING_ITERATION, TIME_TOTAL_S,
                              TIMESTEPS_TOTAL, EXPR_PARAM_FILE,
                              EXPR_PARAM_PICKLE_FILE, EXPR_PROGRESS_FILE,
-                             EXPR_RESULT_FILE)
+                             EXPR_RESULT_FILE, EXPR_COLUMNAR_DIR)
 from ray.tune.syncer import get_node_syncer
 from ray.tune.utils import flatten_dict
 
@@ -177,6 +179,178 @@ class CSVLogger(Logger):
         self._file.close()
 
 
+class ColumnarLogger(Logger):
+    """Logs results to progress.npz.d under the trial directory.
+
+    Results are flattened like by the CSVLogger, buffered, and written in
+    chunks of `chunk_size` results. Each chunk is a separate zip archive
+    with one numpy array per column, so the Analysis tools can load only
+    the columns (and chunks) they need, and writing a chunk never rewrites
+    the earlier ones. Columns that are not numeric are stored as strings.
+    Chunks are written to a temporary file that is then renamed, so a
+    crash while writing loses at most the chunk being written.
+
+    `flush()` (e.g. on every experiment checkpoint) only writes a chunk
+    once at least `min_flush_size` results are buffered, so that frequent
+    flushes don't produce many tiny chunks. `close()` writes all of them.
+    """
+
+    chunk_size = 100
+    min_flush_size = 20
+
+    def _init(self):
+        self._dir = os.path.join(self.logdir, EXPR_COLUMNAR_DIR)
+        self._num_chunks = 0
+        if os.path.exists(self._dir):
+            for name in os.listdir(self._dir):
+                if name.endswith(".tmp"):
+                    # Left over from an interrupted write.
+                    os.remove(os.path.join(self._dir, name))
+            self._num_chunks = len(_columnar_chunks(self._dir))
+        self._buffer = []
+
+    def on_result(self, result):
+        tmp = result.copy()
+        if "config" in tmp:
+            del tmp["config"]
+        self._buffer.append(flatten_dict(tmp, delimiter="/"))
+        if len(self._buffer) >= self.chunk_size:
+            self._write_chunk()
+
+    def flush(self):
+        if len(self._buffer) >= self.min_flush_size:
+            self._write_chunk()
+
+    def close(self):
+        if self._buffer:
+            self._write_chunk()
+
+    def _write_chunk(self):
+        columns = {}
+        for result in self._buffer:
+            columns.update(dict.fromkeys(result))
+        os.makedirs(self._dir, exist_ok=True)
+        path = os.path.join(self._dir, "{:06d}.npz".format(self._num_chunks))
+        tmp_path = path + ".tmp"
+        try:
+            with zipfile.ZipFile(tmp_path, "w") as zf:
+                for column in columns:
+                    values = [result.get(column) for result in self._buffer]
+                    out = io.BytesIO()
+                    np.lib.format.write_array(
+                        out, _to_column(values), allow_pickle=False)
+                    zf.writestr(column + ".npy", out.getvalue())
+        except Exception:
+            os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, path)
+        self._num_chunks += 1
+        self._buffer = []
+
+
+def read_columnar_results(path, columns=None, row=None):
+    """Reads results logged by the ColumnarLogger.
+
+    Args:
+        path (str): Path of the results directory.
+        columns (list): Names of the columns to read. Defaults to all
+            columns. Missing values (and columns) are filled with NaN.
+        row (int): If set, only the chunk containing this row (negative
+            indices count from the end) is read, and only this row returned.
+
+    Returns:
+        Dict of column names to numpy arrays.
+    """
+    chunks = _columnar_chunks(path)
+    if row is not None:
+        lengths = []
+        for chunk in chunks:
+            with zipfile.ZipFile(chunk) as zf:
+                lengths.append(_array_length(zf, zf.namelist()[0]))
+        if row < 0:
+            row += sum(lengths)
+        for i, length in enumerate(lengths):
+            if row < length:
+                break
+            row -= length
+        else:
+            raise IndexError("Row out of range.")
+        chunks = [chunks[i]]
+
+    parts = []
+    lengths = []
+    for chunk in chunks:
+        with zipfile.ZipFile(chunk) as zf:
+            members = {name[:-len(".npy")]: name for name in zf.namelist()}
+            lengths.append(_array_length(zf, next(iter(members.values()))))
+            parts.append({
+                column: _read_array(zf, name)
+                for column, name in members.items()
+                if columns is None or column in columns
+            })
+    if columns is None:
+        columns = {}
+        for part in parts:
+            columns.update(dict.fromkeys(part))
+
+    results = {}
+    for column in columns:
+        results[column] = _concat_columns([part.get(column) for part in parts],
+                                          lengths)
+        if row is not None:
+            results[column] = results[column][row:row + 1]
+    return results
+
+
+def _columnar_chunks(path):
+    """Returns the paths of the chunks in a columnar results directory."""
+    names = [
+        name for name in os.listdir(path)
+        if name.endswith(".npz") and name[:-len(".npz")].isdigit()
+    ]
+    names.sort(key=lambda name: int(name[:-len(".npz")]))
+    return [os.path.join(path, name) for name in names]
+
+
+def _array_length(zf, name):
+    with zf.open(name) as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, _, _ = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, _, _ = np.lib.format.read_array_header_2_0(f)
+    return shape[0]
+
+
+def _read_array(zf, name):
+    with zf.open(name) as f:
+        return np.lib.format.read_array(
+            io.BytesIO(f.read()), allow_pickle=False)
+
+
+def _to_column(values):
+    if all(
+            isinstance(v, (numbers.Number, np.bool_)) for v in values
+            if v is not None):
+        return np.array([np.nan if v is None else v for v in values])
+    return np.array(["" if v is None else str(v) for v in values])
+
+
+def _concat_columns(parts, lengths):
+    present = [part for part in parts if part is not None]
+    is_str = any(part.dtype.kind == "U" for part in present)
+    fill = "" if is_str else np.nan
+    parts = [
+        np.full(length, fill) if part is None else part
+        for part, length in zip(parts, lengths)
+    ]
+    if is_str:
+        parts = [part.astype(str) for part in parts]
+    if not parts:
+        return np.array([])
+    return np.concatenate(parts)
+
+
 class TBXLogger(Logger):
     """TensorBoardX Logger.
 
@@ -1,5 +1,6 @@
 # coding: utf-8
 import copy
+import json
 import logging
 import os
 import random
@@ -10,20 +11,24 @@ from contextlib import contextmanager
 import ray
 from ray.exceptions import RayTimeoutError
 from ray import ray_constants
-from ray.resource_spec import ResourceSpec
+from ray.resource_spec import NODE_ID_PREFIX, ResourceSpec
 from ray.tune.durable_trainable import DurableTrainable
 from ray.tune.error import AbortTrialExecution, TuneError
 from ray.tune.logger import NoopLogger
 from ray.tune.result import TRIAL_INFO
-from ray.tune.resources import Resources
-from ray.tune.trainable import TrainableUtil
+from ray.tune.resources import Resources, resources_to_json
+from ray.tune.trainable import Trainable, TrainableUtil
 from ray.tune.trial import Trial, Checkpoint, Location, TrialInfo
 from ray.tune.trial_executor import TrialExecutor
 from ray.tune.utils import warn_if_slow
 
 logger = logging.getLogger(__name__)
 
-RESOURCE_REFRESH_PERIOD = 0.5  # Refresh resources every 500 ms
+# Refresh resources every 500 ms by default.
+RESOURCE_REFRESH_PERIOD = float(
+    os.environ.get("TUNE_RESOURCE_REFRESH_PERIOD", 0.5))
+# Quantity of the node resource requested to place a trial on a node.
+NODE_PLACEMENT_RESOURCE = 0.001
 BOTTLENECK_WARN_PERIOD_S = 60
 NONTRIVIAL_WAIT_TIME_THRESHOLD_S = 1e-3
 DEFAULT_GET_TIMEOUT = 60.0  # seconds
@@ -89,18 +94,46 @@ class _TrialCleanup:
 
 
 class RayTrialExecutor(TrialExecutor):
-    """An implementation of TrialExecutor based on Ray."""
+    """An implementation of TrialExecutor based on Ray.
+
+    Args:
+        queue_trials (bool): Whether to queue trials when the cluster does
+            not currently have enough resources to launch one.
+        reuse_actors (bool): Whether to reuse actors between different trials
+            when possible.
+        max_cached_actors (int): Maximum number of idle actors to keep for
+            reuse. Actors are only reused for trials of the same trainable
+            with the same resource requirements (and node, if packing
+            trials). When a new actor has to be started, the oldest cached
+            actors are destroyed until there are enough free resources for
+            it.
+        ray_auto_init (bool): Whether to call ``ray.init()`` if Ray is not
+            initialized yet.
+        refresh_period (float): Minimum number of seconds between two
+            refreshes of the cluster resources. Defaults to the
+            ``TUNE_RESOURCE_REFRESH_PERIOD`` environment variable, or 0.5.
+        pack_trials (bool): Whether to track the resources of each node and
+            only admit a trial when a single node has room for it. Trials
+            are bin-packed onto the node with the least room left, which
+            keeps larger nodes free for larger trials. Extra resources are
+            only accounted for cluster-wide.
+    """
 
     def __init__(self,
                  queue_trials=False,
                  reuse_actors=False,
                  ray_auto_init=False,
-                 refresh_period=RESOURCE_REFRESH_PERIOD):
+                 refresh_period=RESOURCE_REFRESH_PERIOD,
+                 pack_trials=False,
+                 max_cached_actors=1):
         super(RayTrialExecutor, self).__init__(queue_trials)
         # Check for if we are launching a trial without resources in kick off
         # autoscaler.
         self._trial_queued = False
         self._running = {}
+        # Results of running futures that were fetched in a batch but not
+        # processed yet.
+        self._fetched = {}
         # Since trial resume after paused should not run
         # trial.train.remote(), thus no more new remote object id generated.
         # We use self._paused to store paused trials here.
@@ -108,10 +141,18 @@ class RayTrialExecutor(TrialExecutor):
 
         self._trial_cleanup = _TrialCleanup()
         self._reuse_actors = reuse_actors
-        self._cached_actor = None
+        self._max_cached_actors = max_cached_actors
+        # Idle actors as (key, resources, actor) tuples, oldest first.
+        self._cached_actors = []
 
         self._avail_resources = Resources(cpu=0, gpu=0)
         self._committed_resources = Resources(cpu=0, gpu=0)
+        self._pack_trials = pack_trials
+        # Total and committed resources by node ID, and the node each
+        # running trial was placed on (only if packing trials).
+        self._node_resources = {}
+        self._node_committed = {}
+        self._trial_nodes = {}
         self._resources_initialized = False
         self._refresh_period = refresh_period
         self._last_resource_refresh = float("-inf")
@@ -131,12 +172,13 @@ class RayTrialExecutor(TrialExecutor):
         self.try_checkpoint_metadata(trial)
         remote_logdir = trial.logdir
 
-        if (self._reuse_actors and reuse_allowed
-                and self._cached_actor is not None):
+        node = self._trial_nodes.get(trial)
+        existing_runner = None
+        if self._reuse_actors and reuse_allowed:
+            existing_runner = self._pop_cached_actor(_actor_key(trial, node))
+        if existing_runner is not None:
             logger.debug("Trial %s: Reusing cached runner %s", trial,
-                         self._cached_actor)
-            existing_runner = self._cached_actor
-            self._cached_actor = None
+                         existing_runner)
             trial.set_runner(existing_runner)
             if not self.reset_trial(trial, trial.config, trial.experiment_tag):
                 raise AbortTrialExecution(
@@ -144,20 +186,20 @@ class RayTrialExecutor(TrialExecutor):
                     "implemented and return True.")
             return existing_runner
 
-        if self._cached_actor:
-            logger.debug("Cannot reuse cached runner {} for new trial".format(
-                self._cached_actor))
-            with self._change_working_directory(trial):
-                self._trial_cleanup.add(trial, actor=self._cached_actor)
-            self._cached_actor = None
+        if self._cached_actors:
+            logger.debug("Cannot reuse cached runners for new trial")
+            self._evict_cached_actors(trial, node)
 
+        custom_resources = trial.resources.custom_resources
+        if node is not None:
+            custom_resources = dict(custom_resources,
+                                    **{node: NODE_PLACEMENT_RESOURCE})
         cls = ray.remote(
             num_cpus=trial.resources.cpu,
             num_gpus=trial.resources.gpu,
             memory=trial.resources.memory,
             object_store_memory=trial.resources.object_store_memory,
-            resources=trial.resources.custom_resources)(
-                trial.get_trainable_cls())
+            resources=custom_resources)(trial.get_trainable_cls())
 
         def logger_creator(config):
             # Set the working dir in the remote process, for user file writes
@@ -229,7 +271,10 @@ class RayTrialExecutor(TrialExecutor):
         """
         prior_status = trial.status
         if runner is None:
-            reuse_allowed = checkpoint is not None or trial.has_checkpoint()
+            # Trainables that are warmed up separately are set up again on
+            # reuse, so fresh trials can reuse their actors as well.
+            reuse_allowed = (checkpoint is not None or trial.has_checkpoint()
+                             or _is_warmed_up(trial.get_trainable_cls()))
             runner = self._setup_remote_runner(trial, reuse_allowed)
         trial.set_runner(runner)
         self.restore(trial, checkpoint)
@@ -262,10 +307,12 @@ class RayTrialExecutor(TrialExecutor):
         try:
             trial.write_error_log(error_msg)
             if hasattr(trial, "runner") and trial.runner:
-                if (not error and self._reuse_actors
-                        and self._cached_actor is None):
+                if (not error and self._reuse_actors and
+                        len(self._cached_actors) < self._max_cached_actors):
                     logger.debug("Reusing actor for %s", trial.runner)
-                    self._cached_actor = trial.runner
+                    key = _actor_key(trial, self._trial_nodes.get(trial))
+                    self._cached_actors.append((key, trial.resources,
+                                                trial.runner))
                 else:
                     logger.debug("Trial %s: Destroying actor.", trial)
                     with self._change_working_directory(trial):
@@ -290,6 +337,8 @@ class RayTrialExecutor(TrialExecutor):
             train (bool): Whether or not to start training.
         """
         self._commit_resources(trial.resources)
+        if self._pack_trials:
+            self._commit_node_resources(trial)
         try:
             self._start_trial(trial, checkpoint, train=train)
         except AbortTrialExecution:
@@ -319,9 +368,12 @@ class RayTrialExecutor(TrialExecutor):
         if prior_status == Trial.RUNNING:
             logger.debug("Trial %s: Returning resources.", trial)
             self._return_resources(trial.resources)
+            self._return_node_resources(trial)
             out = self._find_item(self._running, trial)
             for result_id in out:
                 self._running.pop(result_id)
+                if result_id not in self._paused:
+                    self._fetched.pop(result_id, None)
 
     def continue_training(self, trial):
         """Continues the training of this trial."""
@@ -338,8 +390,63 @@ class RayTrialExecutor(TrialExecutor):
             self._paused[trial_future[0]] = trial
         super(RayTrialExecutor, self).pause_trial(trial)
 
+    def _pop_cached_actor(self, key):
+        for i, (cached_key, _, actor) in enumerate(self._cached_actors):
+            if cached_key == key:
+                del self._cached_actors[i]
+                return actor
+        return None
+
+    def _evict_cached_actors(self, trial, node):
+        """Destroys the oldest cached actors until the trial fits.
+
+        Cached actors keep holding their resources, which are not counted
+        as committed. Only as many of them are destroyed as needed to free
+        the resources already committed for the trial, and only those that
+        hold resources that are short.
+        """
+        while self._cached_actors:
+            short, short_node = self._overcommitted_resources(node)
+            if not short:
+                return
+            index = next(
+                (i for i, (key, resources, _) in enumerate(self._cached_actors)
+                 if (short_node is None or key[1] == short_node)
+                 and short & _resource_names(resources)), None)
+            if index is None:
+                return
+            _, _, actor = self._cached_actors.pop(index)
+            with self._change_working_directory(trial):
+                self._trial_cleanup.add(trial, actor=actor)
+
+    def _overcommitted_resources(self, node):
+        """Returns the resources that cached actors take beyond capacity.
+
+        Returns:
+            The names of the overcommitted resources and the node they are
+            overcommitted on (None if they are overcommitted cluster-wide).
+        """
+        available = Resources.subtract(self._avail_resources,
+                                       self._committed_resources)
+        for _, resources, _ in self._cached_actors:
+            available = Resources.subtract(available,
+                                           _total_resources(resources))
+        short = _negative_resources(available)
+        if short or node is None or node not in self._node_resources:
+            return short, None
+
+        available = self._node_resources[node]
+        if node in self._node_committed:
+            available = Resources.subtract(available,
+                                           self._node_committed[node])
+        for key, resources, _ in self._cached_actors:
+            if key[1] == node:
+                available = Resources.subtract(available,
+                                               _head_resources(resources))
+        return _negative_resources(available), node
+
     def reset_trial(self, trial, new_config, new_experiment_tag):
-        """Tries to invoke `Trainable.reset_config()` to reset trial.
+        """Tries to invoke `Trainable.reset()` to reset trial.
 
         Args:
             trial (Trial): Trial to be reset.
@@ -347,16 +454,18 @@ class RayTrialExecutor(TrialExecutor):
             new_experiment_tag (str): New experiment name for trial.
 
         Returns:
-            True if `reset_config` is successful else False.
+            True if `reset` is successful else False.
         """
         trial.experiment_tag = new_experiment_tag
         trial.config = new_config
         trainable = trial.runner
+        trial_config = copy.deepcopy(new_config)
+        trial_config[TRIAL_INFO] = TrialInfo(trial)
         with self._change_working_directory(trial):
             with warn_if_slow("reset_config"):
                 try:
                     reset_val = ray.get(
-                        trainable.reset_config.remote(new_config),
+                        trainable.reset.remote(trial_config),
                         DEFAULT_GET_TIMEOUT)
                 except RayTimeoutError:
                     logger.exception("Trial %s: reset_config timed out.",
@@ -403,6 +512,34 @@ class RayTrialExecutor(TrialExecutor):
         # See https://github.com/ray-project/ray/issues/4211 for details.
         start = time.time()
         [result_id], _ = ray.wait(shuffled_results)
+        self._check_bottleneck(start)
+        return self._running[result_id]
+
+    def get_next_available_trials(self):
+        shuffled_results = list(self._running.keys())
+        random.shuffle(shuffled_results)
+        start = time.time()
+        ray.wait(shuffled_results)
+        self._check_bottleneck(start)
+        result_ids, _ = ray.wait(
+            shuffled_results, num_returns=len(shuffled_results), timeout=0)
+        # Fetch all results with a single call. If any of them failed, they
+        # are fetched one by one in `fetch_result` to isolate the error.
+        fetch_ids = [
+            result_id for result_id in result_ids
+            if result_id not in self._fetched
+            and not isinstance(result_id, _LocalWrapper)
+        ]
+        if fetch_ids:
+            try:
+                with warn_if_slow("fetch_results"):
+                    results = ray.get(fetch_ids, DEFAULT_GET_TIMEOUT)
+                self._fetched.update(zip(fetch_ids, results))
+            except Exception:
+                logger.debug("Failed to fetch results in a batch.")
+        return [self._running[result_id] for result_id in result_ids]
+
+    def _check_bottleneck(self, start):
         wait_time = time.time() - start
         if wait_time > NONTRIVIAL_WAIT_TIME_THRESHOLD_S:
             self._last_nontrivial_wait = time.time()
@@ -414,7 +551,6 @@ class RayTrialExecutor(TrialExecutor):
                     BOTTLENECK_WARN_PERIOD_S))
 
             self._last_nontrivial_wait = time.time()
-        return self._running[result_id]
 
     def fetch_result(self, trial):
         """Fetches one result of the running trials.
@@ -426,8 +562,11 @@ class RayTrialExecutor(TrialExecutor):
         if not trial_future:
             raise ValueError("Trial was not running.")
         self._running.pop(trial_future[0])
-        with warn_if_slow("fetch_result"):
-            result = ray.get(trial_future[0], DEFAULT_GET_TIMEOUT)
+        if trial_future[0] in self._fetched:
+            result = self._fetched.pop(trial_future[0])
+        else:
+            with warn_if_slow("fetch_result"):
+                result = ray.get(trial_future[0], DEFAULT_GET_TIMEOUT)
 
         # For local mode
         if isinstance(result, _LocalWrapper):
@@ -470,6 +609,70 @@ class RayTrialExecutor(TrialExecutor):
         assert self._committed_resources.is_nonnegative(), (
             "Resource invalid: {}".format(resources))
 
+    def _commit_node_resources(self, trial):
+        """Chooses a node for the trial and commits its resources there.
+
+        If no node has room for the trial (e.g., because it is queued), the
+        trial is not placed on any particular node.
+        """
+        node = self._choose_node(trial.resources)
+        if node is None:
+            return
+        self._trial_nodes[trial] = node
+        committed = self._node_committed.get(node, Resources(cpu=0, gpu=0))
+        self._node_committed[node] = _add(committed,
+                                          _head_resources(trial.resources))
+
+    def _return_node_resources(self, trial):
+        node = self._trial_nodes.pop(trial, None)
+        if node is None:
+            return
+        self._node_committed[node] = Resources.subtract(
+            self._node_committed[node], _head_resources(trial.resources))
+        assert self._node_committed[node].is_nonnegative(), (
+            "Resource invalid: {}".format(trial.resources))
+
+    def _choose_node(self, resources):
+        """Returns the ID of the node to place a trial on, if any.
+
+        Chooses the node with the least room left after placing the trial
+        (best fit), so that fragmentation across nodes is kept low.
+        """
+        required = _head_resources(resources)
+        best_node, best_fit = None, None
+        for node, total in self._node_resources.items():
+            committed = self._node_committed.get(node)
+            available = total if committed is None else Resources.subtract(
+                total, committed)
+            if not _fits(required, available):
+                continue
+            fit = (available.gpu - required.gpu, available.cpu - required.cpu,
+                   node)
+            if best_fit is None or fit < best_fit:
+                best_node, best_fit = node, fit
+        return best_node
+
+    def _update_node_resources(self):
+        node_resources = {}
+        try:
+            nodes = ray.nodes()
+        except Exception:
+            logger.debug("Node resources could not be detected.")
+            nodes = []
+        for node in nodes:
+            if not node["Alive"]:
+                continue
+            node_ids = [
+                k for k in node["Resources"] if k.startswith(NODE_ID_PREFIX)
+            ]
+            if node_ids:
+                node_resources[node_ids[0]] = _to_resources(node["Resources"])
+        self._node_resources = node_resources
+
+    def _update_avail_resources_if_needed(self):
+        if time.time() - self._last_resource_refresh > self._refresh_period:
+            self._update_avail_resources()
+
     def _update_avail_resources(self, num_retries=5):
         resources = None
         for i in range(num_retries):
@@ -497,20 +700,9 @@ class RayTrialExecutor(TrialExecutor):
                            "You can resume this experiment by passing in "
                            "`resume=True` to `run`.")
 
-        resources = resources.copy()
-        num_cpus = resources.pop("CPU", 0)
-        num_gpus = resources.pop("GPU", 0)
-        memory = ray_constants.from_memory_units(resources.pop("memory", 0))
-        object_store_memory = ray_constants.from_memory_units(
-            resources.pop("object_store_memory", 0))
-        custom_resources = resources
-
-        self._avail_resources = Resources(
-            int(num_cpus),
-            int(num_gpus),
-            memory=int(memory),
-            object_store_memory=int(object_store_memory),
-            custom_resources=custom_resources)
+        self._avail_resources = _to_resources(resources)
+        if self._pack_trials:
+            self._update_node_resources()
         self._last_resource_refresh = time.time()
         self._resources_initialized = True
 
@@ -521,8 +713,7 @@ class RayTrialExecutor(TrialExecutor):
         has exceeded self._refresh_period. This also assumes that the
         cluster is not resizing very frequently.
         """
-        if time.time() - self._last_resource_refresh > self._refresh_period:
-            self._update_avail_resources()
+        self._update_avail_resources_if_needed()
 
         currently_available = Resources.subtract(self._avail_resources,
                                                  self._committed_resources)
@@ -535,6 +726,9 @@ class RayTrialExecutor(TrialExecutor):
             currently_available.object_store_memory and all(
                 resources.get_res_total(res) <= currently_available.get(res)
                 for res in resources.custom_resources))
+        if have_space and self._node_resources:
+            # Only admit the trial if it can be placed on a single node.
+            have_space = self._choose_node(resources) is not None
 
         if have_space:
             # The assumption right now is that we block all trials if one
@@ -603,8 +797,11 @@ class RayTrialExecutor(TrialExecutor):
             return "? CPUs, ? GPUs"
 
     def on_step_begin(self, trial_runner):
-        """Before step() called, update the available resources."""
-        self._update_avail_resources()
+        """Before step() called, update the available resources.
+
+        Resources are only refreshed once per refresh period.
+        """
+        self._update_avail_resources_if_needed()
 
     def save(self, trial, storage=Checkpoint.PERSISTENT, result=None):
         """Saves the trial's state to a checkpoint asynchronously.
@@ -659,6 +856,8 @@ class RayTrialExecutor(TrialExecutor):
             logger.debug("Trial %s: Attempting restore from object", trial)
             # Note that we don't store the remote since in-memory checkpoints
             # don't guarantee fault tolerance and don't need to be waited on.
+            # The object ID is passed as a top level argument, so the actor
+            # fetches the checkpoint from the object store directly.
             with self._change_working_directory(trial):
                 trial.runner.restore_from_object.remote(value)
         else:
@@ -701,10 +900,13 @@ class RayTrialExecutor(TrialExecutor):
 
     def has_gpus(self):
         if self._resources_initialized:
-            self._update_avail_resources()
+            self._update_avail_resources_if_needed()
             return self._avail_resources.gpu > 0
 
     def cleanup(self):
+        for _, _, actor in self._cached_actors:
+            self._trial_cleanup.add(None, actor=actor)
+        self._cached_actors = []
         self._trial_cleanup.cleanup(partial=False)
 
     @contextmanager
@@ -727,3 +929,99 @@ class RayTrialExecutor(TrialExecutor):
 
 def _to_gb(n_bytes):
     return round(n_bytes / (1024**3), 2)
+
+
+def _actor_key(trial, node):
+    """Returns the key of the actor cache for the trial.
+
+    Cached actors are only reused for trials with the same key.
+    """
+    return (trial.trainable_name, node,
+            json.dumps(resources_to_json(trial.resources), sort_keys=True))
+
+
+def _is_warmed_up(trainable_cls):
+    """Returns whether the trainable overrides `Trainable.warm`."""
+    warm = getattr(trainable_cls, "warm", None)
+    return (warm is not None
+            and getattr(warm, "__code__", None) is not Trainable.warm.__code__)
+
+
+def _to_resources(resources):
+    """Converts a Ray resource dict into a Resources object."""
+    resources = resources.copy()
+    num_cpus = resources.pop("CPU", 0)
+    num_gpus = resources.pop("GPU", 0)
+    memory = ray_constants.from_memory_units(resources.pop("memory", 0))
+    object_store_memory = ray_constants.from_memory_units(
+        resources.pop("object_store_memory", 0))
+    return Resources(
+        int(num_cpus),
+        int(num_gpus),
+        memory=int(memory),
+        object_store_memory=int(object_store_memory),
+        custom_resources=resources)
+
+
+def _total_resources(resources):
+    """Returns the resources of a trial including its extra resources."""
+    return Resources(
+        resources.cpu_total(),
+        resources.gpu_total(),
+        memory=resources.memory_total(),
+        object_store_memory=resources.object_store_memory_total(),
+        custom_resources={
+            res: resources.get_res_total(res)
+            for res in resources.custom_resources
+        })
+
+
+def _resource_names(resources):
+    """Returns the names of the resources a trial holds any amount of."""
+    totals = _total_resources(resources)
+    names = {
+        res
+        for res, value in totals.custom_resources.items() if value > 0
+    }
+    if totals.cpu > 0:
+        names.add("CPU")
+    if totals.gpu > 0:
+        names.add("GPU")
+    return names
+
+
+def _negative_resources(resources):
+    """Returns the names of the resources with a negative amount."""
+    names = {
+        res
+        for res, value in resources.custom_resources.items() if value < 0
+    }
+    if resources.cpu < 0:
+        names.add("CPU")
+    if resources.gpu < 0:
+        names.add("GPU")
+    return names
+
+
+def _head_resources(resources):
+    """Returns the resources that a trial's actor itself requires."""
+    return Resources(
+        resources.cpu,
+        resources.gpu,
+        memory=resources.memory,
+        object_store_memory=resources.object_store_memory,
+        custom_resources=dict(resources.custom_resources))
+
+
+def _add(original, to_add):
+    return Resources.subtract(
+        original, Resources.subtract(Resources(cpu=0, gpu=0), to_add))
+
+
+def _fits(resources, available):
+    """Returns whether ``resources`` fit into ``available``."""
+    return (resources.cpu <= available.cpu and resources.gpu <= available.gpu
+            and resources.memory <= available.memory
+            and resources.object_store_memory <= available.object_store_memory
+            and all(value <= available.get(res)
+                    for res, value in resources.custom_resources.items()))
@@ -94,5 +94,8 @@ EXPR_PROGRESS_FILE = "progress.csv"
 # File that stores results of the trial.
 EXPR_RESULT_FILE = "result.json"
 
+# Directory that stores the progress of the trial in columnar chunks.
+EXPR_COLUMNAR_DIR = "progress.npz.d"
+
 # Config prefix when using Analysis.
 CONFIG_PREFIX = "config/"
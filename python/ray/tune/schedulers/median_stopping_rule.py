@@ -1,3 +1,5 @@
+import array
+import bisect
 import collections
 import logging
 import numpy as np
@@ -67,7 +69,7 @@ class MedianStoppingRule(FIFOScheduler):
         self._hard_stop = hard_stop
         self._trial_state = {}
         self._last_pause = collections.defaultdict(lambda: float("-inf"))
-        self._results = collections.defaultdict(list)
+        self._stats = {}
 
     def on_trial_result(self, trial_runner, trial, result):
         """Callback for early stopping.
@@ -85,7 +87,7 @@ class MedianStoppingRule(FIFOScheduler):
             return TrialScheduler.CONTINUE
 
         time = result[self._time_attr]
-        self._results[trial].append(result)
+        self._record(trial, result)
 
         if time < self._grace_period:
             return TrialScheduler.CONTINUE
@@ -122,7 +124,7 @@ class MedianStoppingRule(FIFOScheduler):
             return TrialScheduler.CONTINUE
 
     def on_trial_complete(self, trial_runner, trial, result):
-        self._results[trial].append(result)
+        self._record(trial, result)
 
     def debug_string(self):
         return "Using MedianStoppingRule: num_stopped={}.".format(
@@ -136,10 +138,22 @@ class MedianStoppingRule(FIFOScheduler):
         ]
         return TrialScheduler.PAUSE if pause else TrialScheduler.CONTINUE
 
+    def _record(self, trial, result):
+        if trial not in self._stats:
+            self._stats[trial] = _TrialStats(self._worst)
+        stats = self._stats[trial]
+        time = result[self._time_attr]
+        value = result[self._metric]
+        stats.last_time = time
+        stats.best = self._compare_op(stats.best, value)
+        if time >= self._grace_period:
+            stats.times.append(time)
+            stats.sums.append((stats.sums[-1] if stats.sums else 0.0) + value)
+
     def _trials_beyond_time(self, time):
         trials = [
-            trial for trial in self._results
-            if self._results[trial][-1][self._time_attr] >= time
+            trial for trial, stats in self._stats.items()
+            if stats.last_time >= time
         ]
         return trials
 
@@ -147,15 +161,31 @@ class MedianStoppingRule(FIFOScheduler):
         return np.median([self._running_mean(trial, time) for trial in trials])
 
     def _running_mean(self, trial, time):
-        results = self._results[trial]
+        stats = self._stats[trial]
         # TODO(ekl) we could do interpolation to be more precise, but for now
         # assume len(results) is large and the time diffs are roughly equal
-        scoped_results = [
-            r for r in results
-            if self._grace_period <= r[self._time_attr] <= time
-        ]
-        return np.mean([r[self._metric] for r in scoped_results])
+        num_results = bisect.bisect_right(stats.times, time)
+        if not num_results:
+            return float("nan")
+        return stats.sums[num_results - 1] / num_results
 
     def _best_result(self, trial):
-        results = self._results[trial]
-        return self._compare_op([r[self._metric] for r in results])
+        return self._stats[trial].best
+
+
+class _TrialStats:
+    """Running aggregates of the results of a trial.
+
+    Results are assumed to arrive in order of time, so the results up to any
+    time can be found by bisecting `times`, and their mean by `sums`.
+    """
+
+    __slots__ = ("times", "sums", "last_time", "best")
+
+    def __init__(self, worst):
+        # Times of the results after the grace period, and prefix sums of
+        # their metric values.
+        self.times = array.array("d")
+        self.sums = array.array("d")
+        self.last_time = float("-inf")
+        self.best = worst
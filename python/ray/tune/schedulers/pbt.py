@@ -1,3 +1,4 @@
+import bisect
 import copy
 import logging
 import json
@@ -19,8 +20,9 @@ logger = logging.getLogger(__name__)
 class PBTTrialState:
     """Internal PBT state tracked per-trial."""
 
-    def __init__(self, trial):
+    def __init__(self, trial, order=0):
         self.orig_tag = trial.experiment_tag
+        self.order = order
         self.last_score = None
         self.last_checkpoint = None
         self.last_perturbation_time = 0
@@ -220,6 +222,8 @@ class PopulationBasedTraining(FIFOScheduler):
         self._quantile_fraction = quantile_fraction
         self._resample_probability = resample_probability
         self._trial_state = {}
+        # Trials with a score as (score, order added, trial), sorted.
+        self._population = []
         self._custom_explore_fn = custom_explore_fn
         self._log_config = log_config
 
@@ -228,7 +232,8 @@ class PopulationBasedTraining(FIFOScheduler):
         self._num_perturbations = 0
 
     def on_trial_add(self, trial_runner, trial):
-        self._trial_state[trial] = PBTTrialState(trial)
+        self._trial_state[trial] = PBTTrialState(
+            trial, order=len(self._trial_state))
 
     def on_trial_result(self, trial_runner, trial, result):
         if self._time_attr not in result or self._metric not in result:
@@ -240,7 +245,7 @@ class PopulationBasedTraining(FIFOScheduler):
             return TrialScheduler.CONTINUE  # avoid checkpoint overhead
 
         score = self._metric_op * result[self._metric]
-        state.last_score = score
+        self._update_score(trial, score)
         state.last_perturbation_time = time
         lower_quantile, upper_quantile = self._quantiles()
 
@@ -264,6 +269,13 @@ class PopulationBasedTraining(FIFOScheduler):
 
         return TrialScheduler.CONTINUE
 
+    def on_trial_complete(self, trial_runner, trial, result):
+        # Finished trials are never cloned, so release their checkpoint.
+        self._trial_state[trial].last_checkpoint = None
+
+    def on_trial_remove(self, trial_runner, trial):
+        self._trial_state[trial].last_checkpoint = None
+
     def _log_config_on_step(self, trial_state, new_state, trial,
                             trial_to_clone, new_config):
         """Logs transition during exploit/exploit step.
@@ -325,12 +337,13 @@ class PopulationBasedTraining(FIFOScheduler):
                                                       new_tag)
 
         # TODO(ujvl): Refactor Scheduler abstraction to abstract
-        #  mechanism for trial restart away. We block on restore
-        #  and suppress train on start as a stop-gap fix to
+        #  mechanism for trial restart away. We suppress train on start
+        #  as a stop-gap fix to
         #  https://github.com/ray-project/ray/issues/7258.
+        # The in-memory checkpoint is restored by the trial's actor before
+        # its next training step, without blocking the event loop.
         if reset_successful:
-            trial_executor.restore(
-                trial, new_state.last_checkpoint, block=True)
+            trial_executor.restore(trial, new_state.last_checkpoint)
         else:
             trial_executor.stop_trial(trial, stop_logger=False)
             trial.config = new_config
@@ -347,11 +360,10 @@ class PopulationBasedTraining(FIFOScheduler):
 
         If there is not enough data to compute this, returns empty lists.
         """
-        trials = []
-        for trial, state in self._trial_state.items():
-            if state.last_score is not None and not trial.is_finished():
-                trials.append(trial)
-        trials.sort(key=lambda t: self._trial_state[t].last_score)
+        trials = [
+            trial for _, _, trial in self._population
+            if not trial.is_finished()
+        ]
 
         if len(trials) <= 1:
             return [], []
@@ -363,6 +375,19 @@ class PopulationBasedTraining(FIFOScheduler):
             return (trials[:num_trials_in_quantile],
                     trials[-num_trials_in_quantile:])
 
+    def _update_score(self, trial, score):
+        """Sets the last score of the trial, keeping the population sorted."""
+        state = self._trial_state[trial]
+        if state.last_score is not None:
+            population = self._population
+            i = bisect.bisect_left(population, (state.last_score, state.order))
+            if i == len(population) or population[i][2] is not trial:
+                # Scores that can't be ordered (NaN).
+                i = [t for _, _, t in population].index(trial)
+            del population[i]
+        state.last_score = score
+        bisect.insort(self._population, (score, state.order, trial))
+
     def choose_trial_to_run(self, trial_runner):
         """Ensures all trials get fair share of time (as defined by time_attr).
 
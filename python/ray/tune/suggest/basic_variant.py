@@ -18,7 +18,16 @@ class BasicVariantGenerator(SearchAlgorithm):
 
 
     Parameters:
-        shuffle (bool): Shuffles the generated list of configurations.
+        shuffle (bool): Shuffles the generated list of configurations. Note
+            that all configurations are generated at once to shuffle them.
+        max_concurrent (int): Maximum number of generated trials that have
+            not completed yet. Variants are only generated once there is
+            room for them, so driver memory does not grow with the size of
+            the search space. Finished trials are compacted into summary
+            records that keep their config and the scalar entries of their
+            last result. Trials that have not been generated when the
+            experiment is checkpointed are not restored on resume.
+            Defaults to no limit.
 
     User API:
 
@@ -42,15 +51,19 @@ class BasicVariantGenerator(SearchAlgorithm):
         searcher.is_finished == True
     """
 
-    def __init__(self, shuffle=False):
+    def __init__(self, shuffle=False, max_concurrent=None):
         """Initializes the Variant Generator.
 
         """
+        assert max_concurrent is None or max_concurrent > 0
         self._parser = make_parser()
         self._trial_generator = []
         self._counter = 0
         self._finished = False
         self._shuffle = shuffle
+        self._shuffled = False
+        self._max_concurrent = max_concurrent
+        self._live_trials = set()
 
         # Unique prefix for all trials generated, e.g., trial ids start as
         # 2f1e_00001, 2f1ef_00002, 2f1ef_0003, etc. Overridable for testing.
@@ -73,6 +86,7 @@ class BasicVariantGenerator(SearchAlgorithm):
                 self._generate_trials(
                     experiment.spec.get("num_samples", 1), experiment.spec,
                     experiment.name))
+        self._shuffled = False
 
     def next_trials(self):
         """Provides Trial objects to be queued into the TrialRunner.
@@ -80,12 +94,30 @@ class BasicVariantGenerator(SearchAlgorithm):
         Returns:
             trials (list): Returns a list of trials.
         """
-        trials = list(self._trial_generator)
-        if self._shuffle:
+        if self._shuffle and not self._shuffled:
+            trials = list(self._trial_generator)
             random.shuffle(trials)
-        self.set_finished()
+            self._trial_generator = iter(trials)
+            self._shuffled = True
+
+        if self._max_concurrent is None:
+            trials = list(self._trial_generator)
+            self.set_finished()
+            return trials
+
+        num_trials = max(self._max_concurrent - len(self._live_trials), 0)
+        trials = list(itertools.islice(self._trial_generator, num_trials))
+        if len(trials) < num_trials:
+            self.set_finished()
+        self._live_trials.update(trial.trial_id for trial in trials)
         return trials
 
+    def on_trial_complete(self, trial_id, result=None, error=False):
+        self._live_trials.discard(trial_id)
+
+    def should_compact_trials(self):
+        return self._max_concurrent is not None
+
     def _generate_trials(self, num_samples, unresolved_spec, output_path=""):
         """Generates Trial objects with the variant generation process.
 
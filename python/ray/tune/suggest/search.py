@@ -52,6 +52,15 @@ class SearchAlgorithm:
         """
         pass
 
+    def should_compact_trials(self):
+        """Returns True if finished trials may be compacted.
+
+        Compacted trials only keep a summary of their results (see
+        `Trial.compact`). Search algorithms that read the results of
+        finished trials must return False.
+        """
+        return False
+
     def is_finished(self):
         """Returns True if no trials left to be queued into TrialRunner.
 
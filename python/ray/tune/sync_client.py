@@ -1,10 +1,14 @@
 import distutils
 import distutils.spawn
 import logging
+import os
+import shutil
 import subprocess
 import tempfile
 import types
+import weakref
 
+from concurrent.futures import ThreadPoolExecutor
 from shlex import quote
 
 from ray.tune.error import TuneError
@@ -22,6 +26,13 @@ def noop(*args):
     return
 
 
+def _remove_if_exists(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
 def get_sync_client(sync_function, delete_function=None):
     """Returns a sync client.
 
@@ -105,6 +116,21 @@ class SyncClient:
         """
         raise NotImplementedError
 
+    def sync_down_batch(self, pairs):
+        """Syncs down many directories from source to target.
+
+        Clients that can move several directories in a single transfer
+        override this; by default each pair is synced on its own.
+
+        Args:
+            pairs (list): List of (source, target) path tuples.
+
+        Returns:
+            True if sync initiation successful, False otherwise.
+        """
+        return all(
+            [self.sync_down(source, target) for source, target in pairs])
+
     def delete(self, target):
         """Deletes target.
 
@@ -124,6 +150,11 @@ class SyncClient:
         """Resets state."""
         pass
 
+    @property
+    def is_running(self):
+        """Returns whether an asynchronously started sync is running."""
+        return False
+
 
 class FunctionBasedClient(SyncClient):
     def __init__(self, sync_up_func, sync_down_func, delete_func=None):
@@ -240,3 +271,147 @@ class CommandBasedClient(SyncClient):
             raise ValueError("Sync template missing '{source}'.")
         if "{target}" not in sync_string:
             raise ValueError("Sync template missing '{target}'.")
+
+
+class BatchedCommandClient(CommandBasedClient):
+    def __init__(self, sync_template):
+        """Syncs many directories on one host with a single command.
+
+        Arguments:
+            sync_template (str): A runnable string template; needs to
+                include replacement fields '{source}', '{target}' and
+                '{files_from}'. '{files_from}' is replaced by a file listing
+                the directories to sync, relative to source and target.
+        """
+        if "{files_from}" not in sync_template:
+            raise ValueError("Sync template missing '{files_from}'.")
+        files_from = tempfile.NamedTemporaryFile(
+            prefix="log_sync_files", suffix=".txt", delete=False)
+        files_from.close()
+        self.files_from = files_from.name
+        # Removes the file list once the client is collected or at exit.
+        self._finalizer = weakref.finalize(self, _remove_if_exists,
+                                           self.files_from)
+        sync_template = sync_template.replace("{files_from}",
+                                              quote(self.files_from))
+        super(BatchedCommandClient, self).__init__(sync_template,
+                                                   sync_template)
+
+    def sync_down_batch(self, pairs):
+        """Syncs down directories from a single remote host in one command.
+
+        Each source must be of the form '<host>:<path>', where <path> is
+        the same as its target.
+        """
+        if not pairs:
+            return True
+        if self.is_running:
+            logger.warning("Last sync client cmd still in progress, skipping.")
+            return False
+        hosts = set()
+        paths = []
+        for source, target in pairs:
+            host, _, path = source.partition(":")
+            if os.path.normpath(path) != os.path.normpath(target):
+                raise ValueError("Batched sync requires source and target "
+                                 "paths to match, got {} and {}.".format(
+                                     source, target))
+            hosts.add(host)
+            paths.append(os.path.relpath(path, os.sep))
+        if len(hosts) != 1:
+            raise ValueError("Batched sync requires a single source host, "
+                             "got {}.".format(sorted(hosts)))
+        with open(self.files_from, "w") as f:
+            f.write("\n".join(paths) + "\n")
+        return self._execute(self.sync_down_template,
+                             hosts.pop() + ":" + os.sep, os.sep)
+
+    def reset(self):
+        super(BatchedCommandClient, self).reset()
+        # The file list is rewritten before every batched sync.
+        _remove_if_exists(self.files_from)
+
+
+class LocalClient(SyncClient):
+    def __init__(self, max_workers=4):
+        """Syncs between local directories, copying only changed files.
+
+        A file is copied if its size or modification time differs from
+        when this client last copied it. Copies run asynchronously on a
+        bounded thread pool.
+
+        Arguments:
+            max_workers (int): Maximum number of files copied at once.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = []
+        # Maps target files to the (mtime, size) of their last copied source.
+        self._copied = {}
+
+    def sync_up(self, source, target):
+        return self.sync_down_batch([(source, target)])
+
+    def sync_down(self, source, target):
+        return self.sync_down_batch([(source, target)])
+
+    def sync_down_batch(self, pairs):
+        for source, target in pairs:
+            for dirpath, _, filenames in os.walk(source):
+                rel_dir = os.path.relpath(dirpath, source)
+                for filename in filenames:
+                    src = os.path.join(dirpath, filename)
+                    dst = os.path.normpath(
+                        os.path.join(target, rel_dir, filename))
+                    try:
+                        stat = os.stat(src)
+                    except OSError:
+                        continue  # Removed while scanning.
+                    version = (stat.st_mtime_ns, stat.st_size)
+                    if (self._copied.get(dst) == version
+                            and os.path.exists(dst)):
+                        continue
+                    self._copied[dst] = version
+                    self._futures.append(
+                        self._executor.submit(self._copy, src, dst))
+        return True
+
+    def delete(self, target):
+        self.wait()
+        shutil.rmtree(target, ignore_errors=True)
+        prefix = os.path.join(os.path.normpath(target), "")
+        self._copied = {
+            dst: version
+            for dst, version in self._copied.items()
+            if not dst.startswith(prefix)
+        }
+        return True
+
+    def wait(self):
+        futures, self._futures = self._futures, []
+        errors = []
+        for future in futures:
+            try:
+                future.result()
+            except Exception as exc:
+                errors.append(exc)
+        if errors:
+            raise TuneError("Sync error. Failed to copy {} files: {}".format(
+                len(errors), errors[0]))
+
+    def reset(self):
+        if self.is_running:
+            logger.warning("Sync process still running but resetting anyways.")
+        self._futures = []
+        self._copied = {}
+
+    @property
+    def is_running(self):
+        return not all(future.done() for future in self._futures)
+
+    def _copy(self, src, dst):
+        try:
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            shutil.copy2(src, dst)
+        except Exception:
+            self._copied.pop(dst, None)
+            raise
@@ -1,15 +1,17 @@
 import distutils
 import logging
 import os
+import tempfile
 import time
 
+from collections import defaultdict
 from shlex import quote
 
 from ray import ray_constants
 from ray import services
 from ray.tune.cluster_info import get_ssh_key, get_ssh_user
-from ray.tune.sync_client import (CommandBasedClient, get_sync_client,
-                                  get_cloud_sync_client, NOOP)
+from ray.tune.sync_client import (BatchedCommandClient, CommandBasedClient,
+                                  get_sync_client, get_cloud_sync_client, NOOP)
 
 logger = logging.getLogger(__name__)
 
@@ -21,13 +23,20 @@ CLOUD_SYNC_PERIOD = ray_constants.env_integer(
 # Syncing period for syncing worker logs to driver.
 NODE_SYNC_PERIOD = 300
 
+# Maximum number of worker nodes synced from at once.
+MAX_NODE_SYNC_WORKERS = ray_constants.env_integer(
+    key="TUNE_MAX_NODE_SYNC_WORKERS", default=4)
+
 _log_sync_warned = False
 _syncers = {}
+_node_sync_batch = None
 
 
 def wait_for_sync():
     for syncer in _syncers.values():
         syncer.wait()
+    if _node_sync_batch:
+        _node_sync_batch.wait()
 
 
 def log_sync_template(options=""):
@@ -163,11 +172,16 @@ class CloudSyncer(Syncer):
 
 
 class NodeSyncer(Syncer):
-    """Syncer for syncing files to/from a remote dir to a local dir."""
+    """Syncer for syncing files to/from a remote dir to a local dir.
 
-    def __init__(self, local_dir, remote_dir, sync_client):
+    If a SyncBatch is given, periodic syncs down are made through it
+    together with the other syncers on the same worker.
+    """
+
+    def __init__(self, local_dir, remote_dir, sync_client, sync_batch=None):
         self.local_ip = services.get_node_ip_address()
         self.worker_ip = None
+        self.sync_batch = sync_batch
         super(NodeSyncer, self).__init__(local_dir, remote_dir, sync_client)
 
     def set_worker_ip(self, worker_ip):
@@ -194,6 +208,8 @@ class NodeSyncer(Syncer):
     def sync_down_if_needed(self):
         if not self.has_remote_target():
             return True
+        if self.sync_batch:
+            return self.sync_batch.sync_down_if_needed(self, NODE_SYNC_PERIOD)
         return super(NodeSyncer, self).sync_down_if_needed(NODE_SYNC_PERIOD)
 
     def sync_up_to_new_location(self, worker_ip):
@@ -234,6 +250,97 @@ class NodeSyncer(Syncer):
         return "{}@{}:{}/".format(ssh_user, self.worker_ip, self._remote_dir)
 
 
+class SyncBatch:
+    """Syncs down the directories of many NodeSyncers in one transfer.
+
+    Instead of each trial syncing its own directory, directories are
+    collected per worker node and synced together whenever one of them
+    is due. This aligns the sync timers of all trials on a node, so the
+    number of sync processes grows with the number of nodes rather than
+    the number of trials. Only directories that have reported since the
+    last sync are included.
+
+    Args:
+        sync_client_creator (func): Returns a new SyncClient supporting
+            `sync_down_batch`. One client is created per worker node.
+        max_workers (int): Maximum number of worker nodes synced from at
+            once. Further nodes are synced once a transfer finishes.
+    """
+
+    def __init__(self, sync_client_creator, max_workers=MAX_NODE_SYNC_WORKERS):
+        self._sync_client_creator = sync_client_creator
+        self._max_workers = max_workers
+        self._clients = {}
+        self._pending = defaultdict(dict)
+
+    def sync_down_if_needed(self, syncer, sync_period):
+        """Syncs down the worker of syncer if the syncer is due.
+
+        Arguments:
+            syncer (NodeSyncer): Syncer whose directory has changed.
+            sync_period (int): Time period between subsequent syncs.
+        """
+        worker_ip = syncer.worker_ip
+        self._pending[worker_ip][syncer._local_dir] = syncer
+        if time.time() - syncer.last_sync_down_time > sync_period:
+            return self.sync_down(worker_ip)
+        return True
+
+    def sync_down(self, worker_ip):
+        """Attempts to start syncing down all pending directories of a worker.
+
+        Returns:
+            Whether the sync (if feasible) was successfully started.
+        """
+        client = self._clients.get(worker_ip)
+        if client and client.is_running:
+            return False
+        num_running = sum(c.is_running for c in self._clients.values())
+        if num_running >= self._max_workers:
+            logger.debug("%s node syncs running, deferring sync for %s",
+                         num_running, worker_ip)
+            return False
+        syncers = [
+            syncer for syncer in self._pending.pop(worker_ip, {}).values()
+            if syncer.worker_ip == worker_ip
+            and syncer.validate_hosts(syncer._local_dir, syncer._remote_path)
+        ]
+        if not syncers:
+            return True
+        if client is None:
+            client = self._clients[worker_ip] = self._sync_client_creator()
+        result = False
+        try:
+            result = client.sync_down_batch([(syncer._remote_path,
+                                              syncer._local_dir)
+                                             for syncer in syncers])
+            now = time.time()
+            for syncer in syncers:
+                syncer.last_sync_down_time = now
+        except Exception:
+            logger.exception("Sync execution failed.")
+        return result
+
+    def wait(self):
+        """Waits for all started syncs to complete."""
+        for client in self._clients.values():
+            client.wait()
+
+
+def _get_node_sync_batch():
+    global _node_sync_batch
+    if _node_sync_batch is None:
+        _node_sync_batch = SyncBatch(_batched_log_sync_client)
+    return _node_sync_batch
+
+
+def _batched_log_sync_client():
+    sync = log_sync_template(options="-r --files-from={files_from}")
+    client = BatchedCommandClient(sync)
+    client.set_logdir(tempfile.gettempdir())
+    return client
+
+
 def get_cloud_syncer(local_dir, remote_dir=None, sync_function=None):
     """Returns a Syncer.
 
@@ -280,9 +387,11 @@ def get_node_syncer(local_dir, remote_dir=None, sync_function=None):
         sync_function (func|str|bool): Function for syncing the local_dir to
             remote_dir. If string, then it must be a string template for
             syncer to run. If True or not provided, it defaults rsync. If
-            False, a noop Syncer is returned.
+            False, a noop Syncer is returned. Default rsync syncs of a
+            remote_dir mirroring local_dir are batched per worker node.
     """
     key = (local_dir, remote_dir)
+    sync_batch = None
     if key in _syncers:
         return _syncers[key]
     elif not remote_dir or sync_function is False:
@@ -294,8 +403,11 @@ def get_node_syncer(local_dir, remote_dir=None, sync_function=None):
         if sync:
             sync_client = CommandBasedClient(sync, sync)
             sync_client.set_logdir(local_dir)
+            if os.path.normpath(local_dir) == os.path.normpath(remote_dir):
+                sync_batch = _get_node_sync_batch()
         else:
             sync_client = NOOP
 
-    _syncers[key] = NodeSyncer(local_dir, remote_dir, sync_client)
+    _syncers[key] = NodeSyncer(
+        local_dir, remote_dir, sync_client, sync_batch=sync_batch)
     return _syncers[key]
@@ -1,9 +1,12 @@
 import unittest
 
 import ray
-from ray.tune import Trainable, run_experiments
+from ray.tune import Trainable, register_trainable, run_experiments
 from ray.tune.error import TuneError
+from ray.tune.ray_trial_executor import RayTrialExecutor
+from ray.tune.resources import Resources
 from ray.tune.schedulers.trial_scheduler import FIFOScheduler, TrialScheduler
+from ray.tune.trial import Trial
 
 
 class FrequentPausesScheduler(FIFOScheduler):
@@ -37,6 +40,28 @@ def create_resettable_class():
     return MyResettableClass
 
 
+def create_warm_class():
+    class MyWarmClass(Trainable):
+        def warm(self, config):
+            self.num_setups = 0
+
+        def setup(self, config):
+            self.num_setups += 1
+            self.iter = 0
+
+        def step(self):
+            self.iter += 1
+            return {"num_setups": self.num_setups, "done": self.iter > 1}
+
+        def save_checkpoint(self, chkpt_dir):
+            return {"iter": self.iter}
+
+        def load_checkpoint(self, item):
+            self.iter = item["iter"]
+
+    return MyWarmClass
+
+
 class ActorReuseTest(unittest.TestCase):
     def setUp(self):
         ray.init(num_cpus=1, num_gpus=0)
@@ -72,6 +97,78 @@ class ActorReuseTest(unittest.TestCase):
         self.assertEqual([t.last_result["num_resets"] for t in trials],
                          [1, 2, 3, 4])
 
+    def testTrialReuseWarm(self):
+        trials = run_experiments(
+            {
+                "foo": {
+                    "run": create_warm_class(),
+                    "num_samples": 4,
+                    "config": {},
+                }
+            },
+            reuse_actors=True)
+        self.assertEqual([t.last_result["num_setups"] for t in trials],
+                         [1, 2, 3, 4])
+        self.assertEqual([t.last_result["training_iteration"] for t in trials],
+                         [2, 2, 2, 2])
+
+    def testActorPool(self):
+        register_trainable("warm", create_warm_class())
+        trial_executor = RayTrialExecutor(
+            reuse_actors=True, max_cached_actors=2)
+        trials = [
+            Trial("warm", resources=Resources(cpu=0, gpu=0)) for _ in range(3)
+        ]
+        for trial in trials:
+            trial_executor.start_trial(trial, train=False)
+        runners = {trial.runner for trial in trials}
+        for trial in trials:
+            trial_executor.stop_trial(trial)
+        self.assertEqual(len(trial_executor._cached_actors), 2)
+
+        trials = [
+            Trial("warm", resources=Resources(cpu=0, gpu=0)) for _ in range(2)
+        ]
+        for trial in trials:
+            trial_executor.start_trial(trial, train=False)
+            self.assertIn(trial.runner, runners)
+        self.assertFalse(trial_executor._cached_actors)
+
+        # Trials with other resource requirements get a new actor.
+        trial = Trial("warm", resources=Resources(cpu=1, gpu=0))
+        trial_executor.start_trial(trial, train=False)
+        self.assertNotIn(trial.runner, runners)
+        for trial in trials + [trial]:
+            trial_executor.stop_trial(trial)
+        trial_executor.cleanup()
+        self.assertFalse(trial_executor._cached_actors)
+
+    def testActorPoolPartialEviction(self):
+        register_trainable("warm", create_warm_class())
+        register_trainable("other", create_warm_class())
+        trial_executor = RayTrialExecutor(
+            reuse_actors=True, max_cached_actors=2)
+        trials = [
+            Trial("warm", resources=Resources(cpu=0, gpu=0)),
+            Trial("warm", resources=Resources(cpu=1, gpu=0)),
+        ]
+        for trial in trials:
+            trial_executor.start_trial(trial, train=False)
+        free_runner = trials[0].runner
+        for trial in trials:
+            trial_executor.stop_trial(trial)
+        self.assertEqual(len(trial_executor._cached_actors), 2)
+
+        # Only the cached actor holding the CPU is destroyed for a trial
+        # that needs it.
+        trial = Trial("other", resources=Resources(cpu=1, gpu=0))
+        trial_executor.start_trial(trial, train=False)
+        self.assertEqual(
+            [actor for _, _, actor in trial_executor._cached_actors],
+            [free_runner])
+        trial_executor.stop_trial(trial)
+        trial_executor.cleanup()
+
     def testTrialReuseEnabledError(self):
         def run():
             run_experiments(
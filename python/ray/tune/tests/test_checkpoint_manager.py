@@ -28,6 +28,21 @@ class CheckpointManagerTest(unittest.TestCase):
         self.assertEqual(checkpoint_manager.newest_persistent_checkpoint,
                          persistent_checkpoint)
 
+    def testClearMemoryCheckpoint(self):
+        checkpoint_manager = self.checkpoint_manager(keep_checkpoints_num=1)
+        persistent_checkpoint = Checkpoint(Checkpoint.PERSISTENT, {0},
+                                           self.mock_result(0))
+        checkpoint_manager.on_checkpoint(persistent_checkpoint)
+        memory_checkpoint = Checkpoint(Checkpoint.MEMORY, {1},
+                                       self.mock_result(1))
+        checkpoint_manager.on_checkpoint(memory_checkpoint)
+        self.assertEqual(checkpoint_manager.newest_checkpoint,
+                         memory_checkpoint)
+        checkpoint_manager.clear_memory_checkpoint()
+        self.assertIsNone(checkpoint_manager.newest_memory_checkpoint.value)
+        self.assertEqual(checkpoint_manager.newest_checkpoint,
+                         persistent_checkpoint)
+
     def testOnCheckpointOrdered(self):
         """
         Tests increasing priorities. Also tests that that the worst checkpoints
@@ -1,5 +1,6 @@
 import json
 import os
+import time
 import unittest
 
 import ray
@@ -7,7 +8,8 @@ from ray.rllib import _register_all
 
 from ray import tune
 from ray.tune.function_runner import wrap_function
-from ray.tune.result import TRAINING_ITERATION
+from ray.tune.result import RESULT_DUPLICATE, TIMESTEPS_TOTAL, \
+    TRAINING_ITERATION
 
 
 class FunctionApiTest(unittest.TestCase):
@@ -37,6 +39,33 @@ class FunctionApiTest(unittest.TestCase):
         checkpoint = new_trainable2.save()
         new_trainable2.stop()
 
+    def testCoalesceResults(self):
+        def train(config, reporter):
+            for i in range(500):
+                reporter(test=i, timesteps_this_iter=1)
+                time.sleep(0.002)
+
+        wrapped = wrap_function(
+            train, report_interval_s=0.2, aggregate_metrics=["test"])
+        new_trainable = wrapped()
+        results = [new_trainable.train()]
+        while RESULT_DUPLICATE not in results[-1]:
+            results.append(new_trainable.train())
+        new_trainable.stop()
+        self.assertLess(len(results), 100)
+        self.assertEqual(results[-2][TIMESTEPS_TOTAL], 500)
+        result = results[1]
+        self.assertEqual(result["test_max"], result["test"])
+        self.assertLess(result["test_min"], result["test_mean"])
+        self.assertLess(result["test_mean"], result["test_max"])
+
+        # Stopping the trainable stops the function at its next report.
+        new_trainable = wrapped()
+        new_trainable.train()
+        new_trainable.stop()
+        new_trainable._runner.join(timeout=5)
+        self.assertFalse(new_trainable._runner.is_alive())
+
     def testFunctionRecurringSave(self):
         """This tests that save and restore are commutative."""
 
@@ -1,10 +1,16 @@
 from collections import namedtuple
+import json
+import os
 import unittest
+from unittest import mock
+import zipfile
 import tempfile
 import shutil
 import numpy as np
 
-from ray.tune.logger import JsonLogger, CSVLogger, TBXLogger
+from ray.tune.analysis import Analysis
+from ray.tune.logger import JsonLogger, CSVLogger, TBXLogger, \
+    ColumnarLogger, read_columnar_results
 
 Trial = namedtuple("MockTrial", ["evaluated_params", "trial_id"])
 
@@ -84,6 +90,111 @@ class LoggerSuite(unittest.TestCase):
             logger.close()
         assert "INFO" in cm.output[0]
 
+    def testColumnar(self):
+        config = {"a": 2, "b": 5, "c": {"c": {"D": 123}, "e": None}}
+        t = Trial(evaluated_params=config, trial_id="columnar")
+        logger = ColumnarLogger(config=config, logdir=self.test_dir, trial=t)
+        logger.chunk_size = 2
+        logger.on_result(result(0, 4, config=config))
+        logger.on_result(result(1, 5))
+        logger.on_result(result(2, 6, score=[1, 2, 3], hello={"world": 1}))
+        logger.close()
+        # Appends to the existing results.
+        logger = ColumnarLogger(config=config, logdir=self.test_dir, trial=t)
+        logger.on_result(result(3, 7, done=True))
+        logger.close()
+
+        path = os.path.join(self.test_dir, "progress.npz.d")
+        results = read_columnar_results(path)
+        self.assertNotIn("config", results)
+        self.assertEqual(results["episode_reward_mean"].tolist(), [4, 5, 6, 7])
+        self.assertEqual(results["hello/world"][2], 1)
+        self.assertTrue(np.isnan(results["hello/world"][3]))
+        self.assertEqual(results["score"][2], "[1, 2, 3]")
+        self.assertEqual(results["score"][0], "")
+
+        results = read_columnar_results(
+            path, columns=["training_iteration", "missing"], row=-2)
+        self.assertEqual(sorted(results), ["missing", "training_iteration"])
+        self.assertEqual(results["training_iteration"].tolist(), [2])
+        self.assertTrue(np.isnan(results["missing"][0]))
+
+    def testColumnarInterruptedWrite(self):
+        config = {"a": 2}
+        t = Trial(evaluated_params=config, trial_id="columnar")
+        logger = ColumnarLogger(config=config, logdir=self.test_dir, trial=t)
+        logger.chunk_size = 2
+        logger.on_result(result(0, 4))
+        logger.on_result(result(1, 5))
+
+        # A crash while writing a chunk keeps the chunks written before.
+        with mock.patch.object(
+                zipfile.ZipFile, "writestr", side_effect=OSError("crash")):
+            logger.on_result(result(2, 6))
+            self.assertRaises(OSError, lambda: logger.on_result(result(3, 7)))
+        path = os.path.join(self.test_dir, "progress.npz.d")
+        results = read_columnar_results(path)
+        self.assertEqual(results["episode_reward_mean"].tolist(), [4, 5])
+        self.assertEqual(os.listdir(path), ["000000.npz"])
+
+        # Appending works again afterwards.
+        logger = ColumnarLogger(config=config, logdir=self.test_dir, trial=t)
+        logger.on_result(result(4, 8))
+        logger.close()
+        results = read_columnar_results(path)
+        self.assertEqual(results["episode_reward_mean"].tolist(), [4, 5, 8])
+
+    def testColumnarFlush(self):
+        config = {"a": 2}
+        t = Trial(evaluated_params=config, trial_id="columnar")
+        logger = ColumnarLogger(config=config, logdir=self.test_dir, trial=t)
+        logger.min_flush_size = 3
+        path = os.path.join(self.test_dir, "progress.npz.d")
+        # Flushes don't write chunks smaller than min_flush_size.
+        logger.on_result(result(0, 4))
+        logger.on_result(result(1, 5))
+        logger.flush()
+        self.assertFalse(os.path.exists(path))
+        logger.on_result(result(2, 6))
+        logger.flush()
+        logger.on_result(result(3, 7))
+        logger.flush()
+        self.assertEqual(os.listdir(path), ["000000.npz"])
+        # Closing writes the rest, without touching earlier chunks.
+        logger.close()
+        self.assertEqual(
+            sorted(os.listdir(path)), ["000000.npz", "000001.npz"])
+        results = read_columnar_results(path)
+        self.assertEqual(results["episode_reward_mean"].tolist(), [4, 5, 6, 7])
+
+    def testColumnarAnalysis(self):
+        for i in range(3):
+            logdir = os.path.join(self.test_dir, "trial_{}".format(i))
+            os.makedirs(logdir)
+            config = {"i": i}
+            with open(os.path.join(logdir, "params.json"), "w") as f:
+                json.dump(config, f)
+            t = Trial(evaluated_params=config, trial_id=str(i))
+            logger = ColumnarLogger(config=config, logdir=logdir, trial=t)
+            logger.chunk_size = 2
+            for j in range(5):
+                logger.on_result(result(j, (i + 1) * j))
+            logger.close()
+
+        analysis = Analysis(self.test_dir)
+        self.assertEqual(
+            analysis.get_best_config("episode_reward_mean"), {"i": 2})
+        df = analysis.dataframe("episode_reward_mean", mode="min")
+        self.assertEqual(df.shape[0], 3)
+        self.assertEqual(df["time_total_s"].tolist(), [0, 0, 0])
+        # Nothing but the metric has been read so far.
+        self.assertIsNone(analysis._trial_dataframes)
+        df = analysis.dataframe()
+        self.assertEqual(df["time_total_s"].tolist(), [4, 4, 4])
+        self.assertEqual(len(analysis.trial_dataframes), 3)
+        for df in analysis.trial_dataframes.values():
+            self.assertEqual(df.shape[0], 5)
+
 
 if __name__ == "__main__":
     import pytest
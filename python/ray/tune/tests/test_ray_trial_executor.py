@@ -63,6 +63,9 @@ class RayTrialExecutorTest(unittest.TestCase):
         self.assertEqual(Trial.RUNNING, trial.status)
         self.trial_executor.pause_trial(trial)
         self.assertEqual(Trial.PAUSED, trial.status)
+        # Paused trials resume from their in-memory checkpoint.
+        self.assertEqual(trial.checkpoint.storage, Checkpoint.MEMORY)
+        self.assertIsNotNone(trial.checkpoint.value)
         self.trial_executor.start_trial(trial)
         self.assertEqual(Trial.RUNNING, trial.status)
         self.trial_executor.stop_trial(trial)
@@ -246,6 +249,59 @@ class RayExecutorQueueTest(unittest.TestCase):
             self.trial_executor.has_resources(cpu_only_trial3.resources))
 
 
+class RayExecutorPackingTest(unittest.TestCase):
+    def setUp(self):
+        self.trial_executor = RayTrialExecutor(
+            refresh_period=0, pack_trials=True)
+        self.cluster = Cluster(
+            initialize_head=True, connect=True, head_node_args={"num_cpus": 2})
+        self.cluster.add_node(num_cpus=2)
+        self.cluster.wait_for_nodes()
+        _register_all()
+
+    def tearDown(self):
+        ray.shutdown()
+        self.cluster.shutdown()
+        _register_all()  # re-register the evicted objects
+
+    def testBinPacking(self):
+        def create_trial(cpu):
+            return Trial("__fake", resources=Resources(cpu=cpu, gpu=0))
+
+        trials = [create_trial(1), create_trial(1)]
+        for trial in trials:
+            self.assertTrue(self.trial_executor.has_resources(trial.resources))
+            self.trial_executor.start_trial(trial)
+        nodes = self.trial_executor._trial_nodes
+        self.assertEqual(nodes[trials[0]], nodes[trials[1]])
+
+        # The second node is kept free for a larger trial.
+        large_trial = create_trial(2)
+        self.assertTrue(
+            self.trial_executor.has_resources(large_trial.resources))
+        self.trial_executor.start_trial(large_trial)
+        self.assertNotEqual(nodes[large_trial], nodes[trials[0]])
+
+        for trial in trials + [large_trial]:
+            self.trial_executor.stop_trial(trial)
+        self.assertFalse(nodes)
+
+    def testFragmentation(self):
+        def create_trial(cpu):
+            return Trial("__fake", resources=Resources(cpu=cpu, gpu=0))
+
+        for _ in range(2):
+            trial = create_trial(1.5)
+            self.assertTrue(self.trial_executor.has_resources(trial.resources))
+            self.trial_executor.start_trial(trial)
+
+        # One CPU is free in total, but not on a single node.
+        self.assertFalse(
+            self.trial_executor.has_resources(create_trial(1).resources))
+        self.assertTrue(
+            self.trial_executor.has_resources(create_trial(0.5).resources))
+
+
 class LocalModeExecutorTest(RayTrialExecutorTest):
     def setUp(self):
         self.trial_executor = RayTrialExecutor(queue_trials=False)
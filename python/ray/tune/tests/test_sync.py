@@ -12,7 +12,9 @@ from ray.rllib import _register_all
 
 from ray import tune
 from ray.tune import TuneError
-from ray.tune.syncer import CommandBasedClient
+from ray.tune.sync_client import BatchedCommandClient, LocalClient
+from ray.tune.syncer import CommandBasedClient, SyncBatch
+from ray.tune.utils.mock import MockNodeSyncer
 
 
 class TestSyncFunctionality(unittest.TestCase):
@@ -237,6 +239,113 @@ class TestSyncFunctionality(unittest.TestCase):
             self.assertEqual(mock_sync.call_count, 0)
 
 
+class TestLocalSync(unittest.TestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.target = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.source)
+        shutil.rmtree(self.target)
+
+    def write(self, *path, content="data"):
+        path = os.path.join(self.source, *path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+    def testLocalClientChangedFiles(self):
+        self.write("a.txt")
+        self.write("sub", "b.txt")
+        client = LocalClient(max_workers=2)
+        client.sync_up(self.source, self.target)
+        client.wait()
+        with open(os.path.join(self.target, "sub", "b.txt")) as f:
+            self.assertEqual(f.read(), "data")
+
+        with patch("shutil.copy2", side_effect=shutil.copy2) as mock_copy:
+            client.sync_up(self.source, self.target)
+            client.wait()
+            self.assertEqual(mock_copy.call_count, 0)
+            self.write("a.txt", content="changed")
+            client.sync_up(self.source, self.target)
+            client.wait()
+            self.assertEqual(mock_copy.call_count, 1)
+        with open(os.path.join(self.target, "a.txt")) as f:
+            self.assertEqual(f.read(), "changed")
+
+        client.delete(self.target)
+        self.assertFalse(os.path.exists(self.target))
+        client.sync_up(self.source, self.target)
+        client.wait()
+        self.assertTrue(os.path.exists(os.path.join(self.target, "a.txt")))
+
+    def testSyncBatch(self):
+        class LocalNodeSyncer(MockNodeSyncer):
+            @property
+            def _remote_path(syncer):
+                return os.path.join(self.source, syncer._remote_dir)
+
+        mock = unittest.mock.Mock()
+
+        def create_client():
+            mock()
+            return LocalClient()
+
+        batch = SyncBatch(create_client, max_workers=2)
+        syncers = []
+        for i in range(4):
+            self.write("trial_{}".format(i), "result.json")
+            syncer = LocalNodeSyncer(
+                os.path.join(self.target, "trial_{}".format(i)),
+                "trial_{}".format(i),
+                LocalClient(),
+                sync_batch=batch)
+            syncer.set_worker_ip("1.1.1.{}".format(i % 2))
+            syncers.append(syncer)
+
+        for syncer in syncers:
+            syncer.sync_down_if_needed()
+        batch.wait()
+        # One client per worker node.
+        self.assertEqual(mock.call_count, 2)
+        self.assertEqual(
+            sorted(os.listdir(self.target)),
+            ["trial_0", "trial_1", "trial_2", "trial_3"])
+        # Within the sync period, nothing is synced again.
+        self.write("trial_0", "result.json", content="changed")
+        syncers[0].sync_down_if_needed()
+        batch.wait()
+        with open(os.path.join(self.target, "trial_0", "result.json")) as f:
+            self.assertEqual(f.read(), "data")
+        self.assertTrue(batch.sync_down("1.1.1.0"))
+        batch.wait()
+        with open(os.path.join(self.target, "trial_0", "result.json")) as f:
+            self.assertEqual(f.read(), "changed")
+
+    def testBatchedCommandClient(self):
+        client = BatchedCommandClient(
+            "echo {source} {target} {files_from} > /dev/null")
+        with patch.object(BatchedCommandClient, "_execute") as mock_fn:
+            client.sync_down_batch([("user@1.1.1.1:/tmp/a/", "/tmp/a/"),
+                                    ("user@1.1.1.1:/tmp/b", "/tmp/b")])
+            mock_fn.assert_called_once_with(client.sync_down_template,
+                                            "user@1.1.1.1:/", "/")
+        with open(client.files_from) as f:
+            self.assertEqual(f.read().split(), ["tmp/a", "tmp/b"])
+        with self.assertRaises(ValueError):
+            client.sync_down_batch([("user@1.1.1.1:/tmp/a", "/tmp/a"),
+                                    ("user@1.1.1.2:/tmp/b", "/tmp/b")])
+        files_from = client.files_from
+        client.reset()
+        self.assertFalse(os.path.exists(files_from))
+        client = BatchedCommandClient("echo {source} {target} {files_from}")
+        files_from = client.files_from
+        self.assertTrue(os.path.exists(files_from))
+        del client
+        self.assertFalse(os.path.exists(files_from))
+
+
 if __name__ == "__main__":
     import pytest
     sys.exit(pytest.main(["-v", __file__]))
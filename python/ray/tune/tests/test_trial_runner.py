@@ -7,6 +7,7 @@ from ray.rllib import _register_all
 
 from ray import tune
 from ray.tune import TuneError, register_trainable
+from ray.tune.checkpoint_manager import Checkpoint
 from ray.tune.ray_trial_executor import RayTrialExecutor
 from ray.tune.schedulers import TrialScheduler, FIFOScheduler
 from ray.tune.trial import Trial
@@ -34,6 +35,41 @@ class TrialRunnerTest(unittest.TestCase):
         trial_executor.stop_trial(trial, error=True)
         self.assertEqual(trial.status, Trial.ERROR)
 
+    def testTrialCompact(self):
+        config = {"lr": 0.1, "model": {"hiddens": [64, 64], "dim": 84}}
+        trial = Trial("__fake", config=config)
+        trial.last_result = {
+            "episode_reward_mean": 1.0,
+            "hist_stats": [1.0, 2.0],
+            "info": {
+                "loss": 0.5,
+                "weights": object()
+            }
+        }
+        trial.metric_n_steps = {"episode_reward_mean": {"5": [1.0]}}
+        trial.checkpoint_manager.on_checkpoint(
+            Checkpoint(Checkpoint.PERSISTENT, "/tmp/checkpoint",
+                       dict(trial.last_result, training_iteration=1)))
+        trial.compact()
+        self.assertEqual(trial.config, config)
+        self.assertEqual(trial.last_result, {
+            "episode_reward_mean": 1.0,
+            "info": {
+                "loss": 0.5
+            }
+        })
+        self.assertEqual(trial.metric_n_steps, {})
+        self.assertIsNone(trial.loggers)
+        [checkpoint] = trial.checkpoint_manager.best_checkpoints()
+        self.assertEqual(checkpoint.value, "/tmp/checkpoint")
+        self.assertNotIn("hist_stats", checkpoint.result)
+        self.assertEqual(trial.checkpoint.result["training_iteration"], 1)
+
+        # Only search algorithms that generate trials lazily compact them.
+        self.assertFalse(BasicVariantGenerator().should_compact_trials())
+        self.assertTrue(
+            BasicVariantGenerator(max_concurrent=2).should_compact_trials())
+
     def testExperimentTagTruncation(self):
         ray.init()
 
@@ -251,6 +287,36 @@ class TrialRunnerTest(unittest.TestCase):
         self.assertEqual(trials[0].status, Trial.TERMINATED)
         self.assertRaises(TuneError, runner.step)
 
+    def testBatchResults(self):
+        """Checks that all ready results are processed in one step."""
+        ray.init(num_cpus=4)
+        runner = TrialRunner(batch_results=True)
+        kwargs = {
+            "stopping_criterion": {
+                "training_iteration": 3
+            },
+            "resources": Resources(cpu=1, gpu=0),
+        }
+        trials = [Trial("__fake", **kwargs) for _ in range(4)]
+        for t in trials:
+            runner.add_trial(t)
+        for _ in range(4):
+            runner.step()
+        self.assertTrue(all(t.status == Trial.RUNNING for t in trials))
+
+        # Wait until all results are ready.
+        ray.wait(
+            list(runner.trial_executor._running),
+            num_returns=len(trials),
+            timeout=60)
+        runner.step()
+        self.assertTrue(
+            all(t.last_result["training_iteration"] == 1 for t in trials))
+        while not runner.is_finished():
+            runner.step()
+        self.assertTrue(all(t.status == Trial.TERMINATED for t in trials))
+        self.assertFalse(runner.trial_executor._fetched)
+
     def testChangeResources(self):
         """Checks that resource requirements can be changed on fly."""
         ray.init(num_cpus=2)
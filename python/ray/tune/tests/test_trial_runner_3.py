@@ -327,6 +327,67 @@ class TrialRunnerTest3(unittest.TestCase):
         self.assertRaises(TuneError, runner2.step)
         shutil.rmtree(tmpdir)
 
+    def testCheckpointLog(self):
+        """Checks that checkpoints only log the trials that changed."""
+        ray.init(num_cpus=3)
+        tmpdir = tempfile.mkdtemp()
+
+        runner = TrialRunner(local_checkpoint_dir=tmpdir, checkpoint_period=0)
+
+        def count_log_records():
+            with open(runner._checkpoint_log_file) as f:
+                return sum(1 for _ in f)
+
+        trials = [
+            Trial("__fake", trial_id="trial_{}".format(i)) for i in range(10)
+        ]
+        for trial in trials:
+            runner.add_trial(trial)
+        runner.checkpoint(force=True)
+        self.assertEqual(count_log_records(), 10)
+        runner.checkpoint(force=True)
+        self.assertEqual(count_log_records(), 10)
+
+        trials[3].config = {"changed": True}
+        runner.trial_executor.try_checkpoint_metadata(trials[3])
+        runner.checkpoint(force=True)
+        self.assertEqual(count_log_records(), 11)
+
+        # Compacts the log once it holds more than 2 records per trial.
+        for trial in trials:
+            runner.trial_executor.try_checkpoint_metadata(trial)
+        runner.checkpoint(force=True)
+        self.assertEqual(count_log_records(), 10)
+
+        runner2 = TrialRunner(resume="LOCAL", local_checkpoint_dir=tmpdir)
+        self.assertEqual(len(runner2.get_trials()), 10)
+        self.assertEqual(
+            runner2.get_trial("trial_3").config, {"changed": True})
+        shutil.rmtree(tmpdir)
+
+    def testCheckpointAsync(self):
+        """Checks that async checkpoints are written in the background."""
+        ray.init(num_cpus=3)
+        tmpdir = tempfile.mkdtemp()
+
+        runner = TrialRunner(
+            local_checkpoint_dir=tmpdir,
+            checkpoint_period=0,
+            checkpoint_async=True)
+        for i in range(5):
+            runner.add_trial(Trial("__fake", trial_id="trial_{}".format(i)))
+            runner.checkpoint()
+        runner.flush_checkpoints()
+        self.assertIsNone(runner._checkpoint_writer._thread)
+        runner2 = TrialRunner(resume="LOCAL", local_checkpoint_dir=tmpdir)
+        self.assertEqual(len(runner2.get_trials()), 5)
+
+        runner.add_trial(Trial("__fake", trial_id="trial_5"))
+        runner.checkpoint(force=True)
+        runner2 = TrialRunner(resume="LOCAL", local_checkpoint_dir=tmpdir)
+        self.assertEqual(len(runner2.get_trials()), 6)
+        shutil.rmtree(tmpdir)
+
     def testTrialNoSave(self):
         """Check that non-checkpointing trials are not saved."""
         ray.init(num_cpus=3)
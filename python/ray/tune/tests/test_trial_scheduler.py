@@ -147,6 +147,18 @@ class EarlyStoppingSuite(unittest.TestCase):
             rule.on_trial_result(runner, t3, result(2, 260)),
             TrialScheduler.PAUSE)
 
+    def testMedianStoppingRunningMean(self):
+        rule = MedianStoppingRule(grace_period=2, min_samples_required=1)
+        t1, t2 = self.basicSetup(rule)
+        # Only results from the grace period up to the given time count.
+        self.assertEqual(rule._running_mean(t1, 4), 300)
+        self.assertEqual(rule._running_mean(t1, 4.5), 300)
+        self.assertEqual(rule._running_mean(t1, 9), 550)
+        self.assertEqual(rule._running_mean(t2, 9), 450)
+        self.assertEqual(rule._best_result(t1), 900)
+        self.assertEqual(rule._trials_beyond_time(5), [t1])
+        self.assertEqual(rule._median_result([t1, t2], 4), 375)
+
     def _test_metrics(self, result_func, metric, mode):
         rule = MedianStoppingRule(
             grace_period=0,
@@ -748,6 +760,33 @@ class PopulationBasedTestingSuite(unittest.TestCase):
         pbt.reset_stats()
         return pbt, runner
 
+    def testPopulationOrder(self):
+        pbt, runner = self.basicSetup()
+        trials = runner.get_trials()
+        self.assertEqual([t for _, _, t in pbt._population], trials)
+        pbt.on_trial_result(runner, trials[0], result(20, 150))
+        pbt.on_trial_result(runner, trials[4], result(20, 0))
+        self.assertEqual(
+            [t for _, _, t in pbt._population],
+            [trials[4], trials[1], trials[2], trials[0], trials[3]])
+        lower, upper = pbt._quantiles()
+        self.assertEqual(lower, [trials[4], trials[1]])
+        self.assertEqual(upper, [trials[0], trials[3]])
+
+        trials[3].status = Trial.TERMINATED
+        lower, upper = pbt._quantiles()
+        self.assertEqual(lower, [trials[4]])
+        self.assertEqual(upper, [trials[0]])
+
+    def testReleaseCheckpointOnComplete(self):
+        pbt, runner = self.basicSetup()
+        trials = runner.get_trials()
+        pbt.on_trial_result(runner, trials[4], result(20, 200))
+        self.assertIsNotNone(pbt._trial_state[trials[4]].last_checkpoint)
+        trials[4].status = Trial.TERMINATED
+        pbt.on_trial_complete(runner, trials[4], result(20, 200))
+        self.assertIsNone(pbt._trial_state[trials[4]].last_checkpoint)
+
     def testCheckpointsMostPromisingTrials(self):
         pbt, runner = self.basicSetup()
         trials = runner.get_trials()
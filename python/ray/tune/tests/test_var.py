@@ -140,6 +140,31 @@ class VariantGeneratorTest(unittest.TestCase):
             "foo": 3,
         })
 
+    def testMaxConcurrent(self):
+        suggester = BasicVariantGenerator(max_concurrent=4)
+        suggester.add_configurations({
+            "grid_search": {
+                "run": "PPO",
+                "config": {
+                    "foo": grid_search(list(range(10)))
+                },
+            }
+        })
+        trials = suggester.next_trials()
+        self.assertEqual([t.config["foo"] for t in trials], [0, 1, 2, 3])
+        self.assertEqual(suggester.next_trials(), [])
+        self.assertFalse(suggester.is_finished())
+
+        for trial in trials[:3]:
+            suggester.on_trial_complete(trial.trial_id)
+        trials = trials[3:] + suggester.next_trials()
+        self.assertEqual([t.config["foo"] for t in trials], [3, 4, 5, 6])
+        for trial in trials:
+            suggester.on_trial_complete(trial.trial_id)
+        trials = suggester.next_trials()
+        self.assertEqual([t.config["foo"] for t in trials], [7, 8, 9])
+        self.assertTrue(suggester.is_finished())
+
     def testGridSearchAndEval(self):
         trials = self.generate_trials({
             "run": "PPO",
@@ -1,7 +1,6 @@
 from datetime import datetime
 
 import copy
-import io
 import logging
 import glob
 import os
@@ -229,6 +228,7 @@ class Trainable:
         self._trial_info = trial_info
 
         start_time = time.time()
+        self.warm(copy.deepcopy(self.config))
         self.setup(copy.deepcopy(self.config))
         setup_time = time.time() - start_time
         if setup_time > SETUP_TIME_THRESHOLD:
@@ -418,6 +418,8 @@ class Trainable:
         """Saves the current model state to a Python object.
 
         It also saves to disk but does not return the checkpoint path.
+        When called as an actor task, the returned object is stored in the
+        object store, so the driver only holds a reference to it.
 
         Returns:
             Object holding checkpoint data.
@@ -426,12 +428,10 @@ class Trainable:
         checkpoint_path = self.save(tmpdir)
         # Save all files in subtree.
         data_dict = TrainableUtil.pickle_checkpoint(checkpoint_path)
-        out = io.BytesIO()
         if len(data_dict) > 10e6:  # getting pretty large
             logger.info("Checkpoint size is {} bytes".format(len(data_dict)))
-        out.write(data_dict)
         shutil.rmtree(tmpdir)
-        return out.getvalue()
+        return data_dict
 
     def restore(self, checkpoint_path):
         """Restores training state from a given model checkpoint.
@@ -516,6 +516,43 @@ class Trainable:
         export_dir = export_dir or self.logdir
         return self._export_model(export_formats, export_dir)
 
+    def reset(self, new_config):
+        """Resets the trainable for a new configuration or a new trial.
+
+        Resets the training progress counters and calls ``reset_config``. If
+        that is not supported but ``warm`` is overridden, calls ``cleanup``
+        and ``setup`` with the new configuration instead, so that whatever
+        ``warm`` prepared is kept.
+
+        Args:
+            new_config (dict): Updated hyperparameter configuration
+                for the trainable.
+
+        Returns:
+            True if reset was successful else False.
+        """
+        trial_info = new_config.pop(TRIAL_INFO, None)
+        success = self.reset_config(new_config)
+        if not success and self._is_overriden("warm"):
+            self.cleanup()
+            self.config = new_config
+            self.setup(copy.deepcopy(new_config))
+            success = True
+        if not success:
+            return False
+
+        if trial_info:
+            self._trial_info = trial_info
+        self._iteration = 0
+        self._time_total = 0.0
+        self._timesteps_total = None
+        self._episodes_total = None
+        self._time_since_restore = 0.0
+        self._timesteps_since_restore = 0
+        self._iterations_since_restore = 0
+        self._restored = False
+        return True
+
     def reset_config(self, new_config):
         """Resets configuration without restarting the trial.
 
@@ -748,6 +785,23 @@ class Trainable:
         """
         raise NotImplementedError
 
+    def warm(self, config):
+        """Subclasses can override this for initialization shared by trials.
+
+        This is called once per actor, before ``setup``. When the actor is
+        reused for another trial (``reuse_actors=True``), it is not called
+        again, so expensive imports, dataset loads or device initialization
+        should be done here.
+
+        Trainables that override this method can be reused for new trials
+        even if they do not implement ``reset_config``.
+
+        Args:
+            config (dict): Hyperparameters and other configs given to the
+                first trial of this actor. Copy of `self.config`.
+        """
+        pass
+
     def setup(self, config):
         """Subclasses should override this for custom initialization.
 
@@ -33,6 +33,17 @@ def date_str():
     return datetime.today().strftime("%Y-%m-%d_%H-%M-%S")
 
 
+def _scalar_summary(values):
+    """Returns the scalar entries of a (nested) dict."""
+    summary = {}
+    for key, value in values.items():
+        if isinstance(value, dict):
+            summary[key] = _scalar_summary(value)
+        elif value is None or isinstance(value, (Number, str)):
+            summary[key] = value
+    return summary
+
+
 class Location:
     """Describes the location at which Trial is placed to run."""
 
@@ -354,6 +365,27 @@ class Trial:
             if self.start_time is None:
                 self.start_time = time.time()
 
+    def compact(self):
+        """Reduces a finished trial to a summary record.
+
+        This is called once the trial has finished for good and the search
+        algorithm allows it (see `SearchAlgorithm.should_compact_trials`),
+        so that the memory held by finished trials stays small. The last
+        result and the results of persistent checkpoints are reduced to
+        their scalar entries, which is what the progress reporters and
+        ExperimentAnalysis read. State only needed to run the trial is
+        dropped. The config is kept as is, and the full results remain in
+        the trial logdir.
+        """
+        self.last_result = _scalar_summary(self.last_result)
+        self.metric_n_steps = {}
+        self.checkpoint_manager.clear_memory_checkpoint()
+        checkpoints = [self.checkpoint_manager.newest_persistent_checkpoint]
+        for checkpoint in checkpoints + (
+                self.checkpoint_manager.best_checkpoints()):
+            checkpoint.result = _scalar_summary(checkpoint.result)
+        self.loggers = None
+
     def close_logger(self):
         """Closes logger."""
         if self.result_logger:
@@ -185,6 +185,17 @@ class TrialExecutor:
         """
         raise NotImplementedError
 
+    def get_next_available_trials(self):
+        """Blocking call that waits until at least one result is ready.
+
+        Executors may fetch all ready results at once here, so that the
+        following `fetch_result` calls don't block.
+
+        Returns:
+            List of Trial objects that are ready for intermediate processing.
+        """
+        return [self.get_next_available_trial()]
+
     def get_next_failed_trial(self):
         """Non-blocking call that detects and returns one failed trial.
 
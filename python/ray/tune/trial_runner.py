@@ -3,6 +3,7 @@ from datetime import datetime
 import json
 import logging
 import os
+import threading
 import time
 import traceback
 import types
@@ -36,6 +37,40 @@ def _find_newest_ckpt(ckpt_dir):
     return max(full_paths)
 
 
+def load_experiment_state(checkpoint_path, cls=None):
+    """Loads an experiment checkpoint written by `TrialRunner.checkpoint()`.
+
+    The trial states are read from the checkpoint's trial log, where the last
+    record of each trial is its current state.
+
+    Args:
+        checkpoint_path (str): Path to the experiment_state json file.
+        cls (JSONDecoder): Optional JSON decoder class for the records.
+
+    Returns:
+        Dict with the runner state, where "checkpoints" is the list of trial
+            states.
+    """
+    with open(checkpoint_path, "r") as f:
+        runner_state = json.load(f, cls=cls)
+    if "checkpoint_log" in runner_state:
+        trial_states = {}
+        log_path = os.path.join(
+            os.path.dirname(checkpoint_path), runner_state["checkpoint_log"])
+        with open(log_path, "r") as f:
+            for line in f:
+                try:
+                    state = json.loads(line, cls=cls)
+                except ValueError:
+                    # The last record may be incomplete after a crash.
+                    logger.warning("Ignoring corrupt trial record in %s.",
+                                   log_path)
+                    continue
+                trial_states[state["trial_id"]] = state
+        runner_state["checkpoints"] = list(trial_states.values())
+    return runner_state
+
+
 class _TuneFunctionEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, types.FunctionType):
@@ -67,6 +102,112 @@ class _TuneFunctionDecoder(json.JSONDecoder):
         return cloudpickle.loads(hex_to_binary(obj["value"]))
 
 
+class _CheckpointWriter:
+    """Writes experiment checkpoints of a TrialRunner.
+
+    Trial states are appended to the trial log, but only for trials whose
+    state changed since the last write. The log is compacted (rewritten with
+    only the current trial states) once it grows beyond `compaction_ratio`
+    records per trial. Then the experiment state file is replaced and the
+    checkpoint directory synced up.
+
+    In async mode, checkpoints are written by a background thread, and
+    requests that arrive while it is busy are coalesced: only the most
+    recent pending request is written.
+    """
+
+    def __init__(self, checkpoint_file, log_file, syncer, compaction_ratio,
+                 async_write):
+        self._checkpoint_file = checkpoint_file
+        self._log_file = log_file
+        self._syncer = syncer
+        self._compaction_ratio = compaction_ratio
+        self._async = async_write
+        # Trial states as of the last write, and the number of records in
+        # the trial log.
+        self._trial_states = {}
+        self._log_records = 0
+        self._cond = threading.Condition()
+        self._pending = None
+        self._thread = None
+
+    def write(self, runner_state, trial_states, force=False):
+        """Writes (or in async mode, schedules writing) a checkpoint.
+
+        Args:
+            runner_state (str): The serialized experiment state.
+            trial_states (dict): Mapping of trial IDs to the current trial
+                states. The states must not be mutated afterwards.
+            force (bool): Whether to sync up the checkpoint immediately.
+        """
+        if not self._async:
+            self._write(runner_state, trial_states, force)
+            return
+        with self._cond:
+            if self._pending:
+                force = force or self._pending[2]
+            self._pending = (runner_state, trial_states, force)
+            if not self._thread:
+                self._thread = threading.Thread(
+                    target=self._run, name="CheckpointWriter")
+                self._thread.daemon = True
+                self._thread.start()
+
+    def flush(self):
+        """Blocks until all scheduled checkpoints are written."""
+        with self._cond:
+            while self._thread:
+                self._cond.wait()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._pending:
+                    self._thread = None
+                    self._cond.notify_all()
+                    return
+                request = self._pending
+                self._pending = None
+            try:
+                self._write(*request)
+            except Exception:
+                logger.exception("Trial Runner checkpointing failed.")
+
+    def _write(self, runner_state, trial_states, force):
+        directory = os.path.dirname(self._checkpoint_file)
+        # The executor caches a new state object whenever a trial changes.
+        changed = [
+            state for trial_id, state in trial_states.items()
+            if self._trial_states.get(trial_id) is not state
+        ]
+        if not self._log_records or (
+                self._log_records + len(changed) >
+                self._compaction_ratio * len(trial_states)):
+            tmp_file_name = os.path.join(directory, ".tmp_checkpoint_log")
+            with open(tmp_file_name, "w") as f:
+                for state in trial_states.values():
+                    f.write(json.dumps(state, cls=_TuneFunctionEncoder))
+                    f.write("\n")
+            os.replace(tmp_file_name, self._log_file)
+            self._log_records = len(trial_states)
+        elif changed:
+            with open(self._log_file, "a") as f:
+                for state in changed:
+                    f.write(json.dumps(state, cls=_TuneFunctionEncoder))
+                    f.write("\n")
+            self._log_records += len(changed)
+        self._trial_states = trial_states
+
+        tmp_file_name = os.path.join(directory, ".tmp_checkpoint")
+        with open(tmp_file_name, "w") as f:
+            f.write(runner_state)
+        os.replace(tmp_file_name, self._checkpoint_file)
+        if force:
+            self._syncer.sync_up()
+        else:
+            self._syncer.sync_up_if_needed()
+
+
 class TrialRunner:
     """A TrialRunner implements the event loop for scheduling trials on Ray.
 
@@ -110,9 +251,20 @@ class TrialRunner:
         checkpoint_period (int): Trial runner checkpoint periodicity in
             seconds. Defaults to 10.
         trial_executor (TrialExecutor): Defaults to RayTrialExecutor.
+        checkpoint_async (bool): Whether to write (and sync up) periodic
+            experiment checkpoints in a background thread, so that they
+            don't block the event loop. Forced checkpoints always block
+            until all checkpoints are written.
+        batch_results (bool): Whether each step should process all results
+            that are ready (fetched at once), instead of a single result.
+            The experiment checkpoint is then written once per batch.
     """
 
     CKPT_FILE_TMPL = "experiment_state-{}.json"
+    CKPT_LOG_TMPL = "experiment_state-{}.trials.jsonl"
+    # The trial log is rewritten once it holds more than this many records
+    # per trial.
+    CKPT_LOG_COMPACTION_RATIO = 2
     VALID_RESUME_TYPES = [True, "LOCAL", "REMOTE", "PROMPT"]
 
     def __init__(self,
@@ -128,7 +280,9 @@ class TrialRunner:
                  fail_fast=False,
                  verbose=True,
                  checkpoint_period=10,
-                 trial_executor=None):
+                 trial_executor=None,
+                 checkpoint_async=False,
+                 batch_results=False):
         self._search_alg = search_alg or BasicVariantGenerator()
         self._scheduler_alg = scheduler or FIFOScheduler()
         self.trial_executor = trial_executor or RayTrialExecutor()
@@ -141,6 +295,7 @@ class TrialRunner:
         self._iteration = 0
         self._has_errored = False
         self._fail_fast = fail_fast
+        self._batch_results = batch_results
         self._verbose = verbose
 
         self._server = None
@@ -180,10 +335,17 @@ class TrialRunner:
         self._session_str = datetime.fromtimestamp(
             self._start_time).strftime("%Y-%m-%d_%H-%M-%S")
         self.checkpoint_file = None
+        self._checkpoint_log_file = None
         if self._local_checkpoint_dir:
             self.checkpoint_file = os.path.join(
                 self._local_checkpoint_dir,
                 TrialRunner.CKPT_FILE_TMPL.format(self._session_str))
+            self._checkpoint_log_file = os.path.join(
+                self._local_checkpoint_dir,
+                TrialRunner.CKPT_LOG_TMPL.format(self._session_str))
+        self._checkpoint_writer = _CheckpointWriter(
+            self.checkpoint_file, self._checkpoint_log_file, self._syncer,
+            self.CKPT_LOG_COMPACTION_RATIO, checkpoint_async)
 
     @property
     def scheduler_alg(self):
@@ -252,8 +414,15 @@ class TrialRunner:
         Overwrites the current session checkpoint, which starts when self
         is instantiated. Throttle depends on self._checkpoint_period.
 
+        Trial states are appended to the session's trial log, but only for
+        trials whose state changed since the last checkpoint. The log is
+        compacted (rewritten with only the current trial states) once it
+        grows beyond `CKPT_LOG_COMPACTION_RATIO` records per trial. With
+        `checkpoint_async`, this (and syncing up) happens in the background.
+
         Args:
-            force (bool): Forces a checkpoint despite checkpoint_period.
+            force (bool): Forces a checkpoint despite checkpoint_period, and
+                waits until it is written and its sync up has started.
         """
         if not self._local_checkpoint_dir:
             return
@@ -263,26 +432,27 @@ class TrialRunner:
             return
         self._last_checkpoint_time = now
         runner_state = {
-            "checkpoints": list(
-                self.trial_executor.get_checkpoints().values()),
+            "checkpoint_log": os.path.basename(self._checkpoint_log_file),
             "runner_data": self.__getstate__(),
             "stats": {
                 "start_time": self._start_time,
                 "timestamp": self._last_checkpoint_time
             }
         }
-        tmp_file_name = os.path.join(self._local_checkpoint_dir,
-                                     ".tmp_checkpoint")
-        with open(tmp_file_name, "w") as f:
-            json.dump(runner_state, f, indent=2, cls=_TuneFunctionEncoder)
-
-        os.replace(tmp_file_name, self.checkpoint_file)
+        # Only the (small) runner state is serialized here, the cached trial
+        # states are immutable snapshots.
+        self._checkpoint_writer.write(
+            json.dumps(runner_state, indent=2, cls=_TuneFunctionEncoder),
+            self.trial_executor.get_checkpoints(),
+            force=force)
         if force:
-            self._syncer.sync_up()
-        else:
-            self._syncer.sync_up_if_needed()
+            self._checkpoint_writer.flush()
         return self._local_checkpoint_dir
 
+    def flush_checkpoints(self):
+        """Blocks until all scheduled experiment checkpoints are written."""
+        self._checkpoint_writer.flush()
+
     def resume(self):
         """Resumes all checkpointed trials from previous run.
 
@@ -290,9 +460,9 @@ class TrialRunner:
         all ongoing trials.
         """
         newest_ckpt_path = _find_newest_ckpt(self._local_checkpoint_dir)
-        with open(newest_ckpt_path, "r") as f:
-            runner_state = json.load(f, cls=_TuneFunctionDecoder)
-            self.checkpoint_file = newest_ckpt_path
+        runner_state = load_experiment_state(
+            newest_ckpt_path, cls=_TuneFunctionDecoder)
+        self.checkpoint_file = newest_ckpt_path
         logger.warning("".join([
             "Attempting to resume experiment from {}. ".format(
                 self._local_checkpoint_dir), "This feature is experimental, "
@@ -432,28 +602,40 @@ class TrialRunner:
             logger.info(error_msg)
             with warn_if_slow("process_failed_trial"):
                 self._process_trial_failure(failed_trial, error_msg=error_msg)
+        elif self._batch_results:
+            # Blocks until at least one result is ready.
+            trials = self.trial_executor.get_next_available_trials()
+            with warn_if_slow("process_trials"):
+                for trial in trials:
+                    # Processing a result may have stopped or paused other
+                    # trials of the batch.
+                    if trial.status == Trial.RUNNING:
+                        self._process_trial_event(trial)
         else:
             # TODO(ujvl): Consider combining get_next_available_trial and
             #  fetch_result functionality so that we don't timeout on fetch.
             trial = self.trial_executor.get_next_available_trial()  # blocking
-            if trial.is_restoring:
-                with warn_if_slow("process_trial_restore"):
-                    self._process_trial_restore(trial)
-            elif trial.is_saving:
-                with warn_if_slow("process_trial_save") as profile:
-                    self._process_trial_save(trial)
-                if profile.too_slow and trial.sync_on_checkpoint:
-                    # TODO(ujvl): Suggest using DurableTrainable once
-                    #  API has converged.
-                    logger.warning(
-                        "Consider turning off forced head-worker trial "
-                        "checkpoint syncs by setting sync_on_checkpoint=False"
-                        ". Note that this may result in faulty trial "
-                        "restoration if a failure occurs while the checkpoint "
-                        "is being synced from the worker to the head node.")
-            else:
-                with warn_if_slow("process_trial"):
-                    self._process_trial(trial)
+            self._process_trial_event(trial)
+
+    def _process_trial_event(self, trial):
+        if trial.is_restoring:
+            with warn_if_slow("process_trial_restore"):
+                self._process_trial_restore(trial)
+        elif trial.is_saving:
+            with warn_if_slow("process_trial_save") as profile:
+                self._process_trial_save(trial)
+            if profile.too_slow and trial.sync_on_checkpoint:
+                # TODO(ujvl): Suggest using DurableTrainable once
+                #  API has converged.
+                logger.warning(
+                    "Consider turning off forced head-worker trial "
+                    "checkpoint syncs by setting sync_on_checkpoint=False"
+                    ". Note that this may result in faulty trial "
+                    "restoration if a failure occurs while the checkpoint "
+                    "is being synced from the worker to the head node.")
+        else:
+            with warn_if_slow("process_trial"):
+                self._process_trial(trial)
 
     def _process_trial(self, trial):
         """Processes a trial result.
@@ -604,6 +786,7 @@ class TrialRunner:
         elif decision == TrialScheduler.STOP:
             self.trial_executor.export_trial_if_needed(trial)
             self.trial_executor.stop_trial(trial)
+            self._release_trial(trial)
         else:
             raise ValueError("Invalid decision: {}".format(decision))
 
@@ -740,6 +923,18 @@ class TrialRunner:
                 error = True
 
         self.trial_executor.stop_trial(trial, error=error, error_msg=error_msg)
+        self._release_trial(trial)
+
+    def _release_trial(self, trial):
+        """Releases state of a trial that has finished for good.
+
+        Trials are also stopped (with status TERMINATED) when they are
+        paused, so this is only called once the trial is never resumed.
+        Its in-memory checkpoint can't be restored anymore.
+        """
+        trial.checkpoint_manager.clear_memory_checkpoint()
+        if self._search_alg.should_compact_trials():
+            trial.compact()
 
     def cleanup_trials(self):
         self.trial_executor.cleanup()
@@ -759,6 +954,7 @@ class TrialRunner:
                 "_scheduler_alg",
                 "trial_executor",
                 "_syncer",
+                "_checkpoint_writer",
         ]:
             del state[k]
         state["launch_web_server"] = bool(self._server)
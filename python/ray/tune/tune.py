@@ -99,7 +99,11 @@ def run(run_or_experiment,
         trial_executor=None,
         raise_on_failed_trial=True,
         return_trials=False,
-        ray_auto_init=True):
+        ray_auto_init=True,
+        batch_results=False,
+        max_cached_actors=1,
+        pack_trials=False,
+        checkpoint_async=False):
     """Executes training.
 
     Args:
@@ -211,13 +215,31 @@ def run(run_or_experiment,
         reuse_actors (bool): Whether to reuse actors between different trials
             when possible. This can drastically speed up experiments that start
             and stop actors often (e.g., PBT in time-multiplexing mode). This
-            requires trials to have the same resource requirements.
+            requires trials to have the same resource requirements, and the
+            trainable to implement ``reset_config`` or ``warm``.
         trial_executor (TrialExecutor): Manage the execution of trials.
         raise_on_failed_trial (bool): Raise TuneError if there exists failed
             trial (of ERROR state) when the experiments complete.
         ray_auto_init (bool): Automatically starts a local Ray cluster
             if using a RayTrialExecutor (which is the default) and
             if Ray is not initialized. Defaults to True.
+        batch_results (bool): Whether to process all ready trial results at
+            once in each step of the event loop, instead of a single result.
+            This reduces the event loop overhead (e.g. experiment
+            checkpointing and progress reporting) for large experiments.
+            Defaults to False.
+        max_cached_actors (int): Maximum number of idle actors to keep for
+            reuse if ``reuse_actors`` is set. Actors are only reused for
+            trials with the same trainable and resource requirements, so a
+            larger pool helps experiments mixing several of them.
+            Defaults to 1.
+        pack_trials (bool): Whether to only start a trial when a single node
+            has room for it, and bin-pack trials onto the nodes. Defaults to
+            False.
+        checkpoint_async (bool): Whether to write (and sync up) periodic
+            experiment checkpoints in a background thread, so that they
+            don't block the event loop. Pending checkpoints are written
+            before ``tune.run`` returns or raises. Defaults to False.
 
 
 
@@ -245,7 +267,9 @@ def run(run_or_experiment,
     trial_executor = trial_executor or RayTrialExecutor(
         queue_trials=queue_trials,
         reuse_actors=reuse_actors,
-        ray_auto_init=ray_auto_init)
+        ray_auto_init=ray_auto_init,
+        pack_trials=pack_trials,
+        max_cached_actors=max_cached_actors)
     if isinstance(run_or_experiment, list):
         experiments = run_or_experiment
     else:
@@ -301,7 +325,9 @@ def run(run_or_experiment,
         server_port=server_port,
         verbose=bool(verbose > 1),
         fail_fast=fail_fast,
-        trial_executor=trial_executor)
+        trial_executor=trial_executor,
+        checkpoint_async=checkpoint_async,
+        batch_results=batch_results)
 
     for exp in experiments:
         runner.add_experiment(exp)
@@ -330,10 +356,14 @@ def run(run_or_experiment,
                            "`Trainable.default_resource_request` if using the "
                            "Trainable API.")
 
-    while not runner.is_finished():
-        runner.step()
-        if verbose:
-            _report_progress(runner, progress_reporter)
+    try:
+        while not runner.is_finished():
+            runner.step()
+            if verbose:
+                _report_progress(runner, progress_reporter)
+    finally:
+        # Don't lose the last periodic checkpoint if the loop is interrupted.
+        runner.flush_checkpoints()
 
     try:
         runner.checkpoint(force=True)
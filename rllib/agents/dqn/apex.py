@@ -5,6 +5,7 @@ import ray
 from ray.rllib.agents.dqn.dqn import DQNTrainer, \
     DEFAULT_CONFIG as DQN_CONFIG, calculate_rr_weights
 from ray.rllib.agents.dqn.learner_thread import LearnerThread
+from ray.rllib.env.atari_wrappers import get_num_stacked_frames
 from ray.rllib.execution.common import STEPS_TRAINED_COUNTER, \
     _get_shared_metrics, _get_global_vars
 from ray.rllib.evaluation.worker_set import WorkerSet
@@ -90,6 +91,9 @@ def apex_execution_plan(workers: WorkerSet, config: dict):
         config["prioritized_replay_eps"],
         config["multiagent"]["replay_mode"],
         config["replay_sequence_length"],
+        config.get("replay_storage", "list"),
+        config.get("replay_storage_dir"),
+        get_num_stacked_frames(config["model"]["framestack"]),
     ], num_replay_buffer_shards)
 
     # Start the learner thread.
@@ -2,6 +2,7 @@ import logging
 
 from ray.rllib.agents.trainer import with_common_config
 from ray.rllib.agents.trainer_template import build_trainer
+from ray.rllib.env.atari_wrappers import get_num_stacked_frames
 from ray.rllib.agents.dqn.dqn_tf_policy import DQNTFPolicy
 from ray.rllib.agents.dqn.simple_q_tf_policy import SimpleQTFPolicy
 from ray.rllib.policy.policy import LEARNER_STATS_KEY
@@ -83,6 +84,20 @@ DEFAULT_CONFIG = with_common_config({
     "prioritized_replay_eps": 1e-6,
     # Whether to LZ4 compress observations
     "compress_observations": False,
+    # How to store experiences in the replay buffer. "list" keeps each added
+    # SampleBatch as a separate object. "columnar" copies them into
+    # preallocated per-column arrays sized to `buffer_size`, which makes
+    # memory use predictable and sampling a single gather per column
+    # (requires replay_mode=independent and replay_sequence_length=1).
+    # "mmap" is like "columnar", but keeps the arrays in memory-mapped files
+    # under `replay_storage_dir`, so the buffer can exceed the available RAM.
+    # "frame_stack" is like "columnar", but stores each unique frame of
+    # stacked Atari observations (see wrap_deepmind and model.framestack)
+    # only once, cutting the memory used for `obs`/`new_obs` by up to ~8x.
+    "replay_storage": "list",
+    # Directory for the files of the "mmap" replay storage (e.g. on a local
+    # NVMe drive). None for the system's default temp directory.
+    "replay_storage_dir": None,
     # Callback to run before learning on a multi-agent batch of experiences.
     "before_learn_on_batch": None,
     # If set, this will fix the ratio of replayed from a buffer and learned on
@@ -251,6 +266,10 @@ def execution_plan(workers, config):
         replay_batch_size=config["train_batch_size"],
         replay_mode=config["multiagent"]["replay_mode"],
         replay_sequence_length=config["replay_sequence_length"],
+        replay_storage=config.get("replay_storage", "list"),
+        replay_storage_dir=config.get("replay_storage_dir"),
+        replay_num_frames=get_num_stacked_frames(
+            config["model"]["framestack"]),
         **prio_args)
 
     rollouts = ParallelRollouts(workers, mode="bulk_sync")
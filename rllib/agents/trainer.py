@@ -240,6 +240,15 @@ COMMON_CONFIG = {
     },
     # Whether to LZ4 compress individual observations
     "compress_observations": False,
+    # How remote rollout workers send their sample batches to the learner
+    # (if the execution plan uses ParallelRollouts in "bulk_sync" or "async"
+    # mode):
+    #  - "object_store": as Ray objects (default)
+    #  - "shared_memory": workers on the learner's node write batches into
+    #    shared memory (/dev/shm) and only send a descriptor, which saves the
+    #    (de)serialization. Works best with `compress_observations=False`,
+    #    since compressed batches are decompressed by the workers first.
+    "sample_transport": "object_store",
     # Wait for metric batches for at most this many seconds. Those that
     # have not returned in time will be collected in the next train iteration.
     "collect_metrics_timeout": 180,
@@ -310,6 +319,20 @@ COMMON_CONFIG = {
     #    {"sampler": 0.4, "/tmp/*.json": 0.4, "s3://bucket/expert.json": 0.2}).
     #  - a function that returns a rllib.offline.InputReader
     "input": "sampler",
+    # The format of the offline input files (if "input" is a path/glob or a
+    # list of files):
+    #  - "json": JSON lines files written by JsonWriter (default)
+    #  - "columnar": binary columnar files written by ColumnarWriter, which
+    #    are memory-mapped and much cheaper to decode
+    "input_format": "json",
+    # If positive, read offline input files (if "input" is a path/glob or a
+    # list of files) with this many background threads per rollout worker.
+    # The files are sharded deterministically across the remote rollout
+    # workers, and each worker's shard is split across its reader threads,
+    # which decode (and postprocess) batches ahead of time.
+    "input_num_readers": 0,
+    # Max number of batches the reader threads may read ahead of time.
+    "input_prefetch_batches": 16,
     # Specify how to evaluate the current policy. This only has an effect when
     # reading offline experiences. Available options:
     #  - "wis": the weighted step-wise importance sampling estimator.
@@ -332,6 +355,11 @@ COMMON_CONFIG = {
     #  - a path/URI to save to a custom output directory (e.g., "s3://bucket/")
     #  - a function that returns a rllib.offline.OutputWriter
     "output": None,
+    # The format to save experiences in: "json" (JSON lines, see JsonWriter)
+    # or "columnar" (binary columnar chunks, see ColumnarWriter). Note that
+    # "columnar" output can only be written to local paths and ignores
+    # `output_compress_columns`.
+    "output_format": "json",
     # What sample batch columns to LZ4 compress in the output data.
     "output_compress_columns": ["obs", "new_obs"],
     # Max output file size before rolling over to a new file.
@@ -267,6 +267,17 @@ class ScaledFloatFrame(gym.ObservationWrapper):
         return np.array(observation).astype(np.float32) / 255.0
 
 
+def get_num_stacked_frames(framestack):
+    """Returns the number of frames in each observation of wrap_deepmind.
+
+    Args:
+        framestack (Union[bool, int]): The `framestack` model config option.
+    """
+    if framestack is True:
+        return 4
+    return max(1, int(framestack or 1))
+
+
 def wrap_deepmind(env, dim=84, framestack=True):
     """Configure environment for DeepMind-style Atari.
 
@@ -274,7 +285,9 @@ def wrap_deepmind(env, dim=84, framestack=True):
 
     Args:
         dim (int): Dimension to resize observations to (dim x dim).
-        framestack (bool): Whether to framestack observations.
+        framestack (Union[bool, int]): Whether to framestack observations.
+            True stacks the last 4 frames, an int the last `framestack`
+            frames.
     """
     env = MonitorEnv(env)
     env = NoopResetEnv(env, noop_max=30)
@@ -286,6 +299,7 @@ def wrap_deepmind(env, dim=84, framestack=True):
     env = WarpFrame(env, dim)
     # env = ScaledFloatFrame(env)  # TODO: use for dqn?
     # env = ClipRewardEnv(env)  # reward clipping is handled by policy eval
-    if framestack:
-        env = FrameStack(env, 4)
+    num_frames = get_num_stacked_frames(framestack)
+    if num_frames > 1:
+        env = FrameStack(env, num_frames)
     return env
@@ -913,6 +913,8 @@ class RolloutWorker(ParallelIteratorWorker):
     @DeveloperAPI
     def stop(self) -> None:
         self.async_env.stop()
+        if isinstance(self.input_reader, InputReader):
+            self.input_reader.stop()
 
     @DeveloperAPI
     def creation_args(self) -> dict:
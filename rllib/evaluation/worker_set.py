@@ -7,7 +7,7 @@ from ray.rllib.utils.annotations import DeveloperAPI
 from ray.rllib.evaluation.rollout_worker import RolloutWorker, \
     _validate_multiagent_config
 from ray.rllib.offline import NoopOutput, JsonReader, MixedInput, JsonWriter, \
-    ShuffledInput
+    ShuffledInput, ColumnarReader, ColumnarWriter, ParallelInput
 from ray.rllib.env.env_context import EnvContext
 from ray.rllib.policy import Policy
 from ray.rllib.utils import merge_dicts
@@ -213,6 +213,20 @@ class WorkerSet:
             input_creator = (lambda ioctx: ShuffledInput(
                 MixedInput(config["input"], ioctx), config[
                     "shuffle_buffer_size"]))
+        elif config["input_num_readers"] > 0:
+            input_creator = (lambda ioctx: ShuffledInput(
+                ParallelInput(
+                    config["input"],
+                    ioctx,
+                    reader_cls=ColumnarReader
+                    if config["input_format"] == "columnar" else JsonReader,
+                    num_readers=config["input_num_readers"],
+                    prefetch_batches=config["input_prefetch_batches"]),
+                config["shuffle_buffer_size"]))
+        elif config["input_format"] == "columnar":
+            input_creator = (lambda ioctx: ShuffledInput(
+                ColumnarReader(config["input"], ioctx), config[
+                    "shuffle_buffer_size"]))
         else:
             input_creator = (lambda ioctx: ShuffledInput(
                 JsonReader(config["input"], ioctx), config[
@@ -222,6 +236,12 @@ class WorkerSet:
             output_creator = config["output"]
         elif config["output"] is None:
             output_creator = (lambda ioctx: NoopOutput())
+        elif config["output_format"] == "columnar":
+            output_creator = (lambda ioctx: ColumnarWriter(
+                ioctx.log_dir
+                if config["output"] == "logdir" else config["output"],
+                ioctx,
+                max_file_size=config["output_max_file_size"]))
         elif config["output"] == "logdir":
             output_creator = (lambda ioctx: JsonWriter(
                 ioctx.log_dir,
@@ -1,9 +1,14 @@
 import collections
 import logging
 import numpy as np
+import os
+import pickle
 import platform
-import random
+import shutil
+import tempfile
 from typing import List
+from urllib.parse import quote
+import weakref
 
 import ray
 from ray.rllib.execution.segment_tree import SumSegmentTree, MinSegmentTree
@@ -21,16 +26,415 @@ _ALL_POLICIES = "__all__"
 logger = logging.getLogger(__name__)
 
 
+@DeveloperAPI
+class ColumnarStorage:
+    """Preallocated ring storage that keeps one NumPy array per batch column.
+
+    Every stored item must be a SampleBatch holding exactly one timestep.
+    The column arrays are allocated on the first write (once dtypes and
+    shapes are known) with room for `capacity` rows. Writes then happen in
+    place and sampling is a single fancy-indexed gather per column, instead
+    of concatenating one SampleBatch object per sampled index.
+
+    Supports the subset of the list protocol used by ReplayBuffer
+    (`append`, `__setitem__`, `__getitem__` and `__len__`).
+    """
+
+    def __init__(self, capacity: int):
+        """Initializes a ColumnarStorage object.
+
+        Args:
+            capacity (int): Max number of rows (timesteps) to store.
+        """
+        self._capacity = capacity
+        self._columns = None
+        self._num_items = 0
+
+    def __len__(self):
+        return self._num_items
+
+    def append(self, item: SampleBatch):
+        if self._num_items >= self._capacity:
+            raise IndexError("ColumnarStorage is full (capacity={})".format(
+                self._capacity))
+        self._write(self._num_items, item)
+        self._num_items += 1
+
+    def __setitem__(self, idx: int, item: SampleBatch):
+        assert 0 <= idx < self._num_items, idx
+        self._write(idx, item)
+
+    def __getitem__(self, idx: int) -> SampleBatch:
+        assert 0 <= idx < self._num_items, idx
+        return self.gather([idx])
+
+    def gather(self, idxes: List[int]) -> SampleBatch:
+        """Returns a new SampleBatch holding the rows at the given indices.
+
+        Args:
+            idxes (List[int]): The row indices to gather.
+
+        Returns:
+            SampleBatch: A batch with one row per entry in `idxes`.
+        """
+        idxes = np.asarray(idxes)
+        return SampleBatch(
+            {k: np.asarray(col[idxes])
+             for k, col in self._columns.items()})
+
+    def size_bytes(self) -> int:
+        """Returns the number of bytes allocated for all column arrays."""
+        if self._columns is None:
+            return 0
+        return sum(col.nbytes for col in self._columns.values())
+
+    def save(self, checkpoint_dir: str):
+        """Writes the stored rows to one .npy file per column.
+
+        Args:
+            checkpoint_dir (str): The directory to write the files to.
+        """
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        layout = []
+        for i, (k, col) in enumerate((self._columns or {}).items()):
+            filename = "column_{}.npy".format(i)
+            np.save(
+                os.path.join(checkpoint_dir, filename), col[:self._num_items])
+            layout.append((k, filename, col.shape[1:], col.dtype))
+        with open(os.path.join(checkpoint_dir, "layout.pkl"), "wb") as f:
+            pickle.dump((self._num_items, layout), f)
+
+    def restore(self, checkpoint_dir: str):
+        """Restores the rows written by `save()`, replacing all current rows.
+
+        Args:
+            checkpoint_dir (str): The directory `save()` wrote to.
+        """
+        with open(os.path.join(checkpoint_dir, "layout.pkl"), "rb") as f:
+            num_items, layout = pickle.load(f)
+        if num_items > self._capacity:
+            raise ValueError(
+                "Can't restore {} rows into a storage of capacity {}".format(
+                    num_items, self._capacity))
+        self._num_items = num_items
+        self._columns = None if not layout else {}
+        for k, filename, shape, dtype in layout:
+            self._columns[k] = self._new_column(k, shape, dtype)
+            # Memory-map the saved rows (if possible) so they are streamed
+            # into the column rather than loaded into memory all at once.
+            saved = np.load(
+                os.path.join(checkpoint_dir, filename),
+                mmap_mode=None if dtype == object else "r",
+                allow_pickle=dtype == object)
+            self._columns[k][:num_items] = saved
+
+    def _allocate(self, item: SampleBatch):
+        self._columns = {}
+        for k, v in item.items():
+            # Variable-length and python object columns (e.g. infos) can't
+            # be stored in fixed-width rows.
+            dtype = v.dtype if v.dtype.kind in "biufc" else np.dtype(object)
+            self._columns[k] = self._new_column(k, v.shape[1:], dtype)
+
+    def _new_column(self, key: str, shape: tuple, dtype) -> np.ndarray:
+        return np.empty((self._capacity, ) + shape, dtype=dtype)
+
+    def _prepare(self, item: SampleBatch):
+        if not isinstance(item, SampleBatch) or item.count != 1:
+            raise ValueError("ColumnarStorage can only store single-timestep "
+                             "SampleBatches, got {}".format(item))
+        item.decompress_if_needed()
+        if self._columns is None:
+            self._allocate(item)
+        elif item.keys() != self._columns.keys():
+            raise ValueError(
+                "All items added to ColumnarStorage must have the same "
+                "columns! {} vs {}".format(
+                    list(item.keys()), list(self._columns.keys())))
+
+    def _write(self, idx: int, item: SampleBatch):
+        self._prepare(item)
+        for k, col in self._columns.items():
+            col[idx] = item[k][0]
+
+
+@DeveloperAPI
+class MemoryMappedStorage(ColumnarStorage):
+    """ColumnarStorage whose column arrays live in memory-mapped files.
+
+    The files are created (sparse) in a fresh subdirectory of `directory`,
+    so the buffer may exceed the available RAM: the OS only pages in the
+    rows that are actually written or sampled. Python object columns (e.g.
+    infos) can't be memory-mapped and are kept in memory. The subdirectory
+    is deleted once the storage is garbage collected.
+    """
+
+    def __init__(self, capacity: int, directory: str = None):
+        """Initializes a MemoryMappedStorage object.
+
+        Args:
+            capacity (int): Max number of rows (timesteps) to store.
+            directory (Optional[str]): The directory to create the column
+                files in. Use None for the system's default temp directory.
+        """
+        super().__init__(capacity)
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = tempfile.mkdtemp(prefix="replay_", dir=directory)
+        weakref.finalize(self, shutil.rmtree, self.directory, True)
+
+    def _new_column(self, key: str, shape: tuple, dtype) -> np.ndarray:
+        if dtype == object:
+            return super()._new_column(key, shape, dtype)
+        path = os.path.join(self.directory, "{}.npy".format(
+            quote(key, safe="")))
+        return np.lib.format.open_memmap(
+            path, mode="w+", dtype=dtype, shape=(self._capacity, ) + shape)
+
+
+@DeveloperAPI
+class FrameStackStorage(ColumnarStorage):
+    """ColumnarStorage that stores each unique frame of stacked obs once.
+
+    Atari observations (see `FrameStack` in rllib/env/atari_wrappers.py) are
+    stacks of the last `num_frames` frames, concatenated along the last axis.
+    Consecutive `obs`/`new_obs` stacks share all but one frame, so storing
+    them as is duplicates each frame up to 2 * `num_frames` times.
+
+    Instead, this storage keeps every distinct frame once in a refcounted
+    frame pool and stores `num_frames` frame ids per `obs`/`new_obs` row.
+    Frames are deduplicated by content (hash plus equality check), so the
+    stacks rebuilt at sample time are identical to the ones added. Frames
+    are freed as soon as the last row referencing them is overwritten.
+    """
+
+    FRAME_COLUMNS = (SampleBatch.CUR_OBS, SampleBatch.NEXT_OBS)
+
+    def __init__(self, capacity: int, num_frames: int = 4):
+        """Initializes a FrameStackStorage object.
+
+        Args:
+            capacity (int): Max number of rows (timesteps) to store.
+            num_frames (int): The number of frames stacked into each
+                observation.
+        """
+        super().__init__(capacity)
+        self._num_frames = num_frames
+        self._frames = None
+        # Refcount and content hash per frame id.
+        self._frame_refs = None
+        self._frame_hashes = None
+        # Stack of unused frame ids.
+        self._free_frame_ids = []
+        # Maps content hash to frame id (for deduplication).
+        self._frame_index = {}
+        # The `new_obs` frames and frame ids of the last written row. The
+        # next row's `obs` is usually the same stack and can reuse the ids
+        # without hashing its frames.
+        self._last_stack = None
+        self._last_stack_ids = None
+
+    def gather(self, idxes: List[int]) -> SampleBatch:
+        batch = super().gather(idxes)
+        for k in self.FRAME_COLUMNS:
+            if k in batch:
+                batch[k] = self._join_frames(self._frames[batch[k]])
+        return batch
+
+    def size_bytes(self) -> int:
+        if self._frames is None:
+            return 0
+        return super().size_bytes() + self._frames.nbytes + \
+            self._frame_refs.nbytes + self._frame_hashes.nbytes
+
+    def save(self, checkpoint_dir: str):
+        super().save(checkpoint_dir)
+        if self._frames is None:
+            return
+        # Only save the pool up to the highest frame id in use.
+        num_frames = int(np.max(np.nonzero(self._frame_refs)[0],
+                                initial=-1)) + 1
+        np.save(
+            os.path.join(checkpoint_dir, "frames.npy"),
+            self._frames[:num_frames])
+        np.save(
+            os.path.join(checkpoint_dir, "frame_refs.npy"),
+            self._frame_refs[:num_frames])
+
+    def restore(self, checkpoint_dir: str):
+        super().restore(checkpoint_dir)
+        self._frame_index = {}
+        self._last_stack = self._last_stack_ids = None
+        if self._columns is None:
+            self._frames = None
+            return
+        frames = np.load(
+            os.path.join(checkpoint_dir, "frames.npy"), mmap_mode="r")
+        refs = np.load(os.path.join(checkpoint_dir, "frame_refs.npy"))
+        self._allocate_frames(frames.shape[1:], frames.dtype)
+        while len(self._frames) < len(frames):
+            self._grow_frames()
+        self._frames[:len(frames)] = frames
+        self._frame_refs[:len(refs)] = refs
+        self._free_frame_ids = []
+        for frame_id in reversed(range(len(self._frames))):
+            if self._frame_refs[frame_id] > 0:
+                key = hash(self._frames[frame_id].tobytes())
+                self._frame_hashes[frame_id] = key
+                self._frame_index[key] = frame_id
+            else:
+                self._free_frame_ids.append(frame_id)
+
+    def _allocate(self, item: SampleBatch):
+        super()._allocate(item)
+        for k in self.FRAME_COLUMNS:
+            if k in item:
+                stack = item[k][0]
+                if stack.shape[-1] % self._num_frames != 0:
+                    raise ValueError(
+                        "Can't split `{}` of shape {} into {} frames.".format(
+                            k, stack.shape, self._num_frames))
+                self._columns[k] = self._new_column(k, (self._num_frames, ),
+                                                    np.int64)
+                frame_shape = self._split_frames(stack).shape[1:]
+                self._allocate_frames(frame_shape, stack.dtype)
+
+    def _allocate_frames(self, frame_shape: tuple, dtype):
+        # Enough for rows of (mostly) distinct stacks; grown on demand. Large
+        # pools stay cheap as long as untouched pages are never accessed.
+        size = 2 * (self._capacity + self._num_frames)
+        self._frames = np.empty((size, ) + frame_shape, dtype=dtype)
+        self._frame_refs = np.zeros(size, dtype=np.int64)
+        self._frame_hashes = np.zeros(size, dtype=np.int64)
+        self._free_frame_ids = list(reversed(range(size)))
+
+    def _grow_frames(self):
+        size = len(self._frames)
+        self._frames = np.concatenate(
+            [self._frames, np.empty_like(self._frames)])
+        self._frame_refs = np.concatenate(
+            [self._frame_refs,
+             np.zeros_like(self._frame_refs)])
+        self._frame_hashes = np.concatenate(
+            [self._frame_hashes,
+             np.zeros_like(self._frame_hashes)])
+        self._free_frame_ids = \
+            list(reversed(range(size, 2 * size))) + self._free_frame_ids
+
+    def _write(self, idx: int, item: SampleBatch):
+        self._prepare(item)
+        # Release the overwritten row's frames only after adding the new
+        # ones, so frames shared by both aren't freed in between.
+        old_ids = self._frame_ids(idx) if idx < self._num_items else None
+        for k, col in self._columns.items():
+            if k not in self.FRAME_COLUMNS:
+                col[idx] = item[k][0]
+
+        obs_ids = None
+        if SampleBatch.CUR_OBS in item:
+            obs_frames = self._split_frames(item[SampleBatch.CUR_OBS][0])
+            if self._last_stack is not None and \
+                    np.array_equal(obs_frames, self._last_stack):
+                obs_ids = self._last_stack_ids
+                np.add.at(self._frame_refs, obs_ids, 1)
+            else:
+                obs_ids = self._add_frames(obs_frames)
+            self._columns[SampleBatch.CUR_OBS][idx] = obs_ids
+
+        if SampleBatch.NEXT_OBS in item:
+            new_obs_frames = self._split_frames(item[SampleBatch.NEXT_OBS][0])
+            # With 1-step transitions, `new_obs` is `obs` shifted by one
+            # frame.
+            if obs_ids is not None and np.array_equal(new_obs_frames[:-1],
+                                                      obs_frames[1:]):
+                np.add.at(self._frame_refs, obs_ids[1:], 1)
+                new_obs_ids = np.append(obs_ids[1:],
+                                        self._add_frames(new_obs_frames[-1:]))
+            else:
+                new_obs_ids = self._add_frames(new_obs_frames)
+            self._columns[SampleBatch.NEXT_OBS][idx] = new_obs_ids
+            self._last_stack = new_obs_frames
+            self._last_stack_ids = new_obs_ids
+
+        if old_ids is not None:
+            self._release_frames(old_ids)
+
+    def _add_frames(self, frames: np.ndarray) -> np.ndarray:
+        ids = np.empty(len(frames), dtype=np.int64)
+        for i, frame in enumerate(frames):
+            key = hash(frame.tobytes())
+            frame_id = self._frame_index.get(key)
+            if frame_id is None or not np.array_equal(self._frames[frame_id],
+                                                      frame):
+                if not self._free_frame_ids:
+                    self._grow_frames()
+                frame_id = self._free_frame_ids.pop()
+                self._frames[frame_id] = frame
+                self._frame_hashes[frame_id] = key
+                self._frame_index[key] = frame_id
+            self._frame_refs[frame_id] += 1
+            ids[i] = frame_id
+        return ids
+
+    def _frame_ids(self, idx: int) -> np.ndarray:
+        return np.concatenate([
+            self._columns[k][idx] for k in self.FRAME_COLUMNS
+            if k in self._columns
+        ])
+
+    def _release_frames(self, ids: np.ndarray):
+        np.subtract.at(self._frame_refs, ids, 1)
+        for frame_id in np.unique(ids[self._frame_refs[ids] == 0]).tolist():
+            key = int(self._frame_hashes[frame_id])
+            if self._frame_index.get(key) == frame_id:
+                del self._frame_index[key]
+            self._free_frame_ids.append(frame_id)
+
+    def _split_frames(self, stack: np.ndarray) -> np.ndarray:
+        # [..., num_frames * c] -> [num_frames, ..., c]
+        frames = stack.reshape(stack.shape[:-1] + (self._num_frames, -1))
+        return np.ascontiguousarray(np.moveaxis(frames, -2, 0))
+
+    def _join_frames(self, frames: np.ndarray) -> np.ndarray:
+        # [B, num_frames, ..., c] -> [B, ..., num_frames * c]
+        frames = np.moveaxis(frames, 1, -2)
+        return frames.reshape(frames.shape[:-2] + (-1, ))
+
+
 @DeveloperAPI
 class ReplayBuffer:
     @DeveloperAPI
-    def __init__(self, size: int):
+    def __init__(self,
+                 size: int,
+                 storage: str = "list",
+                 storage_dir: str = None,
+                 num_frames: int = 4):
         """Create Prioritized Replay buffer.
 
         Args:
             size (int): Max number of items to store in the FIFO buffer.
+            storage (str): Either "list" (store each added item as is),
+                "columnar" (copy single-timestep items into preallocated
+                per-column arrays, see ColumnarStorage) or "mmap" (like
+                "columnar", but with the arrays memory-mapped to files under
+                `storage_dir`, see MemoryMappedStorage) or "frame_stack" (like
+                "columnar", but storing each unique frame of stacked
+                `obs`/`new_obs` only once, see FrameStackStorage).
+            storage_dir (Optional[str]): The directory to place the files of
+                the "mmap" storage in. None for the default temp directory.
+            num_frames (int): The number of frames stacked into each
+                observation for the "frame_stack" storage.
         """
-        self._storage = []
+        if storage == "list":
+            self._storage = []
+        elif storage == "columnar":
+            self._storage = ColumnarStorage(size)
+        elif storage == "mmap":
+            self._storage = MemoryMappedStorage(size, storage_dir)
+        elif storage == "frame_stack":
+            self._storage = FrameStackStorage(size, num_frames)
+        else:
+            raise ValueError("Unsupported replay storage: {}".format(storage))
         self._maxsize = size
         self._next_idx = 0
         self._hit_count = np.zeros(size)
@@ -61,6 +465,8 @@ class ReplayBuffer:
             self._hit_count[self._next_idx] = 0
 
     def _encode_sample(self, idxes: List[int]) -> SampleBatchType:
+        if isinstance(self._storage, ColumnarStorage):
+            return self._storage.gather(idxes)
         out = SampleBatch.concat_samples([self._storage[i] for i in idxes])
         out.decompress_if_needed()
         return out
@@ -75,41 +481,108 @@ class ReplayBuffer:
         Returns:
             SampleBatchType: concatenated batch of items.
         """
-        idxes = [
-            random.randint(0,
-                           len(self._storage) - 1) for _ in range(num_items)
-        ]
+        idxes = np.random.randint(0, len(self._storage), size=num_items)
         self._num_sampled += num_items
         return self._encode_sample(idxes)
 
     @DeveloperAPI
     def stats(self, debug=False):
+        if isinstance(self._storage, ColumnarStorage):
+            est_size_bytes = self._storage.size_bytes()
+        else:
+            est_size_bytes = self._est_size_bytes
         data = {
             "added_count": self._num_added,
             "sampled_count": self._num_sampled,
-            "est_size_bytes": self._est_size_bytes,
+            "est_size_bytes": est_size_bytes,
             "num_entries": len(self._storage),
         }
         if debug:
             data.update(self._evicted_hit_stats.stats())
         return data
 
+    @DeveloperAPI
+    def save(self, checkpoint_dir: str):
+        """Writes the contents and state of this buffer to `checkpoint_dir`.
+
+        Columnar storages are snapshotted as one .npy file per column.
+        List storage is pickled.
+
+        Args:
+            checkpoint_dir (str): The directory to write to.
+        """
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        if isinstance(self._storage, ColumnarStorage):
+            self._storage.save(os.path.join(checkpoint_dir, "storage"))
+        else:
+            with open(os.path.join(checkpoint_dir, "storage.pkl"), "wb") as f:
+                pickle.dump(self._storage, f)
+        with open(os.path.join(checkpoint_dir, "state.pkl"), "wb") as f:
+            pickle.dump(self._get_state(), f)
+
+    @DeveloperAPI
+    def restore(self, checkpoint_dir: str):
+        """Restores the contents and state written by `save()`.
+
+        Args:
+            checkpoint_dir (str): The directory `save()` wrote to.
+        """
+        if isinstance(self._storage, ColumnarStorage):
+            self._storage.restore(os.path.join(checkpoint_dir, "storage"))
+        else:
+            with open(os.path.join(checkpoint_dir, "storage.pkl"), "rb") as f:
+                self._storage = pickle.load(f)
+        with open(os.path.join(checkpoint_dir, "state.pkl"), "rb") as f:
+            self._set_state(pickle.load(f))
+
+    def _get_state(self) -> dict:
+        return {
+            "next_idx": self._next_idx,
+            "hit_count": self._hit_count,
+            "eviction_started": self._eviction_started,
+            "num_added": self._num_added,
+            "num_sampled": self._num_sampled,
+            "est_size_bytes": self._est_size_bytes,
+        }
+
+    def _set_state(self, state: dict):
+        self._next_idx = state["next_idx"]
+        self._hit_count = state["hit_count"]
+        self._eviction_started = state["eviction_started"]
+        self._num_added = state["num_added"]
+        self._num_sampled = state["num_sampled"]
+        self._est_size_bytes = state["est_size_bytes"]
+
 
 @DeveloperAPI
 class PrioritizedReplayBuffer(ReplayBuffer):
     @DeveloperAPI
-    def __init__(self, size: int, alpha: float):
+    def __init__(self,
+                 size: int,
+                 alpha: float,
+                 storage: str = "list",
+                 storage_dir: str = None,
+                 num_frames: int = 4):
         """Create Prioritized Replay buffer.
 
         Args:
             size (int): Max number of items to store in the FIFO buffer.
             alpha (float): how much prioritization is used
                 (0 - no prioritization, 1 - full prioritization).
+            storage (str): The storage type to use ("list", "columnar",
+                "mmap" or "frame_stack").
+            storage_dir (Optional[str]): The directory for "mmap" storage.
+            num_frames (int): The number of frames stacked into each
+                observation for "frame_stack" storage.
 
         See also:
             ReplayBuffer.__init__()
         """
-        super(PrioritizedReplayBuffer, self).__init__(size)
+        super(PrioritizedReplayBuffer, self).__init__(
+            size,
+            storage=storage,
+            storage_dir=storage_dir,
+            num_frames=num_frames)
         assert alpha > 0
         self._alpha = alpha
 
@@ -132,13 +605,10 @@ class PrioritizedReplayBuffer(ReplayBuffer):
         self._it_min[idx] = weight**self._alpha
 
     def _sample_proportional(self, num_items: int):
-        res = []
-        for _ in range(num_items):
-            # TODO(szymon): should we ensure no repeats?
-            mass = random.random() * self._it_sum.sum(0, len(self._storage))
-            idx = self._it_sum.find_prefixsum_idx(mass)
-            res.append(idx)
-        return res
+        # TODO(szymon): should we ensure no repeats?
+        mass = np.random.random(num_items) * self._it_sum.sum(
+            0, len(self._storage))
+        return self._it_sum.find_prefixsum_idxes(mass)
 
     @DeveloperAPI
     def sample(self, num_items: int, beta: float) -> SampleBatchType:
@@ -159,25 +629,25 @@ class PrioritizedReplayBuffer(ReplayBuffer):
 
         idxes = self._sample_proportional(num_items)
 
-        weights = []
-        batch_indexes = []
         p_min = self._it_min.min() / self._it_sum.sum()
         max_weight = (p_min * len(self._storage))**(-beta)
 
-        for idx in idxes:
-            p_sample = self._it_sum[idx] / self._it_sum.sum()
-            weight = (p_sample * len(self._storage))**(-beta)
-            count = self._storage[idx].count
-            weights.extend([weight / max_weight] * count)
-            batch_indexes.extend([idx] * count)
+        p_sample = self._it_sum.get_items(idxes) / self._it_sum.sum()
+        weights = (p_sample * len(self._storage))**(-beta) / max_weight
+        batch_indexes = idxes
+        # Columnar storage holds exactly one timestep per item.
+        if not isinstance(self._storage, ColumnarStorage):
+            counts = [self._storage[idx].count for idx in idxes.tolist()]
+            weights = np.repeat(weights, counts)
+            batch_indexes = np.repeat(batch_indexes, counts)
         batch = self._encode_sample(idxes)
 
         # Note: prioritization is not supported in lockstep replay mode.
         if isinstance(batch, SampleBatch):
             assert len(weights) == batch.count
             assert len(batch_indexes) == batch.count
-            batch["weights"] = np.array(weights)
-            batch["batch_indexes"] = np.array(batch_indexes)
+            batch["weights"] = weights
+            batch["batch_indexes"] = batch_indexes
 
         return batch
 
@@ -197,16 +667,20 @@ class PrioritizedReplayBuffer(ReplayBuffer):
           transitions at the sampled idxes denoted by
           variable `idxes`.
         """
+        idxes = np.asarray(idxes)
+        priorities = np.asarray(priorities, dtype=np.float64)
         assert len(idxes) == len(priorities)
-        for idx, priority in zip(idxes, priorities):
-            assert priority > 0
-            assert 0 <= idx < len(self._storage)
-            delta = priority**self._alpha - self._it_sum[idx]
+        if len(idxes) == 0:
+            return
+        assert np.all(priorities > 0)
+        assert 0 <= idxes.min() and idxes.max() < len(self._storage)
+        new_priorities = priorities**self._alpha
+        for delta in (new_priorities - self._it_sum.get_items(idxes)):
             self._prio_change_stats.push(delta)
-            self._it_sum[idx] = priority**self._alpha
-            self._it_min[idx] = priority**self._alpha
+        self._it_sum.set_items(idxes, new_priorities)
+        self._it_min.set_items(idxes, new_priorities)
 
-            self._max_priority = max(self._max_priority, priority)
+        self._max_priority = max(self._max_priority, priorities.max())
 
     @DeveloperAPI
     def stats(self, debug=False):
@@ -215,6 +689,22 @@ class PrioritizedReplayBuffer(ReplayBuffer):
             parent.update(self._prio_change_stats.stats())
         return parent
 
+    def _get_state(self) -> dict:
+        state = super()._get_state()
+        state.update({
+            "it_sum": self._it_sum.value,
+            "it_min": self._it_min.value,
+            "max_priority": self._max_priority,
+        })
+        return state
+
+    def _set_state(self, state: dict):
+        super()._set_state(state)
+        # Copy in place: the trees keep views of their value arrays.
+        self._it_sum.value[:] = state["it_sum"]
+        self._it_min.value[:] = state["it_min"]
+        self._max_priority = state["max_priority"]
+
 
 # Visible for testing.
 _local_replay_buffer = None
@@ -235,7 +725,10 @@ class LocalReplayBuffer(ParallelIteratorWorker):
                  prioritized_replay_beta=0.4,
                  prioritized_replay_eps=1e-6,
                  replay_mode="independent",
-                 replay_sequence_length=1):
+                 replay_sequence_length=1,
+                 replay_storage="list",
+                 replay_storage_dir=None,
+                 replay_num_frames=4):
         self.replay_starts = learning_starts // num_shards
         self.buffer_size = buffer_size // num_shards
         self.replay_batch_size = replay_batch_size
@@ -256,6 +749,12 @@ class LocalReplayBuffer(ParallelIteratorWorker):
         if replay_mode not in ["lockstep", "independent"]:
             raise ValueError("Unsupported replay mode: {}".format(replay_mode))
 
+        if replay_storage != "list" and (replay_mode == "lockstep"
+                                         or replay_sequence_length > 1):
+            raise ValueError(
+                "replay_storage={} requires replay_mode=independent and "
+                "replay_sequence_length=1.".format(replay_storage))
+
         def gen_replay():
             while True:
                 yield self.replay()
@@ -264,7 +763,11 @@ class LocalReplayBuffer(ParallelIteratorWorker):
 
         def new_buffer():
             return PrioritizedReplayBuffer(
-                self.buffer_size, alpha=prioritized_replay_alpha)
+                self.buffer_size,
+                alpha=prioritized_replay_alpha,
+                storage=replay_storage,
+                storage_dir=replay_storage_dir,
+                num_frames=replay_num_frames)
 
         self.replay_buffers = collections.defaultdict(new_buffer)
 
@@ -339,6 +842,35 @@ class LocalReplayBuffer(ParallelIteratorWorker):
                 self.replay_buffers[policy_id].update_priorities(
                     batch_indexes, new_priorities)
 
+    def save(self, checkpoint_dir):
+        """Snapshots all replay buffers of this shard into `checkpoint_dir`.
+
+        Args:
+            checkpoint_dir (str): The directory to write to.
+        """
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        for policy_id, replay_buffer in self.replay_buffers.items():
+            replay_buffer.save(
+                os.path.join(checkpoint_dir, quote(str(policy_id), safe="")))
+        with open(os.path.join(checkpoint_dir, "shard.pkl"), "wb") as f:
+            pickle.dump({
+                "num_added": self.num_added,
+                "policy_ids": list(self.replay_buffers.keys()),
+            }, f)
+
+    def restore(self, checkpoint_dir):
+        """Restores all replay buffers of this shard from `checkpoint_dir`.
+
+        Args:
+            checkpoint_dir (str): The directory `save()` wrote to.
+        """
+        with open(os.path.join(checkpoint_dir, "shard.pkl"), "rb") as f:
+            state = pickle.load(f)
+        self.num_added = state["num_added"]
+        for policy_id in state["policy_ids"]:
+            self.replay_buffers[policy_id].restore(
+                os.path.join(checkpoint_dir, quote(str(policy_id), safe="")))
+
     def stats(self, debug=False):
         stat = {
             "add_batch_time_ms": round(1000 * self.add_batch_timer.mean, 3),
@@ -1,4 +1,5 @@
 import logging
+import platform
 from typing import List, Tuple
 import time
 
@@ -10,6 +11,8 @@ from ray.rllib.evaluation.worker_set import WorkerSet
 from ray.rllib.execution.common import STEPS_SAMPLED_COUNTER, LEARNER_INFO, \
     SAMPLE_TIMER, GRAD_WAIT_TIMER, _check_sample_batch_type, \
     _get_shared_metrics
+from ray.rllib.execution.shared_memory import from_shared_memory, \
+    to_shared_memory
 from ray.rllib.policy.sample_batch import SampleBatch, DEFAULT_POLICY_ID, \
     MultiAgentBatch
 from ray.rllib.utils.sgd import standardized
@@ -18,8 +21,11 @@ from ray.rllib.utils.types import PolicyID, SampleBatchType, ModelGradients
 logger = logging.getLogger(__name__)
 
 
-def ParallelRollouts(workers: WorkerSet, *, mode="bulk_sync",
-                     num_async=1) -> LocalIterator[SampleBatch]:
+def ParallelRollouts(workers: WorkerSet,
+                     *,
+                     mode="bulk_sync",
+                     num_async=1,
+                     transport=None) -> LocalIterator[SampleBatch]:
     """Operator to collect experiences in parallel from rollout workers.
 
     If there are no remote workers, experiences will be collected serially from
@@ -37,6 +43,16 @@ def ParallelRollouts(workers: WorkerSet, *, mode="bulk_sync",
               updating the timesteps counter.
         num_async (int): In async mode, the max number of async
             requests in flight per actor.
+        transport (str): How remote workers send batches to the learner in
+            'async' and 'bulk_sync' mode, one of {'object_store',
+            'shared_memory'}.
+            - In 'object_store' mode, batches are sent as Ray objects.
+            - In 'shared_memory' mode, workers on the learner's node write
+              their batches into shared memory files (see
+              SharedMemoryBatch), which the learner maps without
+              unpickling. Batches of other workers use the object store.
+            If None, the "sample_transport" setting of the workers' config
+            is used.
 
     Returns:
         A local iterator over experiences collected in parallel.
@@ -75,14 +91,27 @@ def ParallelRollouts(workers: WorkerSet, *, mode="bulk_sync",
     # Create a parallel iterator over generated experiences.
     rollouts = from_actors(workers.remote_workers())
 
+    if transport is None:
+        transport = workers.local_worker().policy_config.get(
+            "sample_transport", "object_store")
+    if transport == "shared_memory" and mode != "raw":
+        learner_host = platform.node()
+        rollouts = rollouts.for_each(
+            lambda batch: to_shared_memory(batch, learner_host))
+    elif transport not in ["object_store", "shared_memory"]:
+        raise ValueError("transport must be one of 'object_store', "
+                         "'shared_memory', got '{}'".format(transport))
+
     if mode == "bulk_sync":
         return rollouts \
             .batch_across_shards() \
-            .for_each(lambda batches: SampleBatch.concat_samples(batches)) \
+            .for_each(lambda batches: SampleBatch.concat_samples(
+                [from_shared_memory(b) for b in batches])) \
             .for_each(report_timesteps)
     elif mode == "async":
-        return rollouts.gather_async(
-            num_async=num_async).for_each(report_timesteps)
+        return rollouts.gather_async(num_async=num_async) \
+            .for_each(from_shared_memory) \
+            .for_each(report_timesteps)
     elif mode == "raw":
         return rollouts
     else:
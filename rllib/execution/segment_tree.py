@@ -1,5 +1,14 @@
+import numpy as np
 import operator
 
+# NumPy ufuncs equivalent to the supported python reduction operations. These
+# are used by the batched (vectorized) tree operations.
+_NUMPY_OPERATIONS = {
+    operator.add: np.add,
+    min: np.minimum,
+    max: np.maximum,
+}
+
 
 class SegmentTree:
     """A Segment Tree data structure.
@@ -14,7 +23,7 @@ class SegmentTree:
          over some specified contiguous subsequence of items in the array.
          Operation could be e.g. min/max/sum.
 
-    The data is stored in a list, where the length is 2 * capacity.
+    The data is stored in a NumPy array, where the length is 2 * capacity.
     The second half of the list stores the actual values for each index, so if
     capacity=8, values are stored at indices 8 to 15. The first half of the
     array contains the reduced-values of the different (binary divided)
@@ -26,6 +35,10 @@ class SegmentTree:
     4-7: values of the tree.
     NOTE that the values of the tree are accessed by indices starting at 0, so
     `tree[0]` accesses `internal_array[4]` in the above example.
+
+    Besides the single-item operations, `set_items` and `get_items` update and
+    read many indices at once. These traverse the tree level by level with
+    NumPy array operations instead of walking it once per index in python.
     """
 
     def __init__(self, capacity, operation, neutral_element=None):
@@ -49,8 +62,13 @@ class SegmentTree:
             neutral_element = 0.0 if operation is operator.add else \
                 float("-inf") if operation is max else float("inf")
         self.neutral_element = neutral_element
-        self.value = [self.neutral_element for _ in range(2 * capacity)]
+        self.value = np.full(2 * capacity, neutral_element, dtype=np.float64)
         self.operation = operation
+        self.np_operation = _NUMPY_OPERATIONS.get(operation)
+        # Single-item operations go through a memoryview of `self.value`,
+        # which (unlike indexing the NumPy array) reads and writes python
+        # floats and is therefore much faster for scalar access.
+        self._value = memoryview(self.value)
 
     def reduce(self, start=0, end=None):
         """Applies `self.operation` to subsequence of our values.
@@ -103,7 +121,7 @@ class SegmentTree:
             # If start is odd: Add its value to result and move start to
             # next even value.
             if start & 1:
-                result = self.operation(result, self.value[start])
+                result = self.operation(result, self._value[start])
                 start += 1
 
             # If end is odd: Move end to previous even value, then add its
@@ -111,7 +129,7 @@ class SegmentTree:
             # situation.
             if end & 1:
                 end -= 1
-                result = self.operation(result, self.value[end])
+                result = self.operation(result, self._value[end])
 
             # Divide both start and end by 2 to make them "jump" into the
             # next upper level reduce-index space.
@@ -136,20 +154,99 @@ class SegmentTree:
         # of the tree, the first half is reserved for already calculated
         # reduction-values).
         idx += self.capacity
-        self.value[idx] = val
+        value, operation = self._value, self.operation
+        value[idx] = val
+        val = value[idx]
 
         # Recalculate all affected reduction values (in "first half" of tree).
-        idx = idx >> 1  # Divide by 2 (faster than division).
-        while idx >= 1:
-            update_idx = 2 * idx  # calculate only once
-            # Update the reduction value at the correct "first half" idx.
-            self.value[idx] = self.operation(self.value[update_idx],
-                                             self.value[update_idx + 1])
-            idx = idx >> 1  # Divide by 2 (faster than division).
+        # The new reduction value of a node is carried up the tree, so only
+        # its sibling has to be read on every level.
+        if operation is operator.add:
+            while idx > 1:
+                val += value[idx ^ 1]
+                idx = idx >> 1  # Divide by 2 (faster than division).
+                value[idx] = val
+        elif operation is min:
+            while idx > 1:
+                sibling = value[idx ^ 1]
+                if sibling < val:
+                    val = sibling
+                idx = idx >> 1
+                value[idx] = val
+        else:
+            idx = idx >> 1
+            while idx >= 1:
+                update_idx = 2 * idx  # calculate only once
+                # Update the reduction value at the correct "first half" idx.
+                value[idx] = operation(value[update_idx],
+                                       value[update_idx + 1])
+                idx = idx >> 1
 
     def __getitem__(self, idx):
         assert 0 <= idx < self.capacity
-        return self.value[idx + self.capacity]
+        return self._value[idx + self.capacity]
+
+    def set_items(self, idxes, vals):
+        """Inserts/overwrites many values in/into the tree at once.
+
+        Equivalent to `tree[idx] = val` for all (idx, val) pairs (the last
+        value wins for duplicate indices), but updates the reduction values
+        one tree level at a time for all indices together.
+
+        Args:
+            idxes (np.ndarray): The indices to insert to. Must all be in
+                [0, `self.capacity`[
+            vals (np.ndarray): The values to insert (same length as `idxes`).
+        """
+        idxes = np.asarray(idxes, dtype=np.int64)
+        vals = np.asarray(vals, dtype=np.float64)
+        assert idxes.shape == vals.shape, (idxes.shape, vals.shape)
+        if idxes.size == 0:
+            return
+        assert 0 <= idxes.min() and idxes.max() < self.capacity
+
+        # No vectorized version of a custom `operation` available.
+        if self.np_operation is None:
+            for idx, val in zip(idxes.tolist(), vals.tolist()):
+                self[idx] = val
+            return
+
+        idxes = idxes + self.capacity
+        self.value[idxes] = vals
+
+        # All leaves are on the same level, so after each halving step, all
+        # (unique) parent indices are on the same level as well.
+        idxes = np.unique(idxes >> 1)
+        while idxes[0] >= 1:
+            update_idxes = 2 * idxes
+            self.value[idxes] = self.np_operation(self.value[update_idxes],
+                                                  self.value[update_idxes + 1])
+            idxes = np.unique(idxes >> 1)
+
+    def get_items(self, idxes):
+        """Returns the values stored at the given indices.
+
+        Args:
+            idxes (np.ndarray): The indices to read. Must all be in
+                [0, `self.capacity`[
+
+        Returns:
+            np.ndarray: The values at `idxes`.
+        """
+        idxes = np.asarray(idxes, dtype=np.int64)
+        assert idxes.size == 0 or (0 <= idxes.min()
+                                   and idxes.max() < self.capacity)
+        return self.value[idxes + self.capacity]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Memoryviews can't be pickled; restored in __setstate__.
+        del state["_value"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._value = memoryview(self.value)
 
 
 class SumSegmentTree(SegmentTree):
@@ -173,19 +270,48 @@ class SumSegmentTree(SegmentTree):
             int: Largest possible index (i) satisfying above constraint.
         """
         assert 0 <= prefixsum <= self.sum() + 1e-5
+        value = self._value
         # Global sum node.
         idx = 1
 
         # While non-leaf (first half of tree).
         while idx < self.capacity:
             update_idx = 2 * idx
-            if self.value[update_idx] > prefixsum:
+            if value[update_idx] > prefixsum:
                 idx = update_idx
             else:
-                prefixsum -= self.value[update_idx]
+                prefixsum -= value[update_idx]
                 idx = update_idx + 1
         return idx - self.capacity
 
+    def find_prefixsum_idxes(self, prefixsums):
+        """Batched version of `find_prefixsum_idx`.
+
+        Descends the tree for all given prefix sums together, one level at a
+        time.
+
+        Args:
+            prefixsums (np.ndarray): `prefixsum` upper bounds (one per query).
+
+        Returns:
+            np.ndarray: Largest possible index (i) satisfying the
+                `find_prefixsum_idx` constraint for each of the `prefixsums`.
+        """
+        prefixsums = np.array(prefixsums, dtype=np.float64)
+        assert prefixsums.size == 0 or (0 <= prefixsums.min() and
+                                        prefixsums.max() <= self.sum() + 1e-5)
+        # Global sum node.
+        idxes = np.ones_like(prefixsums, dtype=np.int64)
+
+        # All queries descend in lockstep until they reach the leaves.
+        for _ in range(self.capacity.bit_length() - 1):
+            update_idxes = 2 * idxes
+            left_values = self.value[update_idxes]
+            go_right = left_values <= prefixsums
+            prefixsums -= np.where(go_right, left_values, 0.0)
+            idxes = update_idxes + go_right
+        return idxes - self.capacity
+
 
 class MinSegmentTree(SegmentTree):
     def __init__(self, capacity):
@@ -0,0 +1,162 @@
+import atexit
+import collections
+import numpy as np
+import os
+import platform
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+
+from ray.rllib.offline.columnar_reader import _chunk_to_batch, \
+    _read_chunk_headers
+from ray.rllib.offline.columnar_writer import _chunk_buffers
+from ray.rllib.utils.annotations import DeveloperAPI
+from ray.rllib.utils.types import SampleBatchType
+
+# Directory for shared memory segments: tmpfs on Linux, with a fallback to
+# the (disk-backed) temp dir elsewhere.
+SHARED_MEMORY_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else \
+    tempfile.gettempdir()
+
+# Seconds after which the producer removes shared memory files that were not
+# read (e.g. because the consumer failed or dropped the descriptor).
+SHARED_MEMORY_TTL_S = 600
+
+# Creation times of the shared memory files created by this process (oldest
+# first) that may not have been read yet.
+_created_files = collections.OrderedDict()
+_created_files_lock = threading.Lock()
+
+
+@DeveloperAPI
+class SharedMemoryBatch:
+    """Descriptor of a SampleBatch or MultiAgentBatch in shared memory.
+
+    Creating a SharedMemoryBatch writes the batch's columns (in the binary
+    columnar chunk format of the ColumnarWriter) into a shared memory file.
+    Only the small descriptor is then sent to the consumer, which must run
+    on the same node and maps the columns back into a batch via `get()`,
+    without unpickling or copying numeric columns.
+
+    The shared memory file is removed as soon as the consumer mapped it (or
+    when the consumer's descriptor is garbage collected without `get()`
+    being called), its memory is freed once the batch is no longer used.
+    Files that never reach a consumer are removed by the producer after
+    SHARED_MEMORY_TTL_S seconds, or when the producer process exits.
+
+    Examples:
+        >>> ref = SharedMemoryBatch(batch)  # On a rollout worker.
+        >>> batch = ref.get()  # On the learner.
+    """
+
+    @DeveloperAPI
+    def __init__(self, batch: SampleBatchType, directory: str = None):
+        """Writes the given batch into shared memory.
+
+        Args:
+            batch (SampleBatchType): The batch to store. Compressed columns
+                are decompressed first.
+            directory (Optional[str]): Directory to create the shared memory
+                file in. Defaults to SHARED_MEMORY_DIR.
+        """
+        _remove_expired_files()
+        batch.decompress_if_needed()
+        self.count = batch.count
+        self.path = os.path.join(directory or SHARED_MEMORY_DIR,
+                                 "rllib-batch-{}".format(uuid.uuid4().hex))
+        try:
+            with open(self.path, "wb") as f:
+                f.writelines(_chunk_buffers(batch))
+        except BaseException:
+            _unlink_if_exists(self.path)
+            raise
+        with _created_files_lock:
+            _created_files[self.path] = time.time()
+
+    @DeveloperAPI
+    def get(self) -> SampleBatchType:
+        """Maps the stored batch from shared memory (can only be called once).
+
+        Returns:
+            SampleBatchType: The stored batch, with its numeric columns being
+                (copy-on-write) views of the shared memory.
+        """
+        data = np.memmap(self.path, dtype=np.uint8, mode="c")
+        self._release()
+        chunks = _read_chunk_headers(data)
+        assert len(chunks) == 1, (self.path, len(chunks))
+        data_start, header = chunks[0]
+        return _chunk_to_batch(data, data_start, header)
+
+    def _release(self):
+        finalizer = getattr(self, "_finalizer", None)
+        if finalizer:
+            finalizer.detach()
+        os.unlink(self.path)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # The receiving side owns the shared memory file.
+        self._finalizer = weakref.finalize(self, _unlink_if_exists, self.path)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_finalizer", None)
+        return state
+
+
+@DeveloperAPI
+def to_shared_memory(batch: SampleBatchType, learner_host: str):
+    """Moves the batch into shared memory if the learner runs on this node.
+
+    Args:
+        batch (SampleBatchType): The batch to send to the learner.
+        learner_host (str): The hostname (`platform.node()`) of the learner.
+
+    Returns:
+        Union[SampleBatchType, SharedMemoryBatch]: A SharedMemoryBatch if the
+            learner runs on this node, the batch itself otherwise.
+    """
+    if platform.node() == learner_host:
+        return SharedMemoryBatch(batch)
+    return batch
+
+
+@DeveloperAPI
+def from_shared_memory(item) -> SampleBatchType:
+    """Returns the batch of a SharedMemoryBatch, passes batches through."""
+    if isinstance(item, SharedMemoryBatch):
+        return item.get()
+    return item
+
+
+def _unlink_if_exists(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _remove_expired_files(ttl_s=None):
+    """Removes the unread files created by this process older than ttl_s.
+
+    Files that were already read (and removed) by the consumer are skipped.
+    """
+    if ttl_s is None:
+        ttl_s = SHARED_MEMORY_TTL_S
+    expired = []
+    with _created_files_lock:
+        now = time.time()
+        while _created_files:
+            path, created = next(iter(_created_files.items()))
+            if now - created < ttl_s:
+                break
+            del _created_files[path]
+            expired.append(path)
+    for path in expired:
+        _unlink_if_exists(path)
+
+
+atexit.register(_remove_expired_files, ttl_s=0)
@@ -1,5 +1,8 @@
 from collections import Counter
 import numpy as np
+import os
+import shutil
+import tempfile
 import unittest
 
 from ray.rllib.execution.replay_buffer import PrioritizedReplayBuffer
@@ -179,6 +182,179 @@ class TestPrioritizedReplayBuffer(unittest.TestCase):
         for i in counts.values():
             self.assertTrue(100 < i < 300)
 
+    def test_columnar_storage(self):
+        memory = PrioritizedReplayBuffer(
+            size=self.capacity, alpha=self.alpha, storage="columnar")
+
+        # Insert over capacity.
+        records = []
+        for i in range(self.capacity + 3):
+            data = self._generate_data()
+            records.append(data)
+            memory.add(data, weight=1.0)
+        self.assertTrue(len(memory) == self.capacity)
+        self.assertTrue(memory._next_idx == 3)
+        # The most recent records overwrite the oldest ones in place.
+        stored = records[self.capacity:] + records[3:self.capacity]
+
+        batch = memory.sample(100, beta=self.beta)
+        self.assertEqual(batch.count, 100)
+        check(batch["weights"], np.ones(shape=(100, )))
+        for i, idx in enumerate(batch["batch_indexes"]):
+            for key in ["obs_t", "action", "reward", "obs_tp1", "done"]:
+                check(batch[key][i], stored[idx][key][0])
+
+        # Prioritization works the same as with list storage.
+        memory.update_priorities(
+            np.arange(self.capacity), np.array([0.01] * 9 + [1.0]))
+        batch = memory.sample(1000, beta=self.beta)
+        self.assertTrue(np.sum(batch["batch_indexes"] == 9) > 850)
+
+        # Only single-timestep batches can be stored.
+        with self.assertRaises(ValueError):
+            memory.add(
+                SampleBatch.concat_samples(
+                    [self._generate_data(),
+                     self._generate_data()]),
+                weight=1.0)
+
+    def test_mmap_storage_and_checkpoint(self):
+        storage_dir = tempfile.mkdtemp()
+        checkpoint_dir = tempfile.mkdtemp()
+        memory = PrioritizedReplayBuffer(
+            size=self.capacity,
+            alpha=self.alpha,
+            storage="mmap",
+            storage_dir=storage_dir)
+        # The column files are created within a subdir of `storage_dir`.
+        self.assertEqual(len(os.listdir(storage_dir)), 1)
+
+        for i in range(self.capacity - 2):
+            memory.add(self._generate_data(), weight=1.0)
+        memory.update_priorities(np.array([1, 2]), np.array([4.0, 8.0]))
+        memory.save(checkpoint_dir)
+
+        for storage in ["columnar", "mmap"]:
+            restored = PrioritizedReplayBuffer(
+                size=self.capacity,
+                alpha=self.alpha,
+                storage=storage,
+                storage_dir=storage_dir)
+            restored.restore(checkpoint_dir)
+            self.assertEqual(len(restored), len(memory))
+            self.assertEqual(restored._next_idx, memory._next_idx)
+            self.assertEqual(restored._max_priority, 8.0)
+            check(restored._it_sum.value, memory._it_sum.value)
+            idxes = np.arange(len(memory))
+            check(
+                restored._encode_sample(idxes).data,
+                memory._encode_sample(idxes).data)
+
+        # Files get cleaned up along with the buffers.
+        del memory, restored
+        self.assertEqual(len(os.listdir(storage_dir)), 0)
+        shutil.rmtree(storage_dir)
+        shutil.rmtree(checkpoint_dir)
+
+    def test_list_storage_checkpoint(self):
+        checkpoint_dir = tempfile.mkdtemp()
+        memory = PrioritizedReplayBuffer(size=self.capacity, alpha=self.alpha)
+        for i in range(self.capacity - 2):
+            memory.add(self._generate_data(), weight=np.random.rand())
+        memory.save(checkpoint_dir)
+
+        restored = PrioritizedReplayBuffer(
+            size=self.capacity, alpha=self.alpha)
+        restored.restore(checkpoint_dir)
+        self.assertEqual(len(restored), len(memory))
+        check(restored._it_min.value, memory._it_min.value)
+        idxes = np.arange(len(memory))
+        check(
+            restored._encode_sample(idxes).data,
+            memory._encode_sample(idxes).data)
+        shutil.rmtree(checkpoint_dir)
+
+    def test_frame_stack_storage(self):
+        def generate_episode(length, num_frames=4):
+            # Frames of shape [3, 3, 1], stacked along the last axis.
+            frames = [np.random.randint(0, 255, (3, 3, 1), dtype=np.uint8)]
+            frames = frames * (num_frames - 1) + [
+                np.random.randint(0, 255, (3, 3, 1), dtype=np.uint8)
+                for _ in range(length + 1)
+            ]
+            eps_id = np.random.randint(1000)
+            for t in range(length):
+                yield SampleBatch({
+                    "obs": [np.concatenate(frames[t:t + num_frames], -1)],
+                    "new_obs": [
+                        np.concatenate(frames[t + 1:t + 1 + num_frames], -1)
+                    ],
+                    "eps_id": [eps_id],
+                    "rewards": [np.random.rand()],
+                })
+
+        memory = PrioritizedReplayBuffer(
+            size=self.capacity, alpha=self.alpha, storage="frame_stack")
+        records = []
+        for length in [3, 8, 1, 5]:
+            for data in generate_episode(length):
+                records.append(data)
+                memory.add(data, weight=1.0)
+        self.assertTrue(len(memory) == self.capacity)
+
+        # Batches are rebuilt exactly, also after wrapping around.
+        stored = records[-7:] + records[-10:-7]
+        idxes = np.arange(self.capacity)
+        batch = memory._encode_sample(idxes)
+        for key in ["obs", "new_obs", "eps_id", "rewards"]:
+            check(batch[key], np.concatenate([r[key] for r in stored]))
+        batch = memory.sample(20, beta=self.beta)
+        for i, idx in enumerate(batch["batch_indexes"]):
+            check(batch["obs"][i], stored[idx]["obs"][0])
+
+        # The 10 rows hold 80 stacked frames, but only 18 distinct ones:
+        # 8 from the last 4 rows of the length-8 episode, 3 from the
+        # length-1 and 7 from the length-5 episode (the first frame of an
+        # episode is repeated to fill its first stack).
+        storage = memory._storage
+        self.assertEqual(np.count_nonzero(storage._frame_refs), 18)
+        self.assertEqual(
+            len(storage._frame_index), np.count_nonzero(storage._frame_refs))
+
+        # Checkpoints restore the frame pool.
+        checkpoint_dir = tempfile.mkdtemp()
+        memory.save(checkpoint_dir)
+        restored = PrioritizedReplayBuffer(
+            size=self.capacity, alpha=self.alpha, storage="frame_stack")
+        restored.restore(checkpoint_dir)
+        check(
+            restored._encode_sample(idxes).data,
+            memory._encode_sample(idxes).data)
+        # Keep adding (and evicting) rows after the restore.
+        new_records = list(generate_episode(4))
+        for data in new_records:
+            restored.add(data, weight=1.0)
+        stored = new_records[3:] + stored[1:7] + new_records[:3]
+        batch = restored._encode_sample(idxes)
+        for key in ["obs", "new_obs"]:
+            check(batch[key], np.concatenate([r[key] for r in stored]))
+        shutil.rmtree(checkpoint_dir)
+
+        # Other stack sizes (model.framestack) are passed via num_frames.
+        memory = PrioritizedReplayBuffer(
+            size=self.capacity,
+            alpha=self.alpha,
+            storage="frame_stack",
+            num_frames=2)
+        records = list(generate_episode(6, num_frames=2))
+        for data in records:
+            memory.add(data, weight=1.0)
+        batch = memory._encode_sample(np.arange(len(records)))
+        for key in ["obs", "new_obs"]:
+            check(batch[key], np.concatenate([r[key] for r in records]))
+        # 6 rows of 2-frame stacks hold 8 distinct frames.
+        self.assertEqual(np.count_nonzero(memory._storage._frame_refs), 8)
+
 
 if __name__ == "__main__":
     import pytest
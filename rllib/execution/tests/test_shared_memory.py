@@ -0,0 +1,128 @@
+import numpy as np
+import os
+import pickle
+import platform
+import tempfile
+import timeit
+import unittest
+from unittest import mock
+
+from ray.rllib.execution import shared_memory
+from ray.rllib.execution.shared_memory import SharedMemoryBatch, \
+    from_shared_memory, to_shared_memory
+from ray.rllib.policy.sample_batch import SampleBatch, MultiAgentBatch
+
+
+def make_batch(count, obs_shape=(4, )):
+    return SampleBatch({
+        "obs": np.random.random((count, ) + obs_shape).astype(np.float32),
+        "actions": np.arange(count),
+        "dones": np.zeros(count, dtype=bool),
+        "infos": np.array([{
+            "i": i
+        } for i in range(count)]),
+    })
+
+
+class TestSharedMemory(unittest.TestCase):
+    def test_send_and_get(self):
+        batch = make_batch(10)
+        ref = SharedMemoryBatch(batch)
+        self.assertTrue(os.path.exists(ref.path))
+        self.assertEqual(ref.count, 10)
+        received = pickle.loads(pickle.dumps(ref))
+        read = received.get()
+        # The file is gone, but the mapped columns are still valid.
+        self.assertFalse(os.path.exists(ref.path))
+        for k in batch.keys():
+            self.assertEqual(read[k].dtype, batch[k].dtype)
+            self.assertEqual(read[k].tolist(), batch[k].tolist())
+        self.assertFalse(read["obs"].flags.owndata)
+        # Columns can be modified by the learner (copy-on-write).
+        read["actions"][0] = 100
+
+        ma_batch = MultiAgentBatch({
+            "p0": make_batch(3),
+            "p1": make_batch(5, (2, 2))
+        }, 5)
+        read = pickle.loads(pickle.dumps(SharedMemoryBatch(ma_batch))).get()
+        self.assertEqual(read.count, 5)
+        self.assertEqual(read.policy_batches["p1"]["obs"].tolist(),
+                         ma_batch.policy_batches["p1"]["obs"].tolist())
+
+    def test_compressed_batch(self):
+        batch = make_batch(10)
+        expected = batch["obs"].copy()
+        batch.compress(bulk=True)
+        read = pickle.loads(pickle.dumps(SharedMemoryBatch(batch))).get()
+        self.assertEqual(read["obs"].dtype, np.float32)
+        self.assertEqual(read["obs"].tolist(), expected.tolist())
+
+    def test_unread_batches_are_removed(self):
+        ref = SharedMemoryBatch(make_batch(10))
+        received = pickle.loads(pickle.dumps(ref))
+        # Dropping the sender's descriptor keeps the file around.
+        path = ref.path
+        del ref
+        self.assertTrue(os.path.exists(path))
+        del received
+        self.assertFalse(os.path.exists(path))
+
+    def test_producer_removes_unread_batches(self):
+        directory = tempfile.mkdtemp()
+        ref = SharedMemoryBatch(make_batch(10), directory)
+        # The consumer never reads the batch, e.g. because it failed.
+        self.assertTrue(os.path.exists(ref.path))
+        with mock.patch.object(shared_memory, "SHARED_MEMORY_TTL_S", 0):
+            ref2 = SharedMemoryBatch(make_batch(10), directory)
+        self.assertFalse(os.path.exists(ref.path))
+        self.assertTrue(os.path.exists(ref2.path))
+        shared_memory._remove_expired_files(ttl_s=0)
+        self.assertEqual(os.listdir(directory), [])
+
+        # Files are removed if writing them fails.
+        def failing_chunk_buffers(batch):
+            yield b"header"
+            raise ValueError("write failed")
+
+        with mock.patch.object(shared_memory, "_chunk_buffers",
+                               failing_chunk_buffers):
+            self.assertRaises(
+                ValueError,
+                lambda: SharedMemoryBatch(make_batch(10), directory))
+        self.assertEqual(os.listdir(directory), [])
+        os.rmdir(directory)
+
+    def test_only_colocated_batches(self):
+        batch = make_batch(10)
+        self.assertIs(to_shared_memory(batch, "some-other-host"), batch)
+        self.assertIs(from_shared_memory(batch), batch)
+        ref = to_shared_memory(batch, platform.node())
+        self.assertIsInstance(ref, SharedMemoryBatch)
+        read = from_shared_memory(pickle.loads(pickle.dumps(ref)))
+        self.assertEqual(read["actions"].tolist(), batch["actions"].tolist())
+
+    def test_microbenchmark_vs_pickle(self):
+        # An Atari-sized batch of observations (~28MB).
+        batch = make_batch(1000, (84, 84, 4))
+        batch["obs"] = (batch["obs"] * 255).astype(np.uint8)
+        old = timeit.timeit(
+            "pickle.loads(pickle.dumps(batch, pickle.HIGHEST_PROTOCOL))",
+            globals=dict(pickle=pickle, batch=batch),
+            number=10)
+        new = timeit.timeit(
+            "pickle.loads(pickle.dumps(SharedMemoryBatch(batch))).get()",
+            globals=dict(
+                pickle=pickle,
+                batch=batch,
+                SharedMemoryBatch=SharedMemoryBatch),
+            number=10)
+        print("Send batch (time spent) pickle={} shared memory={}".format(
+            old, new))
+        self.assertGreater(old, new)
+
+
+if __name__ == "__main__":
+    import pytest
+    import sys
+    sys.exit(pytest.main(["-v", __file__]))
@@ -68,7 +68,8 @@ MODEL_DEFAULTS = {
     "state_shape": None,
 
     # == Atari ==
-    # Whether to enable framestack for Atari envs
+    # Whether to enable framestack for Atari envs. True stacks the last 4
+    # frames, an int the last `framestack` frames.
     "framestack": True,
     # Final resized frame dimension
     "dim": 84,
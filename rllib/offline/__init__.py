@@ -1,12 +1,17 @@
 from ray.rllib.offline.io_context import IOContext
+from ray.rllib.offline.columnar_reader import ColumnarReader
+from ray.rllib.offline.columnar_writer import ColumnarWriter
 from ray.rllib.offline.json_reader import JsonReader
 from ray.rllib.offline.json_writer import JsonWriter
 from ray.rllib.offline.output_writer import OutputWriter, NoopOutput
 from ray.rllib.offline.input_reader import InputReader
 from ray.rllib.offline.mixed_input import MixedInput
+from ray.rllib.offline.parallel_input import ParallelInput
 from ray.rllib.offline.shuffled_input import ShuffledInput
 
 __all__ = [
+    "ColumnarReader",
+    "ColumnarWriter",
     "IOContext",
     "JsonReader",
     "JsonWriter",
@@ -14,5 +19,6 @@ __all__ = [
     "OutputWriter",
     "InputReader",
     "MixedInput",
+    "ParallelInput",
     "ShuffledInput",
 ]
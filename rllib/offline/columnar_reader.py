@@ -0,0 +1,182 @@
+import glob
+import json
+import logging
+import numpy as np
+import os
+import pickle
+import random
+from urllib.parse import urlparse
+
+from ray.rllib.offline.columnar_writer import COLUMNAR_FILE_EXTENSION, \
+    CHUNK_MAGIC, CHUNK_PREFIX
+from ray.rllib.offline.input_reader import InputReader
+from ray.rllib.offline.io_context import IOContext
+from ray.rllib.offline.json_reader import postprocess_if_needed
+from ray.rllib.policy.sample_batch import MultiAgentBatch, SampleBatch
+from ray.rllib.utils.annotations import override, PublicAPI
+
+logger = logging.getLogger(__name__)
+
+
+@PublicAPI
+class ColumnarReader(InputReader):
+    """Reader object that loads experiences from binary columnar files.
+
+    Reads the files written by ColumnarWriter. Files are memory-mapped and
+    the returned batches' columns are (read-only) views into the mapped
+    files, so only the chunks and columns actually read are loaded from
+    disk. Like JsonReader, `next()` reads the chunks of randomly chosen
+    files in order; `read_chunk()` gives random access to single chunks.
+    """
+
+    @PublicAPI
+    def __init__(self, inputs, ioctx=None, columns=None):
+        """Initialize a ColumnarReader.
+
+        Arguments:
+            inputs (str|list): either a glob expression for files, e.g.,
+                "/tmp/**/*.rlcol", a directory, or a list of single file
+                paths.
+            ioctx (IOContext): current IO context object.
+            columns (Optional[list]): if given, only read these columns
+                (column projection). None for reading all columns.
+        """
+
+        self.ioctx = ioctx or IOContext()
+        self.columns = set(columns) if columns is not None else None
+        if isinstance(inputs, str):
+            inputs = os.path.abspath(os.path.expanduser(inputs))
+            if os.path.isdir(inputs):
+                inputs = os.path.join(inputs, "*" + COLUMNAR_FILE_EXTENSION)
+                logger.warning(
+                    "Treating input directory as glob pattern: {}".format(
+                        inputs))
+            self.files = glob.glob(inputs)
+        elif type(inputs) is list:
+            self.files = inputs
+        else:
+            raise ValueError(
+                "type of inputs must be list or str, not {}".format(inputs))
+        for path in self.files:
+            if urlparse(path).scheme not in ["", "c"]:
+                raise ValueError(
+                    "ColumnarReader can only read local files, not {}".format(
+                        path))
+        if self.files:
+            logger.info("Found {} input files.".format(len(self.files)))
+        else:
+            raise ValueError("No files found matching {}".format(inputs))
+        # Maps paths to (memory-map, list of chunk headers).
+        self._mapped_files = {}
+        self.cur_file = None
+        self.cur_chunk = 0
+
+    @override(InputReader)
+    def next(self):
+        tries = 0
+        while not self.cur_file or \
+                self.cur_chunk >= self.num_chunks(self.cur_file):
+            if tries >= 100:
+                raise ValueError(
+                    "Failed to read next chunk from files: {}".format(
+                        self.files))
+            if self.cur_file:
+                logger.debug("Ignoring empty file {}".format(self.cur_file))
+            tries += 1
+            self.cur_file = random.choice(self.files)
+            self.cur_chunk = 0
+        batch = self.read_chunk(self.cur_file, self.cur_chunk)
+        self.cur_chunk += 1
+        return postprocess_if_needed(batch, self.ioctx)
+
+    @PublicAPI
+    def num_chunks(self, path):
+        """Returns the number of chunks (written batches) in the given file.
+
+        Arguments:
+            path (str): the file to inspect.
+
+        Returns:
+            int: the number of complete chunks in `path`.
+        """
+        return len(self._map_file(path)[1])
+
+    @PublicAPI
+    def read_chunk(self, path, index):
+        """Reads a single chunk (i.e. a written batch) from the given file.
+
+        Arguments:
+            path (str): the file to read from.
+            index (int): index of the chunk within `path`.
+
+        Returns:
+            SampleBatch or MultiAgentBatch read (only containing the
+                projected columns).
+        """
+        data, chunks = self._map_file(path)
+        data_start, header = chunks[index]
+        return _chunk_to_batch(data, data_start, header, self.columns)
+
+    def _map_file(self, path):
+        if path not in self._mapped_files:
+            if os.path.getsize(path) == 0:
+                self._mapped_files[path] = (None, [])
+            else:
+                data = np.memmap(path, dtype=np.uint8, mode="r")
+                self._mapped_files[path] = (data, _read_chunk_headers(data))
+        return self._mapped_files[path]
+
+
+def _read_chunk_headers(data):
+    """Returns the (data start offset, header) of all chunks in a file.
+
+    Only the small chunk headers are read, the column data is skipped. A
+    truncated last chunk (e.g. from a writer that is still running) is
+    ignored.
+    """
+    chunks = []
+    offset = 0
+    while offset + CHUNK_PREFIX.size <= len(data):
+        magic, header_len, data_len = CHUNK_PREFIX.unpack(
+            data[offset:offset + CHUNK_PREFIX.size].tobytes())
+        if magic != CHUNK_MAGIC:
+            raise ValueError(
+                "Corrupt columnar file: missing chunk marker at offset "
+                "{}".format(offset))
+        data_start = offset + CHUNK_PREFIX.size + header_len
+        if data_start + data_len > len(data):
+            break
+        header = json.loads(
+            data[offset +
+                 CHUNK_PREFIX.size:data_start].tobytes().decode("utf-8"))
+        chunks.append((data_start, header))
+        offset = data_start + data_len
+    return chunks
+
+
+def _chunk_to_batch(data, data_start, header, columns=None):
+    """Returns the batch of a chunk, given its data start offset and header.
+
+    Numeric columns are views into `data`, object columns are unpickled.
+    Only the given `columns` are read (all if None).
+    """
+    policy_batches = {}
+    for column in header["columns"]:
+        if columns is not None and column["name"] not in columns:
+            continue
+        start = data_start + column["offset"]
+        buf = data[start:start + column["nbytes"]]
+        if column["dtype"] is None:
+            value = pickle.loads(buf.tobytes())
+        else:
+            value = np.asarray(buf).view(column["dtype"]).reshape(
+                column["shape"])
+        policy_batches.setdefault(column["policy_id"],
+                                  {})[column["name"]] = value
+
+    if header["type"] == "SampleBatch":
+        return SampleBatch(policy_batches.get(None, {}))
+    return MultiAgentBatch({
+        policy_id: SampleBatch(batch)
+        for policy_id, batch in policy_batches.items()
+    }, header["count"])
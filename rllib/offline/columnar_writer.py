@@ -0,0 +1,146 @@
+from datetime import datetime
+import json
+import logging
+import numpy as np
+import os
+import pickle
+import struct
+from six.moves.urllib.parse import urlparse
+import time
+
+from ray.rllib.policy.sample_batch import MultiAgentBatch
+from ray.rllib.offline.io_context import IOContext
+from ray.rllib.offline.output_writer import OutputWriter
+from ray.rllib.utils.annotations import override, PublicAPI
+
+logger = logging.getLogger(__name__)
+
+# File extension of columnar experience files.
+COLUMNAR_FILE_EXTENSION = ".rlcol"
+
+# Every chunk (i.e. written batch) starts with this magic string, followed
+# by the lengths of its json header and its data section (both uint64).
+CHUNK_MAGIC = b"RLCOLCHK"
+CHUNK_PREFIX = struct.Struct("<8sQQ")
+
+# Chunks and the columns within them start at multiples of this many bytes
+# (relative to the start of the file), so columns can be memory-mapped as
+# aligned arrays.
+ALIGNMENT = 64
+
+
+@PublicAPI
+class ColumnarWriter(OutputWriter):
+    """Writer object that saves experiences in binary columnar file chunks.
+
+    Each written batch becomes one chunk, consisting of a small json header
+    (batch type, count, and dtype, shape and offset of every column)
+    followed by the raw bytes of each column. Columns of python objects
+    (e.g. infos) are pickled. Unlike JsonWriter's output, these files can be
+    memory-mapped by the ColumnarReader, which then only touches the chunks
+    and columns it actually reads.
+    """
+
+    @PublicAPI
+    def __init__(self, path, ioctx=None, max_file_size=64 * 1024 * 1024):
+        """Initialize a ColumnarWriter.
+
+        Arguments:
+            path (str): a local path of the output directory to save files
+                in.
+            ioctx (IOContext): current IO context object.
+            max_file_size (int): max size of single files before rolling over.
+        """
+
+        self.ioctx = ioctx or IOContext()
+        self.max_file_size = max_file_size
+        if urlparse(path).scheme not in ["", "c"]:
+            raise ValueError(
+                "ColumnarWriter can only write to local paths, not {}".format(
+                    path))
+        path = os.path.abspath(os.path.expanduser(path))
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.file_index = 0
+        self.bytes_written = 0
+        self.cur_file = None
+
+    @override(OutputWriter)
+    def write(self, sample_batch):
+        start = time.time()
+        data = _to_chunk(sample_batch)
+        f = self._get_file()
+        f.write(data)
+        f.flush()
+        self.bytes_written += len(data)
+        logger.debug("Wrote {} bytes to {} in {}s".format(
+            len(data), f,
+            time.time() - start))
+
+    def _get_file(self):
+        if not self.cur_file or self.bytes_written >= self.max_file_size:
+            if self.cur_file:
+                self.cur_file.close()
+            timestr = datetime.today().strftime("%Y-%m-%d_%H-%M-%S")
+            path = os.path.join(
+                self.path, "output-{}_worker-{}_{}{}".format(
+                    timestr, self.ioctx.worker_index, self.file_index,
+                    COLUMNAR_FILE_EXTENSION))
+            self.cur_file = open(path, "wb")
+            self.file_index += 1
+            self.bytes_written = 0
+            logger.info("Writing to new output file {}".format(self.cur_file))
+        return self.cur_file
+
+
+def _padding(size):
+    return -size % ALIGNMENT
+
+
+def _to_chunk(batch):
+    """Serializes a SampleBatch or MultiAgentBatch into a chunk (bytes)."""
+    return b"".join(_chunk_buffers(batch))
+
+
+def _chunk_buffers(batch):
+    """Returns the chunk of the given batch as a list of bytes-like objects.
+
+    Numeric columns are returned as (contiguous) byte views of the columns,
+    so the chunk can be written out without building it in memory first.
+    """
+    if isinstance(batch, MultiAgentBatch):
+        header = {"type": "MultiAgentBatch", "count": batch.count}
+        sub_batches = batch.policy_batches.items()
+    else:
+        header = {"type": "SampleBatch", "count": batch.count}
+        sub_batches = [(None, batch)]
+
+    columns = []
+    buffers = []
+    offset = 0
+    for policy_id, sub_batch in sub_batches:
+        for k, v in sub_batch.data.items():
+            v = np.asarray(v)
+            if v.dtype.kind == "O":
+                buf = pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL)
+                dtype = None
+            else:
+                buf = np.ascontiguousarray(v).reshape(-1).view(np.uint8)
+                dtype = v.dtype.str
+            columns.append({
+                "policy_id": policy_id,
+                "name": k,
+                "dtype": dtype,
+                "shape": list(v.shape),
+                "offset": offset,
+                "nbytes": len(buf),
+            })
+            buffers.append(buf)
+            buffers.append(b"\0" * _padding(len(buf)))
+            offset += len(buf) + _padding(len(buf))
+    header["columns"] = columns
+
+    header = json.dumps(header).encode("utf-8")
+    header += b" " * _padding(CHUNK_PREFIX.size + len(header))
+    prefix = CHUNK_PREFIX.pack(CHUNK_MAGIC, len(header), offset)
+    return [prefix, header] + buffers
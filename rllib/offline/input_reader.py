@@ -86,6 +86,14 @@ class InputReader:
         out = {k: tf.reshape(t, shapes[k]) for k, t in tensors.items()}
         return out
 
+    @PublicAPI
+    def stop(self):
+        """Releases resources (e.g. background threads) used for reading.
+
+        Called when the rollout worker reading from this input is stopped.
+        """
+        pass
+
 
 class _QueueRunner(threading.Thread):
     """Thread that feeds a TF queue from a InputReader."""
@@ -77,20 +77,7 @@ class JsonReader(InputReader):
         return self._postprocess_if_needed(batch)
 
     def _postprocess_if_needed(self, batch):
-        if not self.ioctx.config.get("postprocess_inputs"):
-            return batch
-
-        if isinstance(batch, SampleBatch):
-            out = []
-            for sub_batch in batch.split_by_episode():
-                out.append(self.ioctx.worker.policy_map[DEFAULT_POLICY_ID]
-                           .postprocess_trajectory(sub_batch))
-            return SampleBatch.concat_samples(out)
-        else:
-            # TODO(ekl) this is trickier since the alignments between agent
-            # trajectories in the episode are not available any more.
-            raise NotImplementedError(
-                "Postprocessing of multi-agent data not implemented yet.")
+        return postprocess_if_needed(batch, self.ioctx)
 
     def _try_parse(self, line):
         line = line.strip()
@@ -133,6 +120,32 @@ class JsonReader(InputReader):
             return open(path, "r")
 
 
+def postprocess_if_needed(batch, ioctx):
+    """Runs postprocess_trajectory() on read batches if configured to.
+
+    Arguments:
+        batch (SampleBatch|MultiAgentBatch): the batch read from the input.
+        ioctx (IOContext): current IO context object.
+
+    Returns:
+        The (possibly) postprocessed batch.
+    """
+    if not ioctx.config.get("postprocess_inputs"):
+        return batch
+
+    if isinstance(batch, SampleBatch):
+        out = []
+        for sub_batch in batch.split_by_episode():
+            out.append(ioctx.worker.policy_map[DEFAULT_POLICY_ID]
+                       .postprocess_trajectory(sub_batch))
+        return SampleBatch.concat_samples(out)
+    else:
+        # TODO(ekl) this is trickier since the alignments between agent
+        # trajectories in the episode are not available any more.
+        raise NotImplementedError(
+            "Postprocessing of multi-agent data not implemented yet.")
+
+
 def _from_json(batch):
     if isinstance(batch, bytes):  # smart_open S3 doesn't respect "r"
         batch = batch.decode("utf-8")
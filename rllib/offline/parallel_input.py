@@ -0,0 +1,131 @@
+import logging
+import queue
+import threading
+
+from ray.rllib.offline.input_reader import InputReader
+from ray.rllib.offline.io_context import IOContext
+from ray.rllib.offline.json_reader import JsonReader, postprocess_if_needed
+from ray.rllib.utils.annotations import override, DeveloperAPI
+
+logger = logging.getLogger(__name__)
+
+
+@DeveloperAPI
+class ParallelInput(InputReader):
+    """Reads input files with background threads into a prefetch queue.
+
+    The input files are first sharded deterministically across the rollout
+    workers (worker i of n reads every n-th file of the sorted file list),
+    then the worker's shard is split across `num_readers` threads. Each
+    thread reads batches from its files with its own child reader and puts
+    them into a bounded queue, from which `next()` takes them. This overlaps
+    file I/O and decoding with learning. Postprocessing (if configured) runs
+    in `next()`, since policies must not be used from several threads.
+
+    Examples:
+        >>> ParallelInput("/tmp/experiences/*.json", ioctx, num_readers=4)
+    """
+
+    @DeveloperAPI
+    def __init__(self,
+                 inputs,
+                 ioctx=None,
+                 reader_cls=JsonReader,
+                 num_readers=2,
+                 prefetch_batches=16):
+        """Initialize a ParallelInput.
+
+        Arguments:
+            inputs (str|list): a glob expression, directory or list of files
+                to read, as accepted by `reader_cls`.
+            ioctx (IOContext): current IO context object.
+            reader_cls (type): the InputReader class used to read the files
+                of each shard, e.g. JsonReader or ColumnarReader. It must
+                take `(files, ioctx)` and expose the resolved file list as
+                `files`.
+            num_readers (int): number of background reader threads.
+            prefetch_batches (int): max number of batches read ahead of
+                `next()` calls.
+        """
+        if num_readers < 1:
+            raise ValueError(
+                "num_readers must be positive, got {}".format(num_readers))
+        self.ioctx = ioctx or IOContext()
+        # Child readers never postprocess, see `next()`.
+        self.reader_ioctx = IOContext(
+            self.ioctx.log_dir,
+            dict(self.ioctx.config, postprocess_inputs=False),
+            self.ioctx.worker_index, self.ioctx.worker)
+        self.reader_cls = reader_cls
+        self.files = _shard_files(
+            sorted(reader_cls(inputs, self.ioctx).files),
+            self.ioctx.worker_index, self.ioctx.config.get("num_workers", 0))
+        self.num_readers = min(num_readers, len(self.files))
+        self.queue = queue.Queue(prefetch_batches)
+        self.threads = []
+        self.shutdown = False
+
+    @override(InputReader)
+    def next(self):
+        # Start reading lazily, so that workers that never read from their
+        # input (e.g. a local worker with remote workers) don't spawn threads.
+        if not self.threads:
+            self._start_readers()
+        batch = self.queue.get(timeout=600.0)
+
+        # Propagate errors
+        if isinstance(batch, BaseException):
+            raise batch
+        return postprocess_if_needed(batch, self.ioctx)
+
+    @override(InputReader)
+    def stop(self):
+        """Stops the reader threads (after their current read)."""
+        self.shutdown = True
+
+    def _start_readers(self):
+        for i in range(self.num_readers):
+            files = self.files[i::self.num_readers]
+            thread = threading.Thread(
+                target=self._read_loop,
+                args=(self.reader_cls(files, self.reader_ioctx), ),
+                name="ParallelInput-{}".format(i))
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+        logger.info("Started {} reader threads for {} input files.".format(
+            self.num_readers, len(self.files)))
+
+    def _read_loop(self, reader):
+        try:
+            while not self.shutdown:
+                self._put(reader.next())
+        except BaseException as e:
+            self._put(e)
+
+    def _put(self, item):
+        """Puts the item into the queue, unless the input is stopped."""
+        while not self.shutdown:
+            try:
+                self.queue.put(item, timeout=1.0)
+                return
+            except queue.Full:
+                pass
+
+
+def _shard_files(files, worker_index, num_workers):
+    """Returns the files that the given rollout worker should read.
+
+    Remote workers (1..num_workers) each get a disjoint shard of the files.
+    The local worker (0) reads all files, since it only reads input itself if
+    there are no remote workers.
+    """
+    if worker_index == 0 or num_workers <= 1:
+        return files
+    if len(files) < num_workers:
+        logger.warning(
+            "Fewer input files ({}) than rollout workers ({}), so input "
+            "files will not be sharded across workers.".format(
+                len(files), num_workers))
+        return files
+    return files[worker_index - 1::num_workers]
@@ -39,3 +39,7 @@ class ShuffledInput(InputReader):
         i = random.randint(0, len(self.buffer) - 1)
         self.buffer[i] = self.child.next()
         return random.choice(self.buffer)
+
+    @override(InputReader)
+    def stop(self):
+        self.child.stop()
@@ -1,7 +1,6 @@
 import collections
 import numpy as np
 import sys
-import itertools
 from typing import Any, Dict, Iterable, List, Optional, Set, Union
 
 from ray.rllib.utils.annotations import PublicAPI, DeveloperAPI
@@ -23,6 +22,11 @@ class SampleBatch:
 
     For example, {"obs": [1, 2, 3], "reward": [0, -1, 1]} is a batch of three
     samples, each with an "obs" and "reward" attribute.
+
+    Concatenating batches is lazy: the columns of a concatenated batch keep
+    references to their input arrays and are only concatenated once they are
+    read (e.g. via `batch[key]` or `batch.data`). Slices of batches are views
+    of the original columns (also of not yet concatenated ones).
     """
 
     # Outputs from interacting with the environment
@@ -58,12 +62,12 @@ class SampleBatch:
     def __init__(self, *args, **kwargs):
         """Constructs a sample batch (same params as dict constructor)."""
 
-        self.data = dict(*args, **kwargs)
+        self._data = dict(*args, **kwargs)
         lengths = []
-        for k, v in self.data.copy().items():
+        for k, v in self._data.copy().items():
             assert isinstance(k, str), self
             lengths.append(len(v))
-            self.data[k] = np.array(v, copy=False)
+            self._data[k] = np.array(v, copy=False)
         if not lengths:
             raise ValueError("Empty sample batch")
         assert len(set(lengths)) == 1, ("data columns must be same length",
@@ -88,8 +92,8 @@ class SampleBatch:
         out = {}
         samples = [s for s in samples if s.count > 0]
         for k in samples[0].keys():
-            out[k] = concat_aligned([s[k] for s in samples])
-        return SampleBatch(out)
+            out[k] = _LazyConcat.of([s._data[k] for s in samples])
+        return SampleBatch._from_columns(out, sum(s.count for s in samples))
 
     @PublicAPI
     def concat(self, other: "SampleBatch") -> "SampleBatch":
@@ -116,8 +120,8 @@ class SampleBatch:
                 format(list(self.keys()), list(other.keys())))
         out = {}
         for k in self.keys():
-            out[k] = concat_aligned([self[k], other[k]])
-        return SampleBatch(out)
+            out[k] = _LazyConcat.of([self._data[k], other._data[k]])
+        return SampleBatch._from_columns(out, self.count + other.count)
 
     @PublicAPI
     def copy(self) -> "SampleBatch":
@@ -191,19 +195,12 @@ class SampleBatch:
             List[SampleBatch]: List of batches, one per distinct episode.
         """
 
-        slices = []
-        cur_eps_id = self.data["eps_id"][0]
-        offset = 0
-        for i in range(self.count):
-            next_eps_id = self.data["eps_id"][i]
-            if next_eps_id != cur_eps_id:
-                slices.append(self.slice(offset, i))
-                offset = i
-                cur_eps_id = next_eps_id
-        slices.append(self.slice(offset, self.count))
-        for s in slices:
-            slen = len(set(s["eps_id"]))
-            assert slen == 1, (s, slen)
+        eps_ids = self[SampleBatch.EPS_ID]
+        starts = np.flatnonzero(eps_ids[1:] != eps_ids[:-1]) + 1
+        bounds = [0] + starts.tolist() + [self.count]
+        slices = [
+            self.slice(start, end) for start, end in zip(bounds, bounds[1:])
+        ]
         assert sum(s.count for s in slices) == self.count, (slices, self.count)
         return slices
 
@@ -217,10 +214,16 @@ class SampleBatch:
 
         Returns:
             SampleBatch: A new SampleBatch, which has a slice of this batch's
-                data.
+                data (as views, no data is copied).
         """
 
-        return SampleBatch({k: v[start:end] for k, v in self.data.items()})
+        start, end, _ = slice(start, end).indices(self.count)
+        end = max(start, end)
+        return SampleBatch._from_columns({
+            k: v.slice(start, end)
+            if isinstance(v, _LazyConcat) else v[start:end]
+            for k, v in self._data.items()
+        }, end - start)
 
     @PublicAPI
     def timeslices(self, k: int) -> List["SampleBatch"]:
@@ -248,7 +251,7 @@ class SampleBatch:
         Returns:
             Iterable[str]: The keys() iterable over `self.data`.
         """
-        return self.data.keys()
+        return self._data.keys()
 
     @PublicAPI
     def items(self) -> Iterable[TensorType]:
@@ -269,7 +272,9 @@ class SampleBatch:
             Optional[TensorType]: The data under the given key. None if key
                 not found in data.
         """
-        return self.data.get(key)
+        if key not in self._data:
+            return None
+        return self[key]
 
     @PublicAPI
     def size_bytes(self) -> int:
@@ -277,7 +282,7 @@ class SampleBatch:
         Returns:
             int: The overall size in bytes of the data buffer (all columns).
         """
-        return sum(sys.getsizeof(d) for d in self.data)
+        return sum(sys.getsizeof(d) for d in self._data)
 
     @PublicAPI
     def __getitem__(self, key: str) -> TensorType:
@@ -289,7 +294,10 @@ class SampleBatch:
         Returns:
             TensorType]: The data under the given key.
         """
-        return self.data[key]
+        value = self._data[key]
+        if isinstance(value, _LazyConcat):
+            value = self._data[key] = value.materialize()
+        return value
 
     @PublicAPI
     def __setitem__(self, key, item) -> None:
@@ -299,13 +307,33 @@ class SampleBatch:
             key (str): The column name to set a value for.
             item (TensorType): The data to insert.
         """
-        self.data[key] = item
+        self._data[key] = item
+
+    @property
+    def data(self) -> Dict[str, TensorType]:
+        """The dict of data columns (concatenating any lazy columns)."""
+        for key, value in self._data.items():
+            if isinstance(value, _LazyConcat):
+                self._data[key] = value.materialize()
+        return self._data
+
+    @data.setter
+    def data(self, data: Dict[str, TensorType]) -> None:
+        self._data = data
+
+    @staticmethod
+    def _from_columns(columns: Dict[str, Any], count: int) -> "SampleBatch":
+        """Creates a SampleBatch from (possibly lazy) columns of one length.
+        """
+        batch = SampleBatch.__new__(SampleBatch)
+        batch._data = columns
+        batch.count = count
+        return batch
 
     @DeveloperAPI
-    def compress(
-            self,
-            bulk: bool = False,
-            columns: Set[str] = frozenset(["obs", "new_obs"])) -> None:
+    def compress(self,
+                 bulk: bool = False,
+                 columns: Set[str] = frozenset(["obs", "new_obs"])) -> None:
         """Compresses the data buffers (by column) in place.
 
         Args:
@@ -316,18 +344,16 @@ class SampleBatch:
                 compress the obs and new_obs columns.
         """
         for key in columns:
-            if key in self.data:
+            if key in self._data:
                 if bulk:
-                    self.data[key] = pack(self.data[key])
+                    self._data[key] = pack(self[key])
                 else:
-                    self.data[key] = np.array(
-                        [pack(o) for o in self.data[key]])
+                    self._data[key] = np.array([pack(o) for o in self[key]])
 
     @DeveloperAPI
-    def decompress_if_needed(
-            self,
-            columns: Set[str] = frozenset(
-                ["obs", "new_obs"])) -> "SampleBatch":
+    def decompress_if_needed(self,
+                             columns: Set[str] = frozenset(
+                                 ["obs", "new_obs"])) -> "SampleBatch":
         """Decompresses data buffers (per column if not compressed) in place.
 
         Args:
@@ -338,13 +364,12 @@ class SampleBatch:
             SampleBatch: This very SampleBatch.
         """
         for key in columns:
-            if key in self.data:
-                arr = self.data[key]
+            if key in self._data:
+                arr = self[key]
                 if is_compressed(arr):
-                    self.data[key] = unpack(arr)
+                    self._data[key] = unpack(arr)
                 elif len(arr) > 0 and is_compressed(arr[0]):
-                    self.data[key] = np.array(
-                        [unpack(o) for o in self.data[key]])
+                    self._data[key] = np.array([unpack(o) for o in arr])
         return self
 
     def __str__(self):
@@ -354,10 +379,16 @@ class SampleBatch:
         return "SampleBatch({})".format(str(self.data))
 
     def __iter__(self):
-        return self.data.__iter__()
+        return self._data.__iter__()
 
     def __contains__(self, x):
-        return x in self.data
+        return x in self._data
+
+    def __setstate__(self, state):
+        # Batches pickled before lazy concatenation stored `data` directly.
+        if "data" in state:
+            state["_data"] = state.pop("data")
+        self.__dict__.update(state)
 
 
 @PublicAPI
@@ -371,8 +402,7 @@ class MultiAgentBatch:
     """
 
     @PublicAPI
-    def __init__(self,
-                 policy_batches: Dict[PolicyID, SampleBatch],
+    def __init__(self, policy_batches: Dict[PolicyID, SampleBatch],
                  env_steps: int):
         """Initialize a MultiAgentBatch object.
 
@@ -432,41 +462,50 @@ class MultiAgentBatch:
         from ray.rllib.evaluation.sample_batch_builder import \
             SampleBatchBuilder
 
-        # Build a sorted set of (eps_id, t, policy_id, data...)
-        steps = []
-        for policy_id, batch in self.policy_batches.items():
-            for row in batch.rows():
-                steps.append((row[SampleBatch.EPS_ID], row["t"], policy_id,
-                              row))
-        steps.sort()
-
-        finished_slices = []
-        cur_slice = collections.defaultdict(SampleBatchBuilder)
-        cur_slice_size = 0
-
-        def finish_slice():
-            nonlocal cur_slice_size
-            assert cur_slice_size > 0
-            batch = MultiAgentBatch(
-                {k: v.build_and_reset()
-                 for k, v in cur_slice.items()}, cur_slice_size)
-            cur_slice_size = 0
-            finished_slices.append(batch)
-
-        # For each unique env timestep.
-        for _, group in itertools.groupby(steps, lambda x: x[:2]):
-            # Accumulate into the current slice.
-            for _, _, policy_id, row in group:
-                cur_slice[policy_id].add_values(**row)
-            cur_slice_size += 1
-            # Slice has reached target number of env steps.
-            if cur_slice_size >= k:
-                finish_slice()
-                assert cur_slice_size == 0
-
-        if cur_slice_size > 0:
-            finish_slice()
-
+        # Number the unique env timesteps (eps_id, t) across all policies in
+        # sorted order, and assign each agent step the slice of its timestep.
+        policy_ids = list(self.policy_batches.keys())
+        batches = [self.policy_batches[p] for p in policy_ids]
+        eps_ids = np.concatenate([b[SampleBatch.EPS_ID] for b in batches])
+        ts = np.concatenate([b["t"] for b in batches])
+        order = np.lexsort((ts, eps_ids))
+        eps_ids, ts = eps_ids[order], ts[order]
+        new_step = np.ones(len(order), dtype=bool)
+        new_step[1:] = (eps_ids[1:] != eps_ids[:-1]) | (ts[1:] != ts[:-1])
+        step_index = np.cumsum(new_step) - 1
+        num_steps = int(step_index[-1]) + 1
+        slice_index = np.empty(len(order), dtype=np.int64)
+        slice_index[order] = step_index // k
+
+        finished_slices = [{} for _ in range((num_steps + k - 1) // k)]
+        offset = 0
+        for policy_id, batch in zip(policy_ids, batches):
+            batch_slices = slice_index[offset:offset + batch.count]
+            offset += batch.count
+            # Rows are usually already in timestep order, in which case the
+            # slices are views of the batch.
+            batch_order = np.lexsort((batch["t"], batch[SampleBatch.EPS_ID]))
+            if np.any(batch_order != np.arange(batch.count)):
+                batch = SampleBatch(
+                    {key: value[batch_order]
+                     for key, value in batch.items()})
+                batch_slices = batch_slices[batch_order]
+            bounds = np.searchsorted(batch_slices,
+                                     np.arange(len(finished_slices) + 1))
+            for i, (start, end) in enumerate(zip(bounds, bounds[1:])):
+                if end > start:
+                    finished_slices[i][policy_id] = batch.slice(start, end)
+
+        for policy_batches in finished_slices:
+            for batch in policy_batches.values():
+                if SampleBatch.UNROLL_ID not in batch:
+                    batch[SampleBatch.UNROLL_ID] = np.repeat(
+                        SampleBatchBuilder._next_unroll_id, batch.count)
+                    SampleBatchBuilder._next_unroll_id += 1
+        finished_slices = [
+            MultiAgentBatch(policy_batches, min(k, num_steps - i * k))
+            for i, policy_batches in enumerate(finished_slices)
+        ]
         assert len(finished_slices) > 0, finished_slices
         return finished_slices
 
@@ -538,11 +577,9 @@ class MultiAgentBatch:
         return sum(b.size_bytes() for b in self.policy_batches.values())
 
     @DeveloperAPI
-    def compress(
-            self,
-            bulk: bool = False,
-            columns: Set[str] = frozenset(
-                ["obs", "new_obs"])) -> None:
+    def compress(self,
+                 bulk: bool = False,
+                 columns: Set[str] = frozenset(["obs", "new_obs"])) -> None:
         """Compresses each policy batch (per column) in place.
 
         Args:
@@ -555,10 +592,9 @@ class MultiAgentBatch:
             batch.compress(bulk=bulk, columns=columns)
 
     @DeveloperAPI
-    def decompress_if_needed(
-            self,
-            columns: Set[str] = frozenset(
-                ["obs", "new_obs"])) -> "MultiAgentBatch":
+    def decompress_if_needed(self,
+                             columns: Set[str] = frozenset(
+                                 ["obs", "new_obs"])) -> "MultiAgentBatch":
         """Decompresses each policy batch (per column), if already compressed.
 
         Args:
@@ -583,3 +619,52 @@ class MultiAgentBatch:
     def total(self):
         deprecation_warning("batch.total()", "batch.agent_steps()")
         return self.agent_steps()
+
+
+class _LazyConcat:
+    """A not yet concatenated column of a SampleBatch.
+
+    Holds the list of arrays (or views) the column consists of, which are
+    only concatenated (via concat_aligned) when the column is read.
+    """
+
+    def __init__(self, pieces: List[TensorType]):
+        self.pieces = pieces
+        self.offsets = np.cumsum([0] + [len(p) for p in pieces])
+
+    @staticmethod
+    def of(pieces: List[Any]) -> Any:
+        """Returns the lazy concatenation of the given columns.
+
+        Nested lazy columns are flattened and a single piece is returned as
+        is (like concat_aligned does).
+        """
+        flat = []
+        for piece in pieces:
+            if isinstance(piece, _LazyConcat):
+                flat.extend(piece.pieces)
+            else:
+                flat.append(piece)
+        if len(flat) == 1:
+            return flat[0]
+        return _LazyConcat(flat)
+
+    def materialize(self) -> TensorType:
+        return concat_aligned(self.pieces)
+
+    def slice(self, start: int, end: int) -> Any:
+        """Returns rows [start, end) as a view or lazy column of views."""
+        if start >= end:
+            return self.pieces[0][0:0]
+        first = int(np.searchsorted(self.offsets, start, side="right")) - 1
+        pieces = []
+        for i in range(max(first, 0), len(self.pieces)):
+            offset = self.offsets[i]
+            if offset >= end and pieces:
+                break
+            pieces.append(
+                self.pieces[i][max(start - offset, 0):max(end - offset, 0)])
+        return _LazyConcat.of(pieces)
+
+    def __len__(self):
+        return int(self.offsets[-1])
@@ -0,0 +1,114 @@
+import numpy as np
+import pickle
+import unittest
+
+from ray.rllib.policy.sample_batch import SampleBatch, MultiAgentBatch
+from ray.rllib.utils.test_utils import check
+
+
+def make_batch(start, count, eps_id=0):
+    return SampleBatch({
+        "obs": np.arange(start, start + count, dtype=np.float32),
+        "actions": np.arange(start, start + count),
+        "eps_id": np.repeat(eps_id, count),
+        "t": np.arange(count),
+    })
+
+
+class TestSampleBatch(unittest.TestCase):
+    def test_lazy_concat(self):
+        b1, b2, b3 = make_batch(0, 3), make_batch(3, 2), make_batch(5, 4)
+        batch = SampleBatch.concat_samples([b1, b2, b3])
+        self.assertEqual(batch.count, 9)
+        self.assertEqual(
+            sorted(batch.keys()), ["actions", "eps_id", "obs", "t"])
+        self.assertTrue("obs" in batch)
+        # Nothing has been concatenated yet.
+        self.assertFalse(isinstance(batch._data["obs"], np.ndarray))
+        check(batch["obs"], np.arange(9))
+        self.assertEqual(batch["obs"].ctypes.data % 64, 0)
+        self.assertFalse(isinstance(batch._data["actions"], np.ndarray))
+        check(batch.data["actions"], np.arange(9))
+        self.assertTrue(isinstance(batch._data["actions"], np.ndarray))
+
+        batch = b1.concat(b2).concat(b3)
+        check(batch["obs"], np.arange(9))
+        self.assertEqual(len(batch._data["actions"].pieces), 3)
+        self.assertRaises(
+            ValueError,
+            lambda: b1.concat(SampleBatch({"obs": np.arange(2)})))
+
+    def test_lazy_slices_are_views(self):
+        b1, b2 = make_batch(0, 3), make_batch(3, 4)
+        batch = SampleBatch.concat_samples([b1, b2])
+        s = batch.slice(4, 6)
+        self.assertEqual(s.count, 2)
+        check(s["obs"], [4, 5])
+        self.assertTrue(np.shares_memory(s["obs"], b2["obs"]))
+        s = batch.slice(2, 5)
+        self.assertEqual(s.count, 3)
+        check(s["actions"], [2, 3, 4])
+        self.assertEqual(batch.slice(3, 3).count, 0)
+        check([t.count for t in batch.timeslices(3)], [3, 3, 1])
+        check(
+            np.concatenate([t["obs"] for t in batch.timeslices(2)]),
+            np.arange(7))
+        check(batch.slice(-2, None)["obs"], [5, 6])
+
+    def test_split_by_episode(self):
+        batch = SampleBatch.concat_samples([
+            make_batch(0, 2, eps_id=0),
+            make_batch(2, 3, eps_id=1),
+            make_batch(5, 1, eps_id=0),
+        ])
+        episodes = batch.split_by_episode()
+        check([e.count for e in episodes], [2, 3, 1])
+        check([e["eps_id"][0] for e in episodes], [0, 1, 0])
+        check(episodes[1]["obs"], [2, 3, 4])
+
+    def test_pickle_and_copy(self):
+        batch = SampleBatch.concat_samples(
+            [make_batch(0, 3), make_batch(3, 2)])
+        restored = pickle.loads(pickle.dumps(batch))
+        check(restored["obs"], np.arange(5))
+        copy = batch.copy()
+        copy["obs"][0] = 100.0
+        check(batch["obs"], np.arange(5))
+
+    def test_multi_agent_timeslices(self):
+        # Agent steps of two policies at env steps (eps_id, t), with the rows
+        # of policy "p1" not in timestep order.
+        p0 = SampleBatch({
+            "eps_id": [0, 0, 0, 1],
+            "t": [0, 1, 2, 0],
+            "obs": [0, 1, 2, 3],
+        })
+        p1 = SampleBatch({
+            "eps_id": [1, 0, 0],
+            "t": [1, 0, 2],
+            "obs": [10, 11, 12],
+        })
+        batch = MultiAgentBatch({"p0": p0, "p1": p1}, 5)
+        slices = batch.timeslices(2)
+        check([s.count for s in slices], [2, 2, 1])
+        check(slices[0].policy_batches["p0"]["obs"], [0, 1])
+        check(slices[0].policy_batches["p1"]["obs"], [11])
+        check(slices[1].policy_batches["p0"]["obs"], [2, 3])
+        check(slices[1].policy_batches["p1"]["obs"], [12])
+        self.assertEqual(list(slices[2].policy_batches.keys()), ["p1"])
+        check(slices[2].policy_batches["p1"]["obs"], [10])
+        self.assertTrue(
+            SampleBatch.UNROLL_ID in slices[0].policy_batches["p0"])
+        # Rows that are already in timestep order are sliced as views.
+        self.assertTrue(
+            np.shares_memory(slices[1].policy_batches["p0"]["obs"], p0["obs"]))
+
+        slices = batch.timeslices(1)
+        self.assertEqual(len(slices), 5)
+        self.assertEqual(sum(s.agent_steps() for s in slices), 7)
+
+
+if __name__ == "__main__":
+    import pytest
+    import sys
+    sys.exit(pytest.main(["-v", __file__]))
@@ -130,6 +130,17 @@ def test_rollouts(ray_start_regular_shared):
     workers.stop()
 
 
+def test_rollouts_shared_memory(ray_start_regular_shared):
+    workers = make_workers(2)
+    a = ParallelRollouts(workers, mode="bulk_sync", transport="shared_memory")
+    assert next(a).count == 200
+    a = ParallelRollouts(workers, mode="async", transport="shared_memory")
+    assert next(a).count == 100
+    counters = a.shared_metrics.get().counters
+    assert counters["num_steps_sampled"] == 100, counters
+    workers.stop()
+
+
 def test_rollouts_local(ray_start_regular_shared):
     workers = make_workers(0)
     a = ParallelRollouts(workers, mode="bulk_sync")
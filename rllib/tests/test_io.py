@@ -6,6 +6,7 @@ import os
 import random
 import shutil
 import tempfile
+import threading
 import time
 import unittest
 
@@ -14,9 +15,11 @@ from ray.tune.registry import register_env
 from ray.rllib.agents.pg import PGTrainer
 from ray.rllib.agents.pg.pg_tf_policy import PGTFPolicy
 from ray.rllib.examples.env.multi_agent import MultiAgentCartPole
-from ray.rllib.offline import IOContext, JsonWriter, JsonReader
+from ray.rllib.offline import IOContext, JsonWriter, JsonReader, \
+    ColumnarWriter, ColumnarReader, ParallelInput
 from ray.rllib.offline.json_writer import _to_json
-from ray.rllib.policy.sample_batch import SampleBatch
+from ray.rllib.policy.sample_batch import SampleBatch, MultiAgentBatch, \
+    DEFAULT_POLICY_ID
 from ray.rllib.utils.test_utils import framework_iterator
 
 SAMPLES = SampleBatch({
@@ -347,6 +350,182 @@ class JsonIOTest(unittest.TestCase):
         self.assertRaises(ValueError, lambda: reader.next())
 
 
+class ColumnarIOTest(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_write_paginate(self):
+        ioctx = IOContext(self.test_dir, {}, 0, None)
+        writer = ColumnarWriter(self.test_dir, ioctx, max_file_size=5000)
+        self.assertEqual(len(os.listdir(self.test_dir)), 0)
+        for _ in range(100):
+            writer.write(SAMPLES)
+        # Each chunk takes 576 bytes (the json header plus 3 columns, all
+        # padded to multiples of 64 bytes), so files roll over every 9 chunks.
+        self.assertEqual(len(os.listdir(self.test_dir)), 12)
+
+    def test_read_write(self):
+        ioctx = IOContext(self.test_dir, {}, 0, None)
+        writer = ColumnarWriter(self.test_dir, ioctx, max_file_size=5000)
+        for i in range(100):
+            writer.write(make_sample_batch(i))
+        reader = ColumnarReader(self.test_dir)
+        seen_a = set()
+        seen_o = set()
+        for i in range(1000):
+            batch = reader.next()
+            seen_a.add(batch["actions"][0])
+            seen_o.add(batch["obs"][0])
+        self.assertGreater(len(seen_a), 90)
+        self.assertLess(len(seen_a), 101)
+        self.assertGreater(len(seen_o), 90)
+        self.assertLess(len(seen_o), 101)
+
+    def test_read_chunks_and_columns(self):
+        batch = SampleBatch({
+            "obs": np.random.random((5, 2, 3)).astype(np.float32),
+            "actions": np.array([0, 1, 0, 1, 1]),
+            "dones": np.array([False, False, False, False, True]),
+            "infos": np.array([{
+                "a": i
+            } for i in range(5)]),
+        })
+        ma_batch = MultiAgentBatch({"p0": batch, "p1": batch.slice(0, 2)}, 5)
+        writer = ColumnarWriter(self.test_dir)
+        writer.write(batch)
+        writer.write(ma_batch)
+        path = writer.cur_file.name
+
+        reader = ColumnarReader([path])
+        self.assertEqual(reader.num_chunks(path), 2)
+        read = reader.read_chunk(path, 0)
+        for k in batch.keys():
+            self.assertEqual(read[k].dtype, batch[k].dtype)
+            self.assertEqual(read[k].tolist(), batch[k].tolist())
+        # Columns are aligned views into the memory-mapped file.
+        self.assertEqual(read["obs"].ctypes.data % 64, 0)
+        self.assertFalse(read["obs"].flags.writeable)
+
+        read = reader.read_chunk(path, 1)
+        self.assertEqual(read.count, 5)
+        self.assertEqual(read.policy_batches["p1"]["obs"].tolist(),
+                         batch["obs"][:2].tolist())
+
+        reader = ColumnarReader([path], columns=["actions"])
+        self.assertEqual(list(reader.read_chunk(path, 0).keys()), ["actions"])
+        self.assertEqual(
+            list(reader.read_chunk(path, 1).policy_batches["p0"].keys()),
+            ["actions"])
+
+    def test_skips_over_empty_files_and_truncated_chunks(self):
+        open(self.test_dir + "/empty.rlcol", "w").close()
+        writer = ColumnarWriter(self.test_dir)
+        for i in range(3):
+            writer.write(make_sample_batch(i))
+        path = writer.cur_file.name
+        # Simulate a write in progress.
+        with open(path, "ab") as f:
+            f.write(b"RLCOLCHK")
+        reader = ColumnarReader(self.test_dir)
+        self.assertEqual(reader.num_chunks(path), 3)
+        seen_a = set()
+        for i in range(100):
+            batch = reader.next()
+            seen_a.add(batch["actions"][0])
+        self.assertEqual(len(seen_a), 3)
+
+
+class ParallelInputTest(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write_files(self, num_files):
+        for i in range(num_files):
+            with open(self.test_dir + "/f{}.json".format(i), "w") as f:
+                batch = make_sample_batch(i)
+                batch["eps_id"] = np.array([i, i, i])
+                f.write(_to_json(batch, []))
+                f.write("\n")
+
+    def test_read_write(self):
+        self.write_files(8)
+        reader = ParallelInput(self.test_dir, num_readers=3)
+        self.assertEqual(reader.num_readers, 3)
+        seen_a = set()
+        for i in range(200):
+            seen_a.add(reader.next()["actions"][0])
+        self.assertEqual(seen_a, set(range(8)))
+        reader.stop()
+
+    def test_read_columnar(self):
+        writer = ColumnarWriter(self.test_dir, max_file_size=1000)
+        for i in range(20):
+            writer.write(make_sample_batch(i))
+        reader = ParallelInput(
+            self.test_dir, reader_cls=ColumnarReader, num_readers=2)
+        seen_a = set()
+        for i in range(200):
+            seen_a.add(reader.next()["actions"][0])
+        self.assertEqual(seen_a, set(range(20)))
+        reader.stop()
+
+    def test_shards_files_across_workers(self):
+        self.write_files(8)
+        shards = []
+        for worker_index in range(1, 4):
+            ioctx = IOContext(self.test_dir, {"num_workers": 3}, worker_index,
+                              None)
+            shards.append(
+                ParallelInput(self.test_dir, ioctx, num_readers=4).files)
+        # Deterministic, disjoint shards covering all files.
+        self.assertEqual([len(s) for s in shards], [3, 3, 2])
+        self.assertEqual(
+            sorted(sum(shards, [])), sorted(glob.glob(self.test_dir + "/*")))
+        ioctx = IOContext(self.test_dir, {"num_workers": 3}, 2, None)
+        self.assertEqual(ParallelInput(self.test_dir, ioctx).files, shards[1])
+        # The local worker reads all files.
+        ioctx = IOContext(self.test_dir, {"num_workers": 3}, 0, None)
+        self.assertEqual(len(ParallelInput(self.test_dir, ioctx).files), 8)
+
+    def test_propagates_reader_errors(self):
+        open(self.test_dir + "/empty.json", "w").close()
+        reader = ParallelInput(self.test_dir, num_readers=1)
+        self.assertRaises(ValueError, lambda: reader.next())
+
+    def test_postprocesses_on_consumer_thread(self):
+        self.write_files(4)
+
+        class Policy:
+            threads = set()
+
+            def postprocess_trajectory(self, batch):
+                self.threads.add(threading.current_thread())
+                batch["actions"] = batch["actions"] + 100
+                return batch
+
+        class Worker:
+            policy_map = {DEFAULT_POLICY_ID: Policy()}
+
+        ioctx = IOContext(self.test_dir, {"postprocess_inputs": True}, 0,
+                          Worker())
+        reader = ParallelInput(self.test_dir, ioctx, num_readers=2)
+        for _ in range(20):
+            self.assertGreaterEqual(reader.next()["actions"][0], 100)
+        self.assertEqual(Policy.threads, {threading.current_thread()})
+
+        # Readers blocked on a full queue exit once the input is stopped.
+        reader.stop()
+        for thread in reader.threads:
+            thread.join(timeout=5.0)
+            self.assertFalse(thread.is_alive())
+
+
 if __name__ == "__main__":
     import pytest
     import sys